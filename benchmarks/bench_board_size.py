@@ -0,0 +1,91 @@
+"""
+Board size benchmark for Snake AI
+Measures the cost of a game step and of an observation on boards from
+10x10 to 256x256, for a short snake and for a snake filling half the board
+
+Usage:
+    python benchmarks/bench_board_size.py [--steps N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+from src.game import SnakeGameAI, BitboardSnakeGameAI, Direction, Point
+from src.game.constants import BLOCK_SIZE
+from src.agent.state import get_state
+from src.agent.safety import IMMEDIATE_DANGER_BITS
+
+SIZES = [10, 16, 32, 64, 128, 256]
+ENGINES = [("list", SnakeGameAI), ("bitboard", BitboardSnakeGameAI)]
+ACTIONS = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+
+def serpentine_snake(cols, rows, length):
+    """
+    Lays out a snake row by row from the bottom of the board
+
+    Returns:
+        list of positions (head first) and the direction of the head
+    """
+    cells = []
+    for row in range(rows - 1, -1, -1):
+        line = range(cols) if (rows - 1 - row) % 2 == 0 else range(cols - 1, -1, -1)
+        for col in line:
+            cells.append(Point(col * BLOCK_SIZE, row * BLOCK_SIZE))
+            if len(cells) == length:
+                head_row = rows - 1 - row
+                direction = Direction.RIGHT if head_row % 2 == 0 else Direction.LEFT
+                return cells[::-1], direction
+
+def run(engine, size, length, steps):
+    """
+    Plays a safe policy and times play_step and get_state
+
+    Returns:
+        mean microseconds per step and per observation
+    """
+    game = engine(cols=size, rows=size, render=False)
+    snake, direction = serpentine_snake(size, size, length)
+    game.set_snake(snake, direction)
+
+    step_time = 0.0
+    state_time = 0.0
+    for _ in range(steps):
+        start = time.perf_counter()
+        state = get_state(game)
+        state_time += time.perf_counter() - start
+
+        # Go straight unless the next cell is deadly, then try right, then left
+        move = next((i for i, bit in enumerate(IMMEDIATE_DANGER_BITS) if not state[bit]), 0)
+
+        start = time.perf_counter()
+        reward, done, score = game.play_step(ACTIONS[move], None)
+        step_time += time.perf_counter() - start
+
+        if done:
+            game.food = None
+            game.frame_iteration = 0
+            game.set_snake(snake, direction)
+
+    return step_time / steps * 1e6, state_time / steps * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--steps', type=int, default=2000, help='steps per measure')
+    args = parser.parse_args()
+
+    print(f"{'engine':>9} {'board':>9} {'length':>7} {'step (us)':>10} {'state (us)':>11}")
+    for name, engine in ENGINES:
+        for size in SIZES:
+            for length in (3, size * size // 2):
+                step_us, state_us = run(engine, size, length, args.steps)
+                print(f"{name:>9} {f'{size}x{size}':>9} {length:>7} {step_us:>10.1f} {state_us:>11.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Hogwild scaling benchmark for Snake AI
+Compares score against wall-clock time for single-process train() and
+Hogwild training with an increasing number of workers
+
+Usage:
+    python benchmarks/bench_hogwild.py [--seconds S] [--workers 1 2 4 8]
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import contextlib
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+from src.agent.trainer import train
+from src.agent.hogwild import train_hogwild
+
+# Number of time windows in which scores are averaged
+WINDOWS = 4
+
+def summarize(history, seconds):
+    """
+    Returns the number of games and the mean score in each time window
+    """
+    means = []
+    for window in range(WINDOWS):
+        start = seconds * window / WINDOWS
+        end = seconds * (window + 1) / WINDOWS
+        window_scores = [score for elapsed, score in history if start <= elapsed < end]
+        means.append(sum(window_scores) / len(window_scores) if window_scores else float('nan'))
+    return len(history), means
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--seconds', type=float, default=120, help='training time per run')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[n for n in (1, 2, 4, 8, 16) if n <= (os.cpu_count() or 1)],
+                        help='worker counts to compare')
+    parser.add_argument('--seed', type=int, default=0, help='seed of every run')
+    args = parser.parse_args()
+
+    runs = [('train()', 1, lambda: train(use_existing_model=False, seed=args.seed, render=False,
+                                        time_budget=args.seconds))]
+    for workers in args.workers:
+        runs.append(('hogwild', workers,
+                     lambda workers=workers: train_hogwild(use_existing_model=False,
+                                                           num_workers=workers, seed=args.seed,
+                                                           time_budget=args.seconds)))
+
+    # Run in a temporary directory so the saved model.pth is not overwritten
+    results = []
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, 'w') as devnull:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for name, workers, run in runs:
+                with contextlib.redirect_stdout(devnull):
+                    history = run()
+                results.append((name, workers) + summarize(history, args.seconds))
+        finally:
+            os.chdir(cwd)
+
+    step = args.seconds / WINDOWS
+    windows = ''.join(f"{f'<{step * (w + 1):.0f}s':>9}" for w in range(WINDOWS))
+    print(f"{'mode':>8} {'workers':>8} {'games':>7} {'games/s':>8}{windows}")
+    for name, workers, games, means in results:
+        scores = ''.join(f"{mean:>9.2f}" for mean in means)
+        print(f"{name:>8} {workers:>8} {games:>7} {games / args.seconds:>8.2f}{scores}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Snake AI Offline Dataset
+Exports logged episodes to shards and trains the model from them
+
+Usage:
+    python dataset.py export episodes.log --out shards [--shard-size N] [--format npz|memmap]
+    python dataset.py train shards [--epochs E] [--batch-size B] [--seed S]
+"""
+
+import os
+import argparse
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from src.game.episode_log import EpisodeLog
+from src.model.dataset import ShardWriter, export_episode_log, SHARD_SIZE, SHUFFLE_BUFFER, BATCH_SIZE
+from src.agent.offline import train_offline
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help='replay an episode log into shards')
+    export.add_argument('log', help='episode log written with main.py --log')
+    export.add_argument('--out', default='shards', help='directory receiving the shards')
+    export.add_argument('--shard-size', type=int, default=SHARD_SIZE, help='transitions per shard')
+    export.add_argument('--format', choices=('npz', 'memmap'), default='npz',
+                        help='one .npz per shard, or raw .npy files read memory-mapped')
+    export.add_argument('--compress', action='store_true', help='compress the .npz shards')
+
+    train = commands.add_parser('train', help='train a model from shards')
+    train.add_argument('shards', help='directory of the shards')
+    train.add_argument('--epochs', type=int, default=1, help='passes over the dataset')
+    train.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='transitions per step')
+    train.add_argument('--shuffle-buffer', type=int, default=SHUFFLE_BUFFER,
+                       help='rows mixed together before being batched')
+    train.add_argument('--model', default=None, help='weights to start from')
+    train.add_argument('--seed', type=int, default=None, help='seed of the weights and data order')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        with ShardWriter(args.out, args.shard_size, args.format, args.compress) as writer:
+            export_episode_log(EpisodeLog(args.log), writer)
+        print(f"{writer.n_written} transitions written to {writer.n_shards} shards in {args.out}")
+    else:
+        train_offline(args.shards, epochs=args.epochs, batch_size=args.batch_size,
+                      shuffle_buffer=args.shuffle_buffer, seed=args.seed, model_path=args.model)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Snake AI Episode Export
+Renders recorded episodes offscreen and encodes them to GIF or MP4 files
+
+Usage:
+    python main.py --headless --record episodes.jsonl
+    python export_episodes.py episodes.jsonl [--format gif|mp4] [--out videos] [--scale 0.5]
+"""
+
+import os
+import argparse
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from src.game.recorder import load_episodes, export_episodes, EXPORT_FPS
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('episodes', help='file written by the episode recorder')
+    parser.add_argument('--format', choices=['gif', 'mp4'], default='gif', help='video format')
+    parser.add_argument('--out', default='videos', help='output directory')
+    parser.add_argument('--fps', type=int, default=EXPORT_FPS, help='frames per second')
+    parser.add_argument('--scale', type=float, default=1, help='size factor of the frames')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: one per core)')
+    args = parser.parse_args()
+
+    game_kwargs, episodes = load_episodes(args.episodes)
+    for path in export_episodes(episodes, game_kwargs, args.out, fmt=args.format, fps=args.fps,
+                                scale=args.scale, num_workers=args.workers):
+        print(path)
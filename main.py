@@ -6,12 +6,98 @@ This script launches the Snake AI game with a trained or new model
 """
 
 import sys
+import atexit
+import argparse
+import pygame
 from src.agent.trainer import train
+from src.agent.plotter import PLOT_INTERVAL
+from src.agent.actor_learner import train_actor_learner
+from src.agent.hogwild import train_hogwild
+from src.agent.evolution import train_evolution
+from src.game.live_view import run_viewer
+from src.game.recorder import EpisodeRecorder
+from src.game.episode_log import EpisodeLogWriter
+from src.utils.metrics_log import MetricsSink, EXPORT_HOST
+from src.utils.profiler import PhaseProfiler
 from src.menu import show_menu
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Snake AI Game Launcher')
+    parser.add_argument('--mode', choices=['single', 'actor-learner', 'hogwild', 'evolution'], default='single',
+                        help='training mode (default: single process with game window)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes for parallel modes')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the run')
+    parser.add_argument('--headless', action='store_true',
+                        help='single mode without game window, watch it with --view')
+    parser.add_argument('--view', action='store_true',
+                        help='only open a live view of a headless training run')
+    parser.add_argument('--record', default=None, metavar='FILE',
+                        help='single mode: keep the best and worst episodes in FILE for export')
+    parser.add_argument('--log', default=None, metavar='FILE',
+                        help='single mode: append every episode to the binary log FILE')
+    parser.add_argument('--metrics', default=None, metavar='FILE',
+                        help='single mode: write one record per game to FILE (.jsonl or .csv)')
+    parser.add_argument('--metrics-port', type=int, default=None, metavar='PORT',
+                        help='single mode: also send the records as UDP datagrams to a local port')
+    parser.add_argument('--profile', choices=['phases', 'cprofile'], default=None,
+                        help='single mode: report the time spent in every phase of the training loop, '
+                             'with cprofile also dump cProfile statistics')
+    parser.add_argument('--profile-out', default='profile.json', metavar='FILE',
+                        help='single mode: JSON file of the latest profile report (cProfile dump: FILE.prof)')
+    parser.add_argument('--hud', action='store_true',
+                        help='single mode: show throughput, latencies and memory use in the info box')
+    parser.add_argument('--plot-interval', type=float, default=PLOT_INTERVAL, metavar='SECONDS',
+                        help='single mode: seconds between two redraws of the score plot')
+    parser.add_argument('--no-plot', action='store_true', help='single mode: do not plot the scores')
+    parser.add_argument('--engine', choices=['list', 'bitboard'], default='list',
+                        help='single mode: game engine, bitboard for faster collision and danger checks')
+    args = parser.parse_args()
+
+    if args.view:
+        run_viewer()
+        sys.exit()
+
     # Display menu and get user choice
     use_existing_model = show_menu()
     
+    recorder = EpisodeRecorder(path=args.record) if args.record else None
+    episode_log = None
+    if args.log:
+        episode_log = EpisodeLogWriter(args.log)
+        # Training ends by closing the window: write the buffered episodes on exit
+        atexit.register(episode_log.close)
+    metrics_sink = None
+    if args.metrics or args.metrics_port is not None:
+        address = (EXPORT_HOST, args.metrics_port) if args.metrics_port is not None else None
+        metrics_sink = MetricsSink(args.metrics, address=address)
+        # Training ends by closing the window: write the last records on exit
+        atexit.register(metrics_sink.close)
+    profiler = None
+    if args.profile:
+        profiler = PhaseProfiler(path=args.profile_out, cprofile=args.profile == 'cprofile')
+        atexit.register(profiler.stop)
+    
     # Launch the game with the appropriate parameter
-    train(use_existing_model=use_existing_model)
\ No newline at end of file
+    if args.mode == 'single' and not args.headless:
+        train(use_existing_model=use_existing_model, seed=args.seed,
+              recorder=recorder, episode_log=episode_log, metrics_sink=metrics_sink,
+              profiler=profiler, hud=args.hud, engine=args.engine,
+              plot_interval=None if args.no_plot else args.plot_interval)
+    elif args.mode == 'single':
+        pygame.display.quit()
+        train(use_existing_model=use_existing_model, seed=args.seed,
+              render=False, live_view=True, recorder=recorder, episode_log=episode_log,
+              metrics_sink=metrics_sink, profiler=profiler, hud=args.hud, engine=args.engine)
+    else:
+        # Parallel modes run headless: close the menu window
+        pygame.display.quit()
+        if args.mode == 'actor-learner':
+            train_actor_learner(use_existing_model=use_existing_model,
+                                num_actors=args.workers, seed=args.seed)
+        elif args.mode == 'hogwild':
+            train_hogwild(use_existing_model=use_existing_model,
+                          num_workers=args.workers, seed=args.seed)
+        elif args.mode == 'evolution':
+            train_evolution(use_existing_model=use_existing_model,
+                            num_workers=args.workers, seed=args.seed)
@@ -5,5 +5,10 @@ Contains the reinforcement learning agent and its components
 
 from src.agent.trainer import train
 from src.agent.action import Agent
+from src.agent.actor_learner import train_actor_learner
+from src.agent.hogwild import train_hogwild
+from src.agent.evolution import train_evolution
+from src.agent.sweep import run_sweep
+from src.agent.offline import train_offline
 
-__all__ = ["train", "Agent"]
\ No newline at end of file
+__all__ = ["train", "Agent", "train_actor_learner", "train_hogwild", "train_evolution", "run_sweep", "train_offline"]
\ No newline at end of file
@@ -6,24 +6,54 @@ import torch
 import random
 import numpy as np
 import os
-from src.agent.memory import ReplayMemory
+from src.agent.memory import ReplayMemory, MAX_MEMORY, BATCH_SIZE
 from src.agent.state import get_state
+from src.agent.safety import safe_action_mask
 from src.model.network import Linear_QNet
 
+# Default hyperparameters
+LEARNING_RATE = 0.001
+GAMMA = 0.9               # Discount rate
+HIDDEN_SIZE = 256
+EPSILON_START = 80        # Exploration of a new model: epsilon = EPSILON_START - n_games
+EPSILON_TRAINED = 20      # Exploration of a loaded model
+
 class Agent:
     """
     Reinforcement learning agent for Snake game
     """
-    def __init__(self, use_existing_model=True):
+    def __init__(self, use_existing_model=True, action_mask=False, check_space=False, seed=None,
+                 lr=LEARNING_RATE, gamma=GAMMA, hidden_size=HIDDEN_SIZE,
+                 epsilon_start=EPSILON_START, epsilon_trained=EPSILON_TRAINED,
+                 batch_size=BATCH_SIZE, max_memory=MAX_MEMORY, model=None):
         self.n_games = 0
         self.record = 0
         self.epsilon = 0  # randomness
-        self.gamma = 0.9  # discount rate
-        self.memory = ReplayMemory()
+        self.gamma = gamma  # discount rate
+        self.epsilon_start = epsilon_start
+        self.epsilon_trained = epsilon_trained
+        self.batch_size = batch_size
+        
+        # Own random generator for exploration and replay sampling
+        self.rng = random.Random(seed)
+        self.memory = ReplayMemory(max_size=max_memory, rng=self.rng)
+        
+        # Safety masking of moves leading to an immediate death or a dead end
+        self.action_mask = action_mask
+        self.check_space = check_space
         
         # Enhanced state with 5-block vision instead of 3:
         # 15 dangers (3 directions x 5 blocks), 4 current directions, 4 relative food positions
-        self.model = Linear_QNet(23, 256, 3)
+        if model is not None:
+            # Model built by the caller (e.g. shared between processes), used as is
+            self.model = model
+        elif seed is None:
+            self.model = Linear_QNet(23, hidden_size, 3)
+        else:
+            # Seed the weight initialization without touching the global torch generator
+            with torch.random.fork_rng(devices=[]):
+                torch.manual_seed(seed)
+                self.model = Linear_QNet(23, hidden_size, 3)
         
         # For visualization
         self.prev_food_distance = 0
@@ -35,7 +65,9 @@ class Agent:
         file_name = os.path.join(model_folder_path, 'model.pth')
         self.trained_model_loaded = False
         
-        if os.path.exists(file_name) and use_existing_model:
+        if model is not None:
+            pass
+        elif os.path.exists(file_name) and use_existing_model:
             try:
                 # Load model with size difference handling
                 saved_state = torch.load(file_name)
@@ -62,7 +94,7 @@ class Agent:
                 print("No saved model found. Starting with a new model.")
             
         from src.model.trainer import QTrainer
-        self.trainer = QTrainer(self.model, lr=0.001, gamma=self.gamma)
+        self.trainer = QTrainer(self.model, lr=lr, gamma=self.gamma)
 
     def get_state(self, game):
         """
@@ -79,10 +111,13 @@ class Agent:
     def train_long_memory(self):
         """
         Trains the model on a batch of experiences
+        
+        Returns:
+            loss of the training step
         """
-        mini_sample = self.memory.get_batch()
+        mini_sample = self.memory.get_batch(self.batch_size)
         states, actions, rewards, next_states, dones = zip(*mini_sample)
-        self.trainer.train_step(states, actions, rewards, next_states, dones)
+        return self.trainer.train_step(states, actions, rewards, next_states, dones)
 
     def train_short_memory(self, state, action, reward, next_state, done):
         """
@@ -90,26 +125,37 @@ class Agent:
         """
         self.trainer.train_step(state, action, reward, next_state, done)
 
-    def get_action(self, state):
+    def get_action(self, state, game=None):
         """
         Determines the action to take based on the current state
         
+        Args:
+            state: current state
+            game: instance of SnakeGameAI, only needed for the space check
+        
         Returns:
             final_move: action vector [straight, right_turn, left_turn]
             prediction_scores: prediction scores for visualization
         """
         # Determine exploration rate
         if self.trained_model_loaded:
-            self.epsilon = max(20 - self.n_games, 0)  # Lower exploration rate
+            self.epsilon = max(self.epsilon_trained - self.n_games, 0)  # Lower exploration rate
         else:
-            self.epsilon = 80 - self.n_games  # Original exploration rate
+            self.epsilon = self.epsilon_start - self.n_games  # Original exploration rate
             
         final_move = [0, 0, 0]
         prediction_scores = None
         
-        if random.randint(0, 200) < self.epsilon:
+        # Moves allowed by the safety mask (all moves if masking is disabled)
+        allowed = [True, True, True]
+        if self.action_mask:
+            allowed = safe_action_mask(state, game, self.check_space)
+            if not any(allowed):
+                allowed = [True, True, True]
+        
+        if self.rng.randint(0, 200) < self.epsilon:
             # Random move (exploration)
-            move = random.randint(0, 2)
+            move = self.rng.choice([i for i in range(3) if allowed[i]])
             final_move[move] = 1
             # Create fake prediction scores for visualization
             prediction_scores = [0.0, 0.0, 0.0]
@@ -118,6 +164,8 @@ class Agent:
             # Model-predicted move (exploitation)
             state_tensor = torch.tensor(state, dtype=torch.float)
             prediction = self.model(state_tensor)
+            if not all(allowed):
+                prediction = prediction.masked_fill(~torch.tensor(allowed), float('-inf'))
             # Apply softmax to get probabilities
             prediction_probs = torch.nn.functional.softmax(prediction, dim=0)
             prediction_scores = prediction_probs.detach().numpy()
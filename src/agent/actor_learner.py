@@ -0,0 +1,151 @@
+"""
+Actor/learner training module for Snake AI Agent
+Actor processes play headless games while one learner process trains the model
+"""
+
+import os
+import time
+import queue
+import torch
+import multiprocessing as mp
+from src.game import SnakeGameAI
+from src.agent.action import Agent
+from src.agent.shared import SharedTransitionBuffer, SharedWeights
+from src.utils.seeding import derive_seed, GAME_STREAM, AGENT_STREAM
+
+# Learner updates between two weight publications to the actors
+WEIGHT_SYNC_INTERVAL = 20
+# Maximum number of fresh transitions trained on in one learner update
+UPDATE_SIZE = 256
+
+def default_num_actors():
+    """
+    Returns the number of actors leaving one core to the learner
+    """
+    return max(1, (os.cpu_count() or 2) - 1)
+
+def _actor(actor_id, seed, trained_model_loaded, buffer, weights, scores, stop):
+    """
+    Plays headless games with a local copy of the model and writes the
+    transitions into the shared buffer
+
+    Args:
+        actor_id: index of the actor, used to derive its seeds
+        seed: seed of the run
+        trained_model_loaded: True if the learner started from a saved model
+        buffer: SharedTransitionBuffer, the actor owns segment actor_id - 1
+        weights: SharedWeights published by the learner, with the number of games
+        scores: queue receiving (actor_id, score) for every finished game
+        stop: event set by the learner to stop the actor
+    """
+    torch.set_num_threads(1)
+    agent = Agent(use_existing_model=False, seed=derive_seed(seed, actor_id, AGENT_STREAM))
+    agent.trained_model_loaded = trained_model_loaded
+    game = SnakeGameAI(render=False, seed=derive_seed(seed, actor_id, GAME_STREAM))
+    writer = buffer.writer(actor_id - 1)
+
+    version = 0
+    while not stop.is_set():
+        # Take the latest weights if the learner published new ones
+        version, n_games = weights.pull(agent.model, version)
+        if n_games is not None:
+            agent.n_games = n_games
+
+        state_old = agent.get_state(game)
+        final_move, _ = agent.get_action(state_old, game)
+        reward, done, score = game.play_step(final_move, agent)
+        state_new = agent.get_state(game)
+        writer.append(state_old, final_move, reward, state_new, done)
+
+        if done:
+            game.reset()
+            scores.put((actor_id, score))
+
+def train_actor_learner(use_existing_model=True, num_actors=None, seed=None,
+                        max_games=None, time_budget=None):
+    """
+    Trains the agent with several actor processes and one learner
+
+    Each actor runs a headless SnakeGameAI with a local copy of Linear_QNet
+    and writes its transitions into a shared-memory ring buffer. The learner
+    (this process) trains on the fresh transitions, and on a batch sampled
+    from the same buffer at every finished game, then publishes its weights
+    through a shared block every WEIGHT_SYNC_INTERVAL updates. Only game
+    scores go through a queue.
+
+    Args:
+        use_existing_model: If True, uses an existing model if available
+        num_actors: number of actor processes, default one per core but one
+        seed: seed of the run, every actor gets its own streams derived from it
+        max_games: number of games after which training stops, None to train forever
+        time_budget: seconds after which training stops, None to train forever
+
+    Returns:
+        history: list of (seconds since start, score) for every game played
+    """
+    if num_actors is None:
+        num_actors = default_num_actors()
+
+    agent = Agent(use_existing_model=use_existing_model, seed=derive_seed(seed, 0, AGENT_STREAM))
+    buffer = SharedTransitionBuffer(num_actors)
+    weights = SharedWeights(agent.model)
+    weights.publish(agent.model, agent.n_games)
+
+    ctx = mp.get_context('spawn')
+    scores = ctx.Queue()
+    stop = ctx.Event()
+    actors = [ctx.Process(target=_actor, daemon=True,
+                          args=(i + 1, seed, agent.trained_model_loaded,
+                                buffer, weights, scores, stop))
+              for i in range(num_actors)]
+    for actor in actors:
+        actor.start()
+
+    history = []
+    updates = 0
+    start_time = time.perf_counter()
+    try:
+        while True:
+            # Train on the transitions written since the last update
+            fresh = buffer.read_new(UPDATE_SIZE)
+            if fresh is not None:
+                agent.trainer.train_step(*fresh)
+                updates += 1
+                if updates % WEIGHT_SYNC_INTERVAL == 0:
+                    weights.publish(agent.model, agent.n_games)
+
+            # Handle the games finished in the meantime
+            while True:
+                try:
+                    actor_id, score = scores.get(timeout=0.01 if fresh is None else 0)
+                except queue.Empty:
+                    break
+
+                agent.n_games += 1
+                batch = buffer.sample(agent.rng)
+                if batch is not None:
+                    agent.trainer.train_step(*batch)
+
+                if score > agent.record:
+                    agent.record = score
+                    agent.model.save()
+
+                print('Game', agent.n_games, 'Score', score, 'Record:', agent.record,
+                      'Actor:', actor_id)
+
+                elapsed = time.perf_counter() - start_time
+                history.append((elapsed, score))
+                if ((max_games is not None and len(history) >= max_games) or
+                        (time_budget is not None and elapsed >= time_budget)):
+                    return history
+
+            if fresh is None and not any(actor.is_alive() for actor in actors):
+                raise RuntimeError("All actor processes have stopped")
+    finally:
+        stop.set()
+        for actor in actors:
+            actor.join(timeout=10)
+            if actor.is_alive():
+                # SDL turns SIGTERM into a quit event, only SIGKILL is sure to stop it
+                actor.kill()
+                actor.join()
@@ -0,0 +1,144 @@
+"""
+Asynchronous learner module for Snake AI Agent
+Trains the model in background threads while the game loop keeps playing
+"""
+
+import copy
+import queue
+import random
+import threading
+import numpy as np
+import torch
+from src.agent.memory import BATCH_SIZE
+from src.model.trainer import QTrainer
+
+# Learner updates between two inference snapshots given to the agent
+SNAPSHOT_INTERVAL = 10
+# Batches prepared in advance by the prefetch thread
+PREFETCH_BATCHES = 2
+
+class AsyncLearner:
+    """
+    Background learner for an agent
+
+    A prefetch thread keeps sampling batches from the agent's replay memory
+    and converting them to tensors, a learner thread keeps training its own
+    copy of the model on them. Every SNAPSHOT_INTERVAL updates the learner
+    hands a fresh copy of its weights to the agent, which only uses it for
+    inference. PyTorch releases the GIL in its kernels, so playing and
+    learning overlap.
+
+    An exception in either thread stops both; it is raised again, from
+    the training loop, by check() or stop().
+    """
+    def __init__(self, agent, batch_size=BATCH_SIZE, snapshot_interval=SNAPSHOT_INTERVAL):
+        """
+        Initializes the learner from the agent's current model
+
+        Args:
+            agent: Agent playing the game, its model is replaced by snapshots
+            batch_size: size of the training batches
+            snapshot_interval: learner updates between two snapshots
+        """
+        self.agent = agent
+        self.batch_size = batch_size
+        self.snapshot_interval = snapshot_interval
+        self.model = copy.deepcopy(agent.model)
+        self.trainer = QTrainer(self.model, lr=agent.trainer.lr, gamma=agent.gamma)
+        # Own generator so that sampling does not interleave with the agent's draws
+        self.rng = random.Random(agent.rng.getrandbits(32))
+        self.updates = 0
+        self.last_loss = None
+        self.error = None
+
+        self._batches = queue.Queue(maxsize=PREFETCH_BATCHES)
+        self._stop = threading.Event()
+        self._threads = [threading.Thread(target=self._guard, args=(self._prefetch,), daemon=True),
+                         threading.Thread(target=self._guard, args=(self._learn,), daemon=True)]
+
+    def start(self):
+        """
+        Starts the prefetch and learner threads
+        """
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """
+        Stops the threads and gives the agent the latest weights
+
+        Raises:
+            RuntimeError: If one of the threads failed
+        """
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self.check()
+        self._publish()
+
+    def check(self):
+        """
+        Raises the exception of a failed thread in the calling thread
+
+        Raises:
+            RuntimeError: If one of the threads failed
+        """
+        if self.error is not None:
+            raise RuntimeError("Async learner thread failed") from self.error
+
+    def _guard(self, target):
+        """
+        Runs a thread body, keeping its exception and stopping the other thread
+        """
+        try:
+            target()
+        except BaseException as e:
+            self.error = e
+            self._stop.set()
+
+    def _prefetch(self):
+        """
+        Samples batches from the replay memory and converts them to tensors
+        """
+        memory = self.agent.memory
+        while not self._stop.is_set():
+            if len(memory.memory) < self.batch_size:
+                self._stop.wait(0.01)
+                continue
+
+            mini_sample = memory.get_batch(self.batch_size, rng=self.rng)
+            states, actions, rewards, next_states, dones = zip(*mini_sample)
+            batch = (torch.as_tensor(np.array(states), dtype=torch.float),
+                     torch.as_tensor(np.array(actions), dtype=torch.long),
+                     torch.as_tensor(rewards, dtype=torch.float),
+                     torch.as_tensor(np.array(next_states), dtype=torch.float),
+                     torch.as_tensor(dones, dtype=torch.bool))
+            while not self._stop.is_set():
+                try:
+                    self._batches.put(batch, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+    def _learn(self):
+        """
+        Trains the learner model on prefetched batches
+        """
+        while not self._stop.is_set():
+            try:
+                batch = self._batches.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            self.last_loss = self.trainer.train_step(*batch)
+            self.updates += 1
+            if self.updates % self.snapshot_interval == 0:
+                self._publish()
+
+    def _publish(self):
+        """
+        Gives the agent a copy of the learner weights for inference
+        """
+        snapshot = copy.deepcopy(self.model)
+        snapshot.eval()
+        # Attribute assignment is atomic: the game loop sees the old or the new model
+        self.agent.model = snapshot
@@ -0,0 +1,172 @@
+"""
+Evolution strategies training module for Snake AI Agent
+Evolves Linear_QNet weights without gradients, games are evaluated in a process pool
+"""
+
+import os
+import time
+import numpy as np
+import torch
+import multiprocessing as mp
+from torch.nn.utils import parameters_to_vector, vector_to_parameters
+from src.game import SnakeGameAI
+from src.agent.action import Agent
+from src.agent.state import get_state
+from src.model.network import Linear_QNet
+from src.utils.seeding import derive_seed, AGENT_STREAM, EVOLUTION_STREAM
+
+# Default evolution parameters
+POPULATION_SIZE = 64      # Must be even (antithetic pairs)
+SIGMA = 0.05              # Standard deviation of the weight perturbations
+LEARNING_RATE = 0.03      # Step size of the weight update
+EPISODES = 3              # Games played by each member per generation
+
+ACTIONS = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+
+# Worker globals, set by _init_worker
+_population = None
+_model = None
+_game = None
+
+def _init_worker(shared_population, population_size):
+    """
+    Attaches a pool worker to the shared population array
+    """
+    global _population, _model, _game
+    torch.set_num_threads(1)
+    _model = Linear_QNet(23, 256, 3)
+    _model.eval()
+    # One game per worker, reset to the seed of every evaluation game
+    _game = SnakeGameAI(render=False, loop_detection='end')
+    _population = np.frombuffer(shared_population, dtype=np.float32).reshape(population_size, -1)
+
+def _evaluate(job):
+    """
+    Plays greedy headless games with the weights of one member
+
+    Args:
+        job: (index of the member, episode seeds of the games)
+
+    Returns:
+        (total reward, mean score) over the games
+    """
+    index, seeds = job
+    with torch.no_grad():
+        vector_to_parameters(torch.from_numpy(_population[index]), _model.parameters())
+
+    total_reward = 0.0
+    total_score = 0
+    for seed in seeds:
+        _game.reset(seed=seed)
+        done = False
+        while not done:
+            with torch.no_grad():
+                move = torch.argmax(_model(torch.as_tensor(get_state(_game), dtype=torch.float))).item()
+            reward, done, score = _game.play_step(ACTIONS[move], None)
+            total_reward += reward
+        total_score += score
+    return total_reward, total_score / len(seeds)
+
+def _game_seeds(seed, generation, episodes, rng):
+    """
+    Returns the seeds of the games played by every member in a generation
+
+    With a run seed they come from their own stream, so that no game
+    replays the draws of the agent; without one they are drawn from rng.
+    """
+    if seed is None:
+        return [int(rng.integers(2 ** 32)) for _ in range(episodes)]
+    return [derive_seed(seed, generation, k, EVOLUTION_STREAM) for k in range(episodes)]
+
+def _centered_ranks(values):
+    """
+    Maps values to ranks in [-0.5, 0.5], robust to outliers
+    """
+    ranks = np.empty(len(values), dtype=np.float32)
+    ranks[np.argsort(values)] = np.arange(len(values), dtype=np.float32)
+    return ranks / (len(values) - 1) - 0.5
+
+def train_evolution(use_existing_model=True, num_workers=None, seed=None,
+                    population_size=POPULATION_SIZE, sigma=SIGMA, lr=LEARNING_RATE,
+                    episodes=EPISODES, max_generations=None, time_budget=None):
+    """
+    Trains the agent's network with evolution strategies
+
+    Every generation draws antithetic Gaussian perturbations of the current
+    weights, writes the population into a flat shared array and evaluates
+    every member on the same games in a process pool. The weights then move
+    along the rank-weighted perturbations. The best member is saved with
+    model.save() whenever it beats the record.
+
+    Args:
+        use_existing_model: If True, starts from the saved model if available
+        num_workers: number of pool processes, default one per core
+        seed: seed of the run
+        population_size: number of members per generation, rounded up to an even number
+        sigma: standard deviation of the perturbations
+        lr: step size of the weight update
+        episodes: games played by each member per generation
+        max_generations: number of generations after which training stops, None for no limit
+        time_budget: seconds after which training stops, None for no limit
+
+    Returns:
+        history: list of (seconds since start, best mean score) for every generation
+    """
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    population_size += population_size % 2
+
+    agent = Agent(use_existing_model=use_existing_model, seed=derive_seed(seed, 0, AGENT_STREAM))
+    model = agent.model
+    theta = parameters_to_vector(model.parameters()).detach().numpy().copy()
+    rng = np.random.default_rng(derive_seed(seed, 0, AGENT_STREAM))
+
+    ctx = mp.get_context('spawn')
+    shared_population = ctx.RawArray('f', population_size * theta.size)
+    population = np.frombuffer(shared_population, dtype=np.float32).reshape(population_size, -1)
+
+    history = []
+    record = 0
+    generation = 0
+    start_time = time.perf_counter()
+    # Workers are closed rather than terminated: SDL turns SIGTERM into a quit event
+    pool = ctx.Pool(num_workers, initializer=_init_worker,
+                    initargs=(shared_population, population_size))
+    try:
+        while max_generations is None or generation < max_generations:
+            # Antithetic perturbations: theta + sigma * eps and theta - sigma * eps
+            noise = rng.standard_normal((population_size // 2, theta.size), dtype=np.float32)
+            noise = np.concatenate([noise, -noise])
+            population[:] = theta + sigma * noise
+
+            seeds = _game_seeds(seed, generation, episodes, rng)
+            results = pool.map(_evaluate, [(i, seeds) for i in range(population_size)])
+            fitness = np.array([total_reward for total_reward, _ in results])
+            scores = np.array([mean_score for _, mean_score in results])
+
+            # Save the best member if it beats the record
+            best = int(np.argmax(scores))
+            if scores[best] > record:
+                record = scores[best]
+                with torch.no_grad():
+                    vector_to_parameters(torch.from_numpy(population[best].copy()), model.parameters())
+                model.save()
+
+            # Move the weights along the rank-weighted perturbations
+            theta = theta + lr / (population_size * sigma) * (_centered_ranks(fitness) @ noise)
+            generation += 1
+
+            elapsed = time.perf_counter() - start_time
+            history.append((elapsed, float(scores[best])))
+            print('Generation', generation, 'Best', scores[best], 'Mean', round(float(scores.mean()), 2),
+                  'Record:', record)
+            if time_budget is not None and elapsed >= time_budget:
+                break
+    finally:
+        pool.close()
+        pool.join()
+
+    # Leave the model with the final mean weights
+    with torch.no_grad():
+        vector_to_parameters(torch.from_numpy(theta), model.parameters())
+    return history
@@ -0,0 +1,126 @@
+"""
+Hogwild training module for Snake AI Agent
+Several processes train one shared model without any locking
+"""
+
+import os
+import time
+import queue
+import torch
+import multiprocessing as mp
+from src.game import SnakeGameAI
+from src.agent.action import Agent
+from src.utils.seeding import derive_seed, GAME_STREAM, AGENT_STREAM
+
+def default_num_workers():
+    """
+    Returns the number of workers, one per core
+    """
+    return os.cpu_count() or 1
+
+def _worker(worker_id, model, seed, trained_model_loaded, games_counter, scores, stop):
+    """
+    Plays headless games and trains the shared model like train() does
+
+    Args:
+        worker_id: index of the worker, used to derive its seeds
+        model: Linear_QNet whose parameters are in shared memory
+        seed: seed of the run
+        trained_model_loaded: True if the model was loaded from a saved model
+        games_counter: shared number of games played by all workers
+        scores: queue receiving (worker_id, score) for every finished game
+        stop: event set by the main process to stop the worker
+    """
+    torch.set_num_threads(1)
+    # Own optimizer, shared parameters: updates are applied without locks
+    agent = Agent(seed=derive_seed(seed, worker_id, AGENT_STREAM), model=model)
+    agent.trained_model_loaded = trained_model_loaded
+    game = SnakeGameAI(render=False, seed=derive_seed(seed, worker_id, GAME_STREAM))
+
+    while not stop.is_set():
+        agent.n_games = games_counter.value
+
+        state_old = agent.get_state(game)
+        final_move, _ = agent.get_action(state_old, game)
+        reward, done, score = game.play_step(final_move, agent)
+        state_new = agent.get_state(game)
+
+        agent.train_short_memory(state_old, final_move, reward, state_new, done)
+        agent.remember(state_old, final_move, reward, state_new, done)
+
+        if done:
+            game.reset()
+            with games_counter.get_lock():
+                games_counter.value += 1
+            agent.train_long_memory()
+            scores.put((worker_id, score))
+
+def train_hogwild(use_existing_model=True, num_workers=None, seed=None,
+                  max_games=None, time_budget=None):
+    """
+    Trains the agent with several Hogwild worker processes
+
+    The parameters of Linear_QNet are moved to shared memory. Every worker
+    plays its own headless game and calls QTrainer.train_step on the shared
+    model with no locking, exactly like the single-process train() loop.
+    This process only collects scores and saves the model on new records.
+
+    Args:
+        use_existing_model: If True, uses an existing model if available
+        num_workers: number of worker processes, default one per core
+        seed: seed of the run, every worker gets its own streams derived from it
+        max_games: number of games after which training stops, None to train forever
+        time_budget: seconds after which training stops, None to train forever
+
+    Returns:
+        history: list of (seconds since start, score) for every game played
+    """
+    if num_workers is None:
+        num_workers = default_num_workers()
+
+    agent = Agent(use_existing_model=use_existing_model, seed=derive_seed(seed, 0, AGENT_STREAM))
+    agent.model.share_memory()
+
+    ctx = mp.get_context('spawn')
+    games_counter = ctx.Value('i', agent.n_games)
+    scores = ctx.Queue()
+    stop = ctx.Event()
+    workers = [ctx.Process(target=_worker, daemon=True,
+                           args=(i + 1, agent.model, seed, agent.trained_model_loaded,
+                                 games_counter, scores, stop))
+               for i in range(num_workers)]
+    for worker in workers:
+        worker.start()
+
+    history = []
+    start_time = time.perf_counter()
+    try:
+        while True:
+            elapsed = time.perf_counter() - start_time
+            if time_budget is not None and elapsed >= time_budget:
+                return history
+            try:
+                worker_id, score = scores.get(timeout=0.1)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    raise RuntimeError("All worker processes have stopped")
+                continue
+
+            if score > agent.record:
+                agent.record = score
+                agent.model.save()
+
+            print('Game', len(history) + 1, 'Score', score, 'Record:', agent.record,
+                  'Worker:', worker_id)
+
+            history.append((time.perf_counter() - start_time, score))
+            if max_games is not None and len(history) >= max_games:
+                return history
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                # SDL turns SIGTERM into a quit event, only SIGKILL is sure to stop it
+                worker.kill()
+                worker.join()
@@ -2,6 +2,8 @@
 Memory management module for Snake AI Agent
 """
 
+import random
+import threading
 from collections import deque
 
 # Maximum memory size
@@ -12,27 +14,37 @@ BATCH_SIZE = 1000
 class ReplayMemory:
     """
     Replay memory for storing agent experiences
+
+    Storing and sampling hold a lock, so that a learner thread can sample
+    while the game thread keeps storing experiences.
     """
-    def __init__(self, max_size=MAX_MEMORY):
+    def __init__(self, max_size=MAX_MEMORY, rng=None):
         self.memory = deque(maxlen=max_size)
+        self.rng = rng if rng is not None else random.Random()
+        self.lock = threading.Lock()
     
     def remember(self, state, action, reward, next_state, done):
         """
         Stores an experience in memory
         """
-        self.memory.append((state, action, reward, next_state, done))
+        with self.lock:
+            self.memory.append((state, action, reward, next_state, done))
     
-    def get_batch(self, batch_size=BATCH_SIZE):
+    def get_batch(self, batch_size=BATCH_SIZE, rng=None):
         """
         Retrieves a batch of experiences for learning
         
+        Args:
+            batch_size: number of experiences
+            rng: random generator to sample with, the memory's own by default
+        
         Returns:
             Mini-batch of random experiences from memory
         """
-        import random
-        if len(self.memory) > batch_size:
-            mini_sample = random.sample(self.memory, batch_size)
-        else:
-            mini_sample = list(self.memory)
+        with self.lock:
+            if len(self.memory) > batch_size:
+                mini_sample = (rng or self.rng).sample(self.memory, batch_size)
+            else:
+                mini_sample = list(self.memory)
             
         return mini_sample
\ No newline at end of file
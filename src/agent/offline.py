@@ -0,0 +1,65 @@
+"""
+Offline training module for Snake AI Agent
+Trains the Q-network from transitions exported to shards, without playing
+"""
+
+import time
+import torch
+from src.model.network import Linear_QNet
+from src.model.trainer import QTrainer
+from src.model.dataset import iter_batches, SHUFFLE_BUFFER, BATCH_SIZE
+from src.agent.action import LEARNING_RATE, GAMMA, HIDDEN_SIZE
+
+def train_offline(shard_dir, epochs=1, batch_size=BATCH_SIZE, lr=LEARNING_RATE, gamma=GAMMA,
+                  hidden_size=HIDDEN_SIZE, shuffle_buffer=SHUFFLE_BUFFER, seed=None,
+                  model_path=None, file_name='model_offline.pth', verbose=True):
+    """
+    Trains a Linear_QNet on the transitions of a shard directory
+
+    Batches are streamed by iter_batches, so the dataset never has to fit
+    in memory and the next batches are loaded while the current one trains.
+
+    Args:
+        shard_dir: directory written by a ShardWriter
+        epochs: passes over the dataset
+        batch_size: transitions per training step
+        lr: learning rate
+        gamma: discount factor for future rewards
+        hidden_size: size of the hidden layer of a new model
+        shuffle_buffer: rows mixed together before being batched
+        seed: seed of the weights and of the data order
+        model_path: weights to start from, None for a new model
+        file_name: name the trained model is saved under, None to not save it
+
+    Returns:
+        (model, list of the mean loss of every epoch)
+    """
+    if seed is None:
+        model = Linear_QNet(23, hidden_size, 3)
+    else:
+        # Seed the weight initialization without touching the global torch generator
+        with torch.random.fork_rng(devices=[]):
+            torch.manual_seed(seed)
+            model = Linear_QNet(23, hidden_size, 3)
+    if model_path is not None:
+        model.load_state_dict(torch.load(model_path))
+    trainer = QTrainer(model, lr=lr, gamma=gamma)
+
+    losses = []
+    for epoch in range(epochs):
+        start = time.time()
+        total, steps, rows = 0.0, 0, 0
+        epoch_seed = None if seed is None else seed + epoch
+        for batch in iter_batches(shard_dir, batch_size, shuffle_buffer, seed=epoch_seed):
+            total += trainer.train_step(*batch)
+            steps += 1
+            rows += len(batch[-1])
+        losses.append(total / max(steps, 1))
+        if verbose:
+            elapsed = time.time() - start
+            print(f"Epoch {epoch + 1}/{epochs}: loss {losses[-1]:.4f}, "
+                  f"{rows / max(elapsed, 1e-9):.0f} transitions/s")
+
+    if file_name is not None:
+        model.save(file_name)
+    return model, losses
@@ -0,0 +1,153 @@
+"""
+Plotting module for Snake AI Agent
+Draws the training curves in a separate process, without ever blocking training
+"""
+
+import time
+import queue
+import multiprocessing as mp
+
+# Default seconds between two redraws
+PLOT_INTERVAL = 2.0
+# Points kept per curve, older points are merged two by two beyond that
+MAX_POINTS = 2000
+# Pending updates waiting for the plot process
+QUEUE_SIZE = 16
+
+def downsample(points, max_points=MAX_POINTS):
+    """
+    Halves a list of (game, score, mean score) points by averaging
+    neighbours, until it holds at most max_points
+    """
+    while len(points) > max_points:
+        merged = [tuple((a + b) / 2 for a, b in zip(points[i], points[i + 1]))
+                  for i in range(0, len(points) - 1, 2)]
+        points = merged + points[len(points) - len(points) % 2:]
+    return points
+
+def _plot_loop(updates, interval, max_points, show, path):
+    """
+    Plot process: merges the received points and redraws at most once per interval
+    """
+    import matplotlib
+    if not show:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    ax.set_title('Training...')
+    ax.set_xlabel('Number of Games')
+    ax.set_ylabel('Score')
+    score_line, = ax.plot([], [])
+    mean_line, = ax.plot([], [])
+    score_text = ax.text(0, 0, '')
+    mean_text = ax.text(0, 0, '')
+    if show:
+        plt.show(block=False)
+
+    history = []
+    running = True
+    while running:
+        # Wait for points, keeping the window responsive meanwhile
+        deadline = time.monotonic() + interval
+        changed = False
+        while running and time.monotonic() < deadline:
+            try:
+                points = updates.get(timeout=min(0.05, interval))
+            except queue.Empty:
+                if show:
+                    fig.canvas.flush_events()
+                continue
+            if points is None:
+                running = False
+                break
+            history.extend(points)
+            changed = True
+        if not changed:
+            continue
+        if len(history) > max_points:
+            history = downsample(history, max_points // 2)
+        games, scores, means = zip(*history)
+
+        # Only the data of the lines changes, the figure is never rebuilt
+        score_line.set_data(games, scores)
+        mean_line.set_data(games, means)
+        score_text.set_position((games[-1], scores[-1]))
+        score_text.set_text(str(round(scores[-1], 2)))
+        mean_text.set_position((games[-1], means[-1]))
+        mean_text.set_text(str(round(means[-1], 2)))
+        ax.relim()
+        ax.autoscale_view()
+        ax.set_ylim(bottom=0)
+        if show:
+            fig.canvas.draw_idle()
+            fig.canvas.flush_events()
+        if path is not None:
+            fig.savefig(path)
+    plt.close(fig)
+
+class Plotter:
+    """
+    Plots the score and mean score curves from a separate process
+
+    update() only appends to a list. At most once per interval the pending
+    points are handed to the plot process, which merges them into a
+    downsampled history and updates the existing lines. If the plot process
+    falls behind, points wait on the training side instead of blocking it.
+    """
+    def __init__(self, interval=PLOT_INTERVAL, max_points=MAX_POINTS, show=True, path=None):
+        """
+        Starts the plot process
+
+        Args:
+            interval: minimum seconds between two redraws
+            max_points: points kept per curve before downsampling
+            show: If True, opens a plot window
+            path: optional image file rewritten at every redraw
+        """
+        self.interval = interval
+        self.max_points = max_points
+        self._pending = []
+        self._last_send = 0.0
+        ctx = mp.get_context('spawn')
+        self._updates = ctx.Queue(QUEUE_SIZE)
+        self._process = ctx.Process(target=_plot_loop, daemon=True,
+                                    args=(self._updates, interval, max_points, show, path))
+        self._process.start()
+
+    def update(self, game, score, mean_score):
+        """
+        Adds the result of a game, sent to the plot process once per interval
+        """
+        self._pending.append((game, score, mean_score))
+        now = time.monotonic()
+        if now - self._last_send >= self.interval:
+            self._send()
+            self._last_send = now
+
+    def _send(self):
+        """
+        Hands the pending points to the plot process if it has room for them
+        """
+        if not self._pending:
+            return
+        try:
+            self._updates.put_nowait(self._pending)
+            self._pending = []
+        except queue.Full:
+            if len(self._pending) > self.max_points:
+                self._pending = downsample(self._pending, self.max_points // 2)
+
+    def close(self):
+        """
+        Sends the last points and waits for the plot process to finish drawing
+        """
+        self._send()
+        try:
+            self._updates.put(None, timeout=self.interval + 5)
+        except queue.Full:
+            pass
+        self._process.join(timeout=self.interval + 5)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
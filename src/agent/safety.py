@@ -0,0 +1,125 @@
+"""
+Safety action masking module for Snake AI Agent
+"""
+
+from collections import deque
+from src.game.constants import BLOCK_SIZE
+from src.game.entities import Point, Direction
+
+# Index of the 1st-block danger bit for each move (straight, right, left) in the state
+IMMEDIATE_DANGER_BITS = (0, 5, 10)
+
+# Direction in clockwise order, as used by the game to apply relative moves
+CLOCK_WISE = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
+
+def collision_mask(state):
+    """
+    Builds the mask of moves that do not collide on the next step
+
+    The state already holds the 1st-block danger bits, so this is O(1).
+
+    Args:
+        state: state vector returned by get_state
+
+    Returns:
+        list of 3 booleans [straight, right_turn, left_turn], True if allowed
+    """
+    return [not state[bit] for bit in IMMEDIATE_DANGER_BITS]
+
+def next_head(game, move):
+    """
+    Computes the head position after playing a move
+
+    Args:
+        game: instance of SnakeGameAI
+        move: index of the move (0=straight, 1=right turn, 2=left turn)
+    """
+    idx = CLOCK_WISE.index(game.direction)
+    if move == 1:
+        idx = (idx + 1) % 4
+    elif move == 2:
+        idx = (idx - 1) % 4
+    direction = CLOCK_WISE[idx]
+
+    x, y = game.head.x, game.head.y
+    if direction == Direction.RIGHT:
+        x += BLOCK_SIZE
+    elif direction == Direction.LEFT:
+        x -= BLOCK_SIZE
+    elif direction == Direction.DOWN:
+        y += BLOCK_SIZE
+    elif direction == Direction.UP:
+        y -= BLOCK_SIZE
+    return Point(x, y)
+
+def reachable_area(game, start, limit):
+    """
+    Counts the free cells reachable from a position with a bounded flood fill
+
+    The tail is considered free since it moves away on the next step.
+    The fill stops as soon as `limit` cells are found, so its cost is
+    bounded by the snake length rather than by the board size.
+
+    Args:
+        game: instance of SnakeGameAI
+        start: position the head moves to
+        limit: number of cells after which the search stops
+
+    Returns:
+        number of reachable cells, capped at limit
+    """
+    blocked = set(game.body)
+    blocked.discard(game.snake[-1])
+    blocked.add(game.head)
+    blocked.add(start)
+    max_x = game.w - BLOCK_SIZE
+    max_y = game.h - BLOCK_SIZE
+
+    count = 0
+    frontier = deque([start])
+    while frontier and count < limit:
+        pt = frontier.popleft()
+        for nxt in (Point(pt.x + BLOCK_SIZE, pt.y), Point(pt.x - BLOCK_SIZE, pt.y),
+                    Point(pt.x, pt.y + BLOCK_SIZE), Point(pt.x, pt.y - BLOCK_SIZE)):
+            if nxt.x < 0 or nxt.x > max_x or nxt.y < 0 or nxt.y > max_y or nxt in blocked:
+                continue
+            blocked.add(nxt)
+            frontier.append(nxt)
+            count += 1
+            if count >= limit:
+                break
+    return count
+
+def safe_action_mask(state, game=None, check_space=False):
+    """
+    Builds the mask of moves considered safe for the agent
+
+    Moves colliding on the next step are always removed. With check_space,
+    moves entering a region too small to hold the body are removed as well.
+    If the space check would remove every remaining move, only the moves
+    leading to the largest regions are kept.
+
+    Args:
+        state: state vector returned by get_state
+        game: instance of SnakeGameAI, required for the space check
+        check_space: if True, also removes moves entering too small regions
+
+    Returns:
+        list of 3 booleans [straight, right_turn, left_turn], True if allowed
+    """
+    mask = collision_mask(state)
+    if not check_space or game is None or not any(mask):
+        return mask
+
+    # Engines with their own occupancy grid provide a faster flood fill
+    area_fn = game.reachable_area if hasattr(game, 'reachable_area') else (
+        lambda start, limit: reachable_area(game, start, limit))
+
+    needed = len(game.snake)
+    areas = [area_fn(next_head(game, move), needed) if allowed else -1
+             for move, allowed in enumerate(mask)]
+    if any(area >= needed for area in areas):
+        return [area >= needed for area in areas]
+
+    best = max(areas)
+    return [area == best for area in areas]
@@ -0,0 +1,228 @@
+"""
+Shared-memory transport module for Snake AI Agent
+Moves transitions and weights between processes without pickling them
+"""
+
+import torch
+from torch.nn.utils import parameters_to_vector, vector_to_parameters
+from src.agent.memory import MAX_MEMORY, BATCH_SIZE
+
+class SharedTransitionBuffer:
+    """
+    Replay memory stored in shared tensors, written by several processes
+
+    The capacity is split into one ring segment per writer, so every
+    segment has a single producer and needs no lock: the writer fills a
+    slot, then bumps its counter. Readers sample or read transitions in
+    place, only the selected rows are copied into the training batch.
+    """
+    def __init__(self, num_writers, capacity=MAX_MEMORY, state_size=23, action_size=3):
+        """
+        Allocates the shared tensors
+
+        Args:
+            num_writers: number of processes writing transitions
+            capacity: total number of transitions kept
+            state_size: size of a state vector
+            action_size: size of a one-hot action vector
+        """
+        self.num_writers = num_writers
+        self.segment_size = capacity // num_writers
+        size = self.segment_size * num_writers
+
+        # States and actions are 0/1 vectors, bytes are enough
+        self.states = torch.zeros((size, state_size), dtype=torch.uint8).share_memory_()
+        self.next_states = torch.zeros((size, state_size), dtype=torch.uint8).share_memory_()
+        self.actions = torch.zeros((size, action_size), dtype=torch.uint8).share_memory_()
+        self.rewards = torch.zeros(size, dtype=torch.float).share_memory_()
+        self.dones = torch.zeros(size, dtype=torch.bool).share_memory_()
+        # Number of transitions ever written by each writer
+        self.written = torch.zeros(num_writers, dtype=torch.long).share_memory_()
+        # Reader side: number of transitions already read from each segment
+        self.read = [0] * num_writers
+        self._next_writer = 0
+
+    def __len__(self):
+        return sum(min(int(n), self.segment_size) for n in self.written)
+
+    def writer(self, writer_id):
+        """
+        Returns the writer of a segment, to be used by a single process
+        """
+        return SharedTransitionWriter(self, writer_id)
+
+    def _valid_range(self, writer_id):
+        """
+        Returns (first, end) of the transitions of a writer safe to read
+
+        Transitions are numbered in writing order, transition n lives in
+        slot n % segment_size of the segment. The slot of the transition
+        being written next, written % segment_size, is never included.
+        """
+        written = int(self.written[writer_id])
+        return max(0, written - self.segment_size + 1), written
+
+    def _gather(self, writer_ids, numbers):
+        """
+        Copies transitions into a training batch, dropping those overwritten meanwhile
+
+        Args:
+            writer_ids: writer of every transition
+            numbers: number of every transition in its writer's order
+
+        Returns:
+            states, actions, rewards, next_states, dones tensors, None if all were dropped
+        """
+        writer_ids = torch.tensor(writer_ids, dtype=torch.long)
+        numbers = torch.tensor(numbers, dtype=torch.long)
+        idx = writer_ids * self.segment_size + numbers % self.segment_size
+        batch = (self.states[idx], self.actions[idx], self.rewards[idx],
+                 self.next_states[idx], self.dones[idx])
+        # A writer that started transition n + segment_size while the rows were
+        # copied may have torn transition n: only keep rows still intact now
+        intact = numbers > self.written[writer_ids] - self.segment_size
+        if bool(intact.all()):
+            return batch
+        if not bool(intact.any()):
+            return None
+        return tuple(field[intact] for field in batch)
+
+    def read_new(self, limit=BATCH_SIZE):
+        """
+        Returns the transitions written since the last call, None if there are none
+
+        Transitions overwritten before being read are skipped. When there are
+        more than limit new transitions, the writer read first rotates from
+        call to call, so that every writer is read in turn.
+
+        Args:
+            limit: maximum number of transitions returned
+        """
+        writer_ids, numbers = [], []
+        start = self._next_writer
+        self._next_writer = (start + 1) % self.num_writers
+        for k in range(self.num_writers):
+            remaining = limit - len(numbers)
+            if remaining <= 0:
+                break
+            writer_id = (start + k) % self.num_writers
+            first, end = self._valid_range(writer_id)
+            first = max(first, self.read[writer_id])
+            last = min(end, first + remaining)
+            writer_ids.extend([writer_id] * (last - first))
+            numbers.extend(range(first, last))
+            self.read[writer_id] = max(self.read[writer_id], last)
+        if not numbers:
+            return None
+        return self._gather(writer_ids, numbers)
+
+    def sample(self, rng, batch_size=BATCH_SIZE):
+        """
+        Samples a batch of transitions uniformly among the stored ones
+
+        Args:
+            rng: random.Random used to draw the transitions
+            batch_size: size of the batch, smaller if the buffer holds less
+
+        Returns:
+            states, actions, rewards, next_states, dones tensors, None if empty
+        """
+        ranges = [self._valid_range(writer_id) for writer_id in range(self.num_writers)]
+        total = sum(end - first for first, end in ranges)
+        if total == 0:
+            return None
+
+        writer_ids, numbers = [], []
+        for n in rng.sample(range(total), min(batch_size, total)):
+            for writer_id, (first, end) in enumerate(ranges):
+                if n < end - first:
+                    writer_ids.append(writer_id)
+                    numbers.append(first + n)
+                    break
+                n -= end - first
+        return self._gather(writer_ids, numbers)
+
+class SharedTransitionWriter:
+    """
+    Single-producer writer of one segment of a SharedTransitionBuffer
+    """
+    def __init__(self, buffer, writer_id):
+        self.buffer = buffer
+        self.writer_id = writer_id
+        self.base = writer_id * buffer.segment_size
+
+    def append(self, state, action, reward, next_state, done):
+        """
+        Writes a transition, then publishes it by bumping the counter
+        """
+        buffer = self.buffer
+        written = int(buffer.written[self.writer_id])
+        slot = self.base + written % buffer.segment_size
+        buffer.states[slot] = torch.as_tensor(state, dtype=torch.uint8)
+        buffer.next_states[slot] = torch.as_tensor(next_state, dtype=torch.uint8)
+        buffer.actions[slot] = torch.as_tensor(action, dtype=torch.uint8)
+        buffer.rewards[slot] = reward
+        buffer.dones[slot] = done
+        buffer.written[self.writer_id] = written + 1
+
+class SharedWeights:
+    """
+    Versioned block of model parameters in shared memory
+
+    The learner publishes its parameters as one flat tensor, readers copy
+    it into their own model when the version changed. The version is odd
+    while a write is in progress (seqlock), so readers retry instead of
+    loading half-written weights.
+    """
+    def __init__(self, model):
+        """
+        Allocates the block for a model's parameters
+
+        Args:
+            model: model whose parameters are shared
+        """
+        self.flat = parameters_to_vector(model.parameters()).detach().clone().share_memory_()
+        # [version, step published along with the weights]
+        self.meta = torch.zeros(2, dtype=torch.long).share_memory_()
+
+    @property
+    def version(self):
+        return int(self.meta[0])
+
+    def publish(self, model, step=0):
+        """
+        Copies the model parameters into the block and bumps the version
+
+        Args:
+            model: model to publish, with the same layout as at creation
+            step: counter published with the weights (e.g. number of games)
+        """
+        self.meta[0] += 1
+        with torch.no_grad():
+            self.flat.copy_(parameters_to_vector(model.parameters()))
+        self.meta[1] = step
+        self.meta[0] += 1
+
+    def pull(self, model, last_version=0):
+        """
+        Loads the published parameters into a model if they are newer
+
+        Args:
+            model: model receiving the parameters
+            last_version: version the model already holds
+
+        Returns:
+            (version, step) now held by the model, step is None if nothing was loaded
+        """
+        while True:
+            version = self.version
+            if version == last_version or version % 2 == 1:
+                return last_version, None
+            flat = self.flat.clone()
+            step = int(self.meta[1])
+            if self.version == version:
+                break
+
+        with torch.no_grad():
+            vector_to_parameters(flat, model.parameters())
+        return version, step
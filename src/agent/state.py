@@ -3,6 +3,7 @@ State management module for Snake AI Agent
 """
 
 import numpy as np
+from src.game.constants import BLOCK_SIZE
 from src.game.entities import Point, Direction
 
 def get_state(game):
@@ -15,8 +16,20 @@ def get_state(game):
     Returns:
         A numpy array representing the game state
     """
+    # Engines with their own occupancy grid provide the danger bits at once
+    dangers = game.danger_rays() if hasattr(game, 'danger_rays') else None
+    if dangers is not None:
+        dir_l = game.direction == Direction.LEFT
+        dir_r = game.direction == Direction.RIGHT
+        dir_u = game.direction == Direction.UP
+        dir_d = game.direction == Direction.DOWN
+        head = game.head
+        return np.array(dangers + [dir_l, dir_r, dir_u, dir_d,
+                                   game.food.x < head.x, game.food.x > head.x,
+                                   game.food.y < head.y, game.food.y > head.y], dtype=int)
+
     head = game.snake[0]
-    block_size = game.w // 32  # Assumed value of BLOCK_SIZE
+    block_size = BLOCK_SIZE
     
     # Define points at 1, 2, 3, 4, and 5 blocks distance in each direction
     # Left direction
@@ -0,0 +1,197 @@
+"""
+Hyperparameter sweep module for Snake AI Agent
+Runs many headless train() jobs in a process pool and collects their results
+"""
+
+import os
+import csv
+import sys
+import random
+import tempfile
+import itertools
+import multiprocessing as mp
+import numpy as np
+import torch
+from src.agent.trainer import train
+from src.utils.seeding import derive_seed
+
+# Agent hyperparameters a sweep may vary
+AGENT_PARAMS = ('lr', 'gamma', 'hidden_size', 'epsilon_start', 'epsilon_trained',
+                'batch_size', 'max_memory')
+# train() options a sweep may vary as well
+TRAIN_PARAMS = ('action_mask', 'check_space', 'loop_detection', 'async_learner')
+# Fraction of the last games used for the final score of a job
+FINAL_FRACTION = 0.25
+
+def grid_configs(space):
+    """
+    Lists every combination of a grid
+
+    Args:
+        space: dict mapping a parameter to the list of its values
+
+    Returns:
+        list of dicts, one per combination
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+def random_configs(space, samples, seed=None):
+    """
+    Draws random combinations from a search space
+
+    Args:
+        space: dict mapping a parameter to a list of values to choose from,
+            or to a dict {"min": a, "max": b} drawn uniformly, with "log": true
+            for a log-uniform draw and "int": true to round the value; values
+            are rounded to 4 significant digits and stay within [min, max]
+        samples: number of combinations
+        seed: seed of the draws
+
+    Returns:
+        list of dicts, one per combination
+    """
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(samples):
+        config = {}
+        for name, values in space.items():
+            if isinstance(values, dict):
+                low, high = values['min'], values['max']
+                if values.get('log'):
+                    value = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+                else:
+                    value = rng.uniform(low, high)
+                value = int(round(value)) if values.get('int') else float(f'{value:.4g}')
+                # Rounding may step just outside the range
+                config[name] = min(max(value, low), high)
+            else:
+                config[name] = rng.choice(values)
+        configs.append(config)
+    return configs
+
+def _init_worker(cpus, work_dir):
+    """
+    Pins a pool worker to one core and isolates its files and output
+    """
+    cpu = cpus.get()
+    if cpu is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cpu})
+    torch.set_num_threads(1)
+    # model.save() writes to ./model, keep every worker's saves apart
+    os.chdir(tempfile.mkdtemp(dir=work_dir))
+    sys.stdout = open(os.devnull, 'w')
+
+def _run_job(job):
+    """
+    Trains one configuration headless and summarizes its scores
+
+    Args:
+        job: (index of the job, configuration, seed, max_games, time_budget)
+
+    Returns:
+        dict with the configuration, the number of games and the scores
+    """
+    index, config, seed, max_games, time_budget = job
+    agent_params = {name: value for name, value in config.items() if name in AGENT_PARAMS}
+    train_params = {name: value for name, value in config.items() if name in TRAIN_PARAMS}
+    history = train(use_existing_model=False, seed=seed, render=False,
+                    max_games=max_games, time_budget=time_budget,
+                    agent_params=agent_params, **train_params)
+
+    scores = [score for _, score in history]
+    final = scores[-max(1, int(len(scores) * FINAL_FRACTION)):]
+    return dict(config, job=index, seed=seed, games=len(scores),
+                seconds=round(history[-1][0], 1),
+                mean_score=round(float(np.mean(scores)), 2),
+                final_score=round(float(np.mean(final)), 2),
+                best_score=max(scores))
+
+def run_sweep(configs, num_workers=None, seed=None, max_games=None, time_budget=None,
+              repeats=1, pin_cpus=True):
+    """
+    Trains every configuration in parallel and collects the results
+
+    Each pool worker is pinned to its own core and runs one headless
+    train() at a time with a single torch thread, so jobs do not compete
+    for cores. Every job stops after max_games games or time_budget seconds.
+
+    Args:
+        configs: list of dicts of hyperparameters, see AGENT_PARAMS and TRAIN_PARAMS
+        num_workers: number of pool processes, default one per available core
+        seed: seed of the sweep, repeat r of every configuration uses derive_seed(seed, r)
+        max_games: number of games of every job
+        time_budget: seconds of every job
+        repeats: number of seeds every configuration is trained with
+        pin_cpus: If True, pins every worker to one core
+
+    Returns:
+        results: list of dicts, best final score first
+    """
+    if max_games is None and time_budget is None:
+        raise ValueError("A sweep needs max_games or time_budget")
+    unknown = {name for config in configs for name in config} - set(AGENT_PARAMS + TRAIN_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown hyperparameters: {', '.join(sorted(unknown))}")
+
+    if hasattr(os, 'sched_getaffinity'):
+        cores = sorted(os.sched_getaffinity(0))
+    else:
+        cores = list(range(os.cpu_count() or 1))
+    if num_workers is None:
+        num_workers = len(cores)
+
+    ctx = mp.get_context('spawn')
+    cpus = ctx.Queue()
+    for w in range(num_workers):
+        cpus.put(cores[w % len(cores)] if pin_cpus else None)
+
+    jobs = [(i * repeats + r, config,
+             derive_seed(seed, r) if seed is not None else random.randrange(2 ** 32),
+             max_games, time_budget)
+            for i, config in enumerate(configs) for r in range(repeats)]
+
+    results = []
+    # The workers' directories are removed once the pool has shut down
+    with tempfile.TemporaryDirectory(prefix='snake_sweep_') as work_dir:
+        # Workers are closed rather than terminated: SDL turns SIGTERM into a quit event
+        pool = ctx.Pool(num_workers, initializer=_init_worker, initargs=(cpus, work_dir))
+        try:
+            for result in pool.imap_unordered(_run_job, jobs):
+                results.append(result)
+                print(f"[{len(results)}/{len(jobs)}] job {result['job']}: "
+                      f"final score {result['final_score']} in {result['games']} games")
+        finally:
+            pool.close()
+            pool.join()
+
+    results.sort(key=lambda result: (-result['final_score'], result['job']))
+    return results
+
+def _columns(results):
+    """
+    Returns the columns of the results, hyperparameters first
+    """
+    params = sorted({name for result in results for name in result} -
+                    {'job', 'seed', 'games', 'seconds', 'mean_score', 'final_score', 'best_score'})
+    return ['job', 'seed'] + params + ['games', 'seconds', 'mean_score', 'final_score', 'best_score']
+
+def format_table(results):
+    """
+    Formats the results as a text table
+    """
+    columns = _columns(results)
+    rows = [[str(result.get(name, '')) for name in columns] for result in results]
+    widths = [max([len(name)] + [len(row[i]) for row in rows]) for i, name in enumerate(columns)]
+    lines = [' '.join(name.rjust(width) for name, width in zip(columns, widths))]
+    lines += [' '.join(value.rjust(width) for value, width in zip(row, widths)) for row in rows]
+    return '\n'.join(lines)
+
+def save_csv(results, file_name):
+    """
+    Writes the results to a CSV file
+    """
+    with open(file_name, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=_columns(results))
+        writer.writeheader()
+        writer.writerows(results)
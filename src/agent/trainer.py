@@ -2,81 +2,206 @@
 Training module for Snake AI Agent
 """
 
-import matplotlib.pyplot as plt
-from IPython import display
-from src.game import SnakeGameAI
+import time
+import atexit
+from src.game import ENGINES
+from src.game.live_view import LiveViewPublisher
+from src.game.hud import ThroughputHud, add_hud_fields
 from src.agent.action import Agent
+from src.agent.async_learner import AsyncLearner
+from src.agent.plotter import Plotter, PLOT_INTERVAL
+from src.utils.seeding import derive_seed, GAME_STREAM, AGENT_STREAM
+from src.utils.metrics import TrainingMetrics
+from src.utils.profiler import PhaseProfiler, NULL_PROFILER
 
-def plot(scores, mean_scores):
-    """
-    Displays a graph of scores during training
-    """
-    display.clear_output(wait=True)
-    display.display(plt.gcf())
-    plt.clf()
-    plt.title('Training...')
-    plt.xlabel('Number of Games')
-    plt.ylabel('Score')
-    plt.plot(scores)
-    plt.plot(mean_scores)
-    plt.ylim(ymin=0)
-    plt.text(len(scores) - 1, scores[-1], str(scores[-1]))
-    plt.text(len(mean_scores) - 1, mean_scores[-1], str(mean_scores[-1]))
-    plt.show(block=False)
-    plt.pause(.1)
+# Seconds between two printed games when the records go to a metrics sink
+PRINT_INTERVAL = 10.0
 
-def train(use_existing_model=True):
+def train(use_existing_model=True, action_mask=False, check_space=False, loop_detection=None,
+          seed=None, render=True, max_games=None, time_budget=None, async_learner=False,
+          agent_params=None, live_view=False, recorder=None, episode_log=None,
+          plot_interval=PLOT_INTERVAL, metrics=None, metrics_sink=None, profiler=None,
+          hud=False, engine='list'):
     """
     Main training function for the agent
     
     Args:
         use_existing_model: If True, uses an existing model if available
+        action_mask: If True, the agent never picks a move colliding on the next step
+        check_space: If True, the mask also removes moves entering a region too small for the body
+        loop_detection: 'end' or 'penalize' to react as soon as a position repeats without eating
+        seed: seed of the run, the game and the agent get their own streams derived from it
+        render: If False, trains headless without game window nor plot
+        max_games: number of games after which training stops, None to train forever
+        time_budget: seconds after which training stops, None to train forever
+        async_learner: If True, a background learner thread trains the model
+            continuously and the game loop only uses snapshots of its weights
+        agent_params: optional dict of Agent hyperparameters (lr, gamma, hidden_size,
+            epsilon_start, epsilon_trained, batch_size, max_memory)
+        live_view: If True, publishes the board to shared memory so that a viewer
+            (python main.py --view) can watch the run without slowing it down
+        recorder: optional EpisodeRecorder logging the seed and moves of every game
+        episode_log: optional EpisodeLogWriter appending every game to a binary log
+        plot_interval: seconds between two redraws of the score plot, drawn by
+            a separate process; None disables the plot
+        metrics: optional TrainingMetrics receiving the score and length of
+            every game, a new one by default
+        metrics_sink: optional MetricsSink receiving one record per game; the
+            console then only shows new records and a game every PRINT_INTERVAL seconds
+        profiler: optional PhaseProfiler timing every phase of the loop
+        hud: If True, the info box of the game window and of the live view also
+            shows steps/s, games/min, inference and long training times, replay
+            memory fill and process memory, read from the profiler (one is
+            created if none is given)
+        engine: game engine, 'list' (reference) or 'bitboard' (bitboard
+            collisions, danger rays and flood fills)
+    
+    Returns:
+        history: list of (seconds since start, score) for every game played,
+            running statistics are found in metrics
     """
-    plot_scores = []
-    plot_mean_scores = []
-    total_score = 0
-    record = 0
-    agent = Agent(use_existing_model=use_existing_model)
-    game = SnakeGameAI()
+    metrics = metrics if metrics is not None else TrainingMetrics()
+    agent = Agent(use_existing_model=use_existing_model,
+                  action_mask=action_mask, check_space=check_space,
+                  seed=derive_seed(seed, 0, AGENT_STREAM), **(agent_params or {}))
+    game = ENGINES[engine](loop_detection=loop_detection, render=render,
+                           seed=derive_seed(seed, 0, GAME_STREAM))
+    # Games are only kept one by one when the run has a budget to end it
+    history = [] if max_games is not None or time_budget is not None else None
+    games_played = 0
+    start_time = time.perf_counter()
+    last_game_time = start_time
+    last_print = None
+    total_steps = 0
+    
+    learner = None
+    if async_learner:
+        learner = AsyncLearner(agent, batch_size=agent.batch_size)
+        learner.start()
+    
+    view = None
+    if live_view:
+        view = LiveViewPublisher(game.cols, game.rows)
+        # Training usually ends by closing the window or Ctrl+C: remove the block on exit
+        atexit.register(view.close)
+    plotter = Plotter(plot_interval) if render and plot_interval else None
+    
+    # Every phase ends with a lap, which costs nothing with the null profiler
+    if profiler is None:
+        profiler = PhaseProfiler(report_interval=None, stream=None) if hud else NULL_PROFILER
+    game.profiler = profiler
+    profiler.start()
+    
+    throughput = None
+    if hud:
+        throughput = ThroughputHud(profiler, agent.memory)
+        if render:
+            add_hud_fields(game.renderer.info_box)
+            game.hud = throughput
     
     while True:
         # Get current state
+        lap = profiler.clock()
         state_old = agent.get_state(game)
+        lap = profiler.lap('get_state', lap)
         
         # Get action to perform
-        final_move, prediction_scores = agent.get_action(state_old)
+        final_move, prediction_scores = agent.get_action(state_old, game)
         agent.last_prediction_scores = prediction_scores
+        lap = profiler.lap('get_action', lap)
         
         # Execute action and get new state
         reward, done, score = game.play_step(final_move, agent)
+        lap = profiler.lap('play_step', lap)
         state_new = agent.get_state(game)
+        lap = profiler.lap('get_state', lap)
+        
+        # Log the move for later replays
+        if recorder is not None:
+            recorder.step(game, final_move, done, score)
+        if episode_log is not None:
+            episode_log.step(game, final_move, reward, done, score)
+        
+        # Hand the board to the viewer, if one is attached
+        if view is not None and not done:
+            view.publish(game, state_new, agent.n_games, agent.record,
+                         throughput.update() if throughput is not None else None)
+        lap = profiler.lap('logging', lap)
         
         # Train short-term memory
-        agent.train_short_memory(state_old, final_move, reward, state_new, done)
+        if learner is None:
+            agent.train_short_memory(state_old, final_move, reward, state_new, done)
+            lap = profiler.lap('train_short_memory', lap)
         
         # Remember data for long-term memory training
         agent.remember(state_old, final_move, reward, state_new, done)
+        lap = profiler.lap('remember', lap)
 
         # If game is over
         if done:
+            length = game.frame_iteration
             game.reset()
             agent.n_games += 1
+            lap = profiler.lap('reset', lap)
             
             # Train long-term memory
-            agent.train_long_memory()
+            if learner is None:
+                loss = agent.train_long_memory()
+                lap = profiler.lap('train_long_memory', lap)
+            else:
+                learner.check()
+                loss = learner.last_loss
 
             # Check if we've reached a new record
-            if score > agent.record:
+            new_record = score > agent.record
+            if new_record:
                 agent.record = score
                 agent.model.save()
+                lap = profiler.lap('model_save', lap)
 
-            print('Game', agent.n_games, 'Score', score, 'Record:', agent.record)
+            # The sink keeps every game, the console only needs a sign of life
+            if (metrics_sink is None or new_record or last_print is None or
+                    time.perf_counter() - last_print >= PRINT_INTERVAL):
+                print('Game', agent.n_games, 'Score', score, 'Record:', agent.record)
+                last_print = time.perf_counter()
+            lap = profiler.lap('print', lap)
 
-            # Update data for plotting
-            plot_scores.append(score)
-            total_score += score
-            mean_score = total_score / agent.n_games
-            plot_mean_scores.append(mean_score)
+            # Update the statistics and hand the point to the plot process
+            metrics.add_game(score, length)
+            if plotter is not None:
+                plotter.update(agent.n_games, score, metrics.score.window.mean)
+                lap = profiler.lap('plot', lap)
+            
+            # Log a record of the game
+            now = time.perf_counter()
+            elapsed = now - start_time
+            total_steps += length
+            if metrics_sink is not None:
+                metrics_sink.write({'game': agent.n_games, 'score': score, 'steps': length,
+                                    'epsilon': agent.epsilon, 'loss': loss,
+                                    'steps_per_sec': length / max(now - last_game_time, 1e-9),
+                                    'total_steps': total_steps, 'wall_time': elapsed,
+                                    'record': agent.record,
+                                    'score_window_mean': metrics.score.window.mean,
+                                    'score_ema': metrics.score.ema.value})
+            last_game_time = now
+            profiler.lap('game_over', lap)
+            profiler.game_over()
             
-            # Display the graph
-            plot(plot_scores, plot_mean_scores)
\ No newline at end of file
+            # Stop when the training budget is spent
+            if history is not None:
+                history.append((elapsed, score))
+            games_played += 1
+            if ((max_games is not None and games_played >= max_games) or
+                    (time_budget is not None and elapsed >= time_budget)):
+                if learner is not None:
+                    learner.stop()
+                if view is not None:
+                    view.close()
+                    atexit.unregister(view.close)
+                if plotter is not None:
+                    plotter.close()
+                if episode_log is not None:
+                    episode_log.flush()
+                profiler.stop()
+                return history
\ No newline at end of file
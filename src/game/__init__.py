@@ -4,6 +4,7 @@ Contains the game environment and its components
 """
 
 from src.game.environment import SnakeGameAI
+from src.game.bitboard import BitBoard, BitboardSnakeGameAI, ENGINES
 from src.game.entities import Direction, Point
 
-__all__ = ["SnakeGameAI", "Direction", "Point"]
\ No newline at end of file
+__all__ = ["SnakeGameAI", "BitBoard", "BitboardSnakeGameAI", "ENGINES", "Direction", "Point"]
\ No newline at end of file
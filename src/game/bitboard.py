@@ -0,0 +1,258 @@
+"""
+Bitboard engine for Snake AI Game
+Stores the board occupancy as a Python big-int, one bit per cell
+"""
+
+from src.game.constants import BLOCK_SIZE
+from src.game.entities import Direction
+from src.game.environment import SnakeGameAI
+
+# Cells seen by a danger ray, also the width of the wall padding of the lines
+RAY_LENGTH = 5
+_RAY_MASK = (1 << RAY_LENGTH) - 1
+# Bit-reversed ray masks, for the rays going towards lower indices
+_REVERSED = [int(f"{m:0{RAY_LENGTH}b}"[::-1], 2) for m in range(1 << RAY_LENGTH)]
+# Danger bits of every ray mask, nearest cell first
+_RAY_BITS = [[(m >> k) & 1 for k in range(RAY_LENGTH)] for m in range(1 << RAY_LENGTH)]
+# Index in BitBoard.rays (right, left, down, up) of the straight, right
+# turn and left turn rays of each direction
+_TURNS = {Direction.RIGHT: (0, 2, 3), Direction.LEFT: (1, 3, 2),
+          Direction.UP: (3, 0, 1), Direction.DOWN: (2, 1, 0)}
+
+class BitBoard:
+    """
+    Occupancy grid stored as big-int bitboards
+
+    Every row and every column is a small bitboard padded with
+    RAY_LENGTH wall bits on both sides, so setting a cell, testing it or
+    reading the RAY_LENGTH cells next to it in any direction is one shift
+    and one mask on a short int. The whole board, cell (col, row) at bit
+    row * cols + col, is only needed by the flood fill: its updates are
+    queued and applied when it is read.
+    """
+    def __init__(self, cols, rows):
+        """
+        Initializes an empty board
+
+        Args:
+            cols: number of columns
+            rows: number of rows
+        """
+        self.cols = cols
+        self.rows = rows
+        self.full = (1 << (cols * rows)) - 1
+        self.row_bits = [_RAY_MASK | (_RAY_MASK << (cols + RAY_LENGTH))] * rows
+        self.col_bits = [_RAY_MASK | (_RAY_MASK << (rows + RAY_LENGTH))] * cols
+        self._occupied = 0
+        # Cells toggled since the whole board was last read, None once it is
+        # cheaper to rebuild it from the rows
+        self._pending = []
+
+        # Masks preventing horizontal shifts from wrapping to the next row
+        first_col = 0
+        for row in range(rows):
+            first_col |= 1 << (row * cols)
+        self.not_first_col = self.full & ~first_col
+        self.not_last_col = self.full & ~(first_col << (cols - 1))
+
+    def index(self, col, row):
+        """
+        Returns the bit index of a cell
+        """
+        return row * self.cols + col
+
+    def set(self, idx):
+        """
+        Marks a cell as occupied
+        """
+        row, col = divmod(idx, self.cols)
+        self.set_cell(col, row)
+
+    def clear(self, idx):
+        """
+        Marks a cell as free
+        """
+        row, col = divmod(idx, self.cols)
+        self.clear_cell(col, row)
+
+    def is_set(self, idx):
+        """
+        Checks if a cell is occupied
+        """
+        row, col = divmod(idx, self.cols)
+        return (self.row_bits[row] >> (col + RAY_LENGTH)) & 1 == 1
+
+    def set_cell(self, col, row):
+        """
+        Marks the cell (col, row) as occupied
+        """
+        bit = 1 << (col + RAY_LENGTH)
+        if not self.row_bits[row] & bit:
+            self.row_bits[row] |= bit
+            self.col_bits[col] |= 1 << (row + RAY_LENGTH)
+            if self._pending is not None:
+                self._pending.append(row * self.cols + col)
+                if len(self._pending) > self.rows:
+                    self._pending = None
+
+    def clear_cell(self, col, row):
+        """
+        Marks the cell (col, row) as free
+        """
+        bit = 1 << (col + RAY_LENGTH)
+        if self.row_bits[row] & bit:
+            self.row_bits[row] &= ~bit
+            self.col_bits[col] &= ~(1 << (row + RAY_LENGTH))
+            if self._pending is not None:
+                self._pending.append(row * self.cols + col)
+                if len(self._pending) > self.rows:
+                    self._pending = None
+
+    @property
+    def occupied(self):
+        """
+        Whole-board bitboard, cell (col, row) at bit row * cols + col
+        """
+        if self._pending is None:
+            # Rebuilt from the rows, as cheap as applying `rows` toggles
+            line = (1 << self.cols) - 1
+            occupied = 0
+            for row, bits in enumerate(self.row_bits):
+                occupied |= ((bits >> RAY_LENGTH) & line) << (row * self.cols)
+            self._occupied = occupied
+        else:
+            for idx in self._pending:
+                self._occupied ^= 1 << idx
+        self._pending = []
+        return self._occupied
+
+    def rays(self, col, row):
+        """
+        Returns the danger rays around a cell
+
+        Bit k - 1 of a ray is set if the cell at distance k is occupied or
+        outside the board.
+
+        Returns:
+            (right, left, down, up) ray masks
+        """
+        row_bits = self.row_bits[row]
+        col_bits = self.col_bits[col]
+        return ((row_bits >> (col + RAY_LENGTH + 1)) & _RAY_MASK,
+                _REVERSED[(row_bits >> col) & _RAY_MASK],
+                (col_bits >> (row + RAY_LENGTH + 1)) & _RAY_MASK,
+                _REVERSED[(col_bits >> row) & _RAY_MASK])
+
+    def neighbours(self, mask):
+        """
+        Returns the cells adjacent to any cell of the mask
+        """
+        return (((mask << 1) & self.not_first_col) |
+                ((mask >> 1) & self.not_last_col) |
+                ((mask << self.cols) & self.full) |
+                (mask >> self.cols))
+
+    def flood_fill(self, seed, blocked, limit=None):
+        """
+        Counts the free cells reachable from the seed cells
+
+        Args:
+            seed: mask of the cells the fill starts from (not counted)
+            blocked: mask of the cells the fill cannot enter
+            limit: number of cells after which the fill stops, None for no limit
+
+        Returns:
+            number of reachable cells, capped at limit
+        """
+        free = self.full & ~blocked
+        region = self.neighbours(seed) & free
+        while True:
+            count = region.bit_count()
+            if limit is not None and count >= limit:
+                return limit
+            grown = (region | self.neighbours(region)) & free
+            if grown == region:
+                return count
+            region = grown
+
+class BitboardSnakeGameAI(SnakeGameAI):
+    """
+    Snake game environment using a bitboard for spatial queries
+
+    Plays exactly like SnakeGameAI, but collisions, danger rays and flood
+    fills are bitboard operations that do not depend on the snake length.
+    """
+    def set_snake(self, snake, direction):
+        """
+        Places a snake on the board and rebuilds the bitboard from it
+        """
+        super().set_snake(snake, direction)
+        self.board = BitBoard(self.cols, self.rows)
+        # The bitboard holds the body without the head
+        for pt in self.body:
+            self.board.set_cell(pt.x // BLOCK_SIZE, pt.y // BLOCK_SIZE)
+
+    def _grow_head(self):
+        """
+        Adds the new head and moves the previous head into the body
+        """
+        pt = self.snake[0]
+        self.board.set_cell(pt.x // BLOCK_SIZE, pt.y // BLOCK_SIZE)
+        super()._grow_head()
+
+    def _drop_tail(self):
+        """
+        Removes the last segment of the snake from the body
+        """
+        pt = self.snake[-1]
+        self.board.clear_cell(pt.x // BLOCK_SIZE, pt.y // BLOCK_SIZE)
+        super()._drop_tail()
+
+    def is_collision(self, pt=None):
+        """
+        Checks if a position collides with a wall or the snake itself
+        """
+        if pt is None:
+            pt = self.head
+
+        # Check for wall collisions
+        col = pt.x // BLOCK_SIZE
+        row = pt.y // BLOCK_SIZE
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return True
+
+        # Check for collision with snake body
+        return (self.board.row_bits[row] >> (col + RAY_LENGTH)) & 1 == 1
+
+    def danger_rays(self):
+        """
+        Returns the 15 danger bits of get_state: straight, right and left
+        of the head, at 1 to 5 cells, None if the head left the board
+        """
+        col = self.head.x // BLOCK_SIZE
+        row = self.head.y // BLOCK_SIZE
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return None
+        rays = self.board.rays(col, row)
+        straight, turn_right, turn_left = _TURNS[self.direction]
+        return _RAY_BITS[rays[straight]] + _RAY_BITS[rays[turn_right]] + _RAY_BITS[rays[turn_left]]
+
+    def reachable_area(self, start, limit):
+        """
+        Counts the free cells reachable from a position the head moves to
+
+        Same result as src.agent.safety.reachable_area: the tail is free
+        since it moves away on the next step.
+
+        Args:
+            start: position the head moves to
+            limit: number of cells after which the fill stops
+        """
+        start_bit = 1 << self._cell(start)
+        blocked = self.board.occupied | (1 << self._cell(self.head)) | start_bit
+        if len(self.snake) > 1:
+            blocked &= ~(1 << self._cell(self.snake[-1]))
+        return self.board.flood_fill(start_bit, blocked, limit)
+
+# Game engines by name, for the command line and train()
+ENGINES = {'list': SnakeGameAI, 'bitboard': BitboardSnakeGameAI}
@@ -13,4 +13,8 @@ GRID_COLOR = (40, 40, 40) # Grid color (dark gray)
 # Game parameters
 BLOCK_SIZE = 20
 SPEED = 10                # Constant game speed
-GRID_SIZE = 20            # Grid size
\ No newline at end of file
+GRID_SIZE = 20            # Grid size
+FOOD_PLACEMENT_TRIES = 64 # Random draws before scanning the free cells
+
+# Rewards
+LOOP_PENALTY = -1         # Added when a position repeats without eating
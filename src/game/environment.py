@@ -5,13 +5,28 @@ Contains the main SnakeGameAI class
 
 import pygame
 import random
-import numpy as np
+from collections import deque
 from src.game.constants import *
 from src.game.entities import Direction, Point
-from src.game.rendering import (
-    draw_grid, draw_snake, draw_food, 
-    draw_info_box, draw_danger_arrows
-)
+from src.game.zobrist import get_table
+from src.game.rendering import BoardRenderer
+from src.utils.profiler import NULL_PROFILER
+
+# Direction in clockwise order
+CLOCK_WISE = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
+
+# Valid actions (straight, right turn, left turn) and their move index
+VALID_ACTIONS = {(1, 0, 0): 0, (0, 1, 0): 1, (0, 0, 1): 2}
+
+def _link(pt, towards):
+    """
+    Returns the direction from a segment to the neighbouring segment towards the head
+    """
+    if towards.x > pt.x:
+        return Direction.RIGHT
+    if towards.x < pt.x:
+        return Direction.LEFT
+    return Direction.DOWN if towards.y > pt.y else Direction.UP
 
 # Initialize pygame if not already initialized
 if not pygame.get_init():
@@ -21,43 +36,139 @@ class SnakeGameAI:
     """
     Snake game environment for AI
     """
-    def __init__(self, w=640, h=480):
+    def __init__(self, w=640, h=480, loop_detection=None, cols=None, rows=None, render=True, seed=None):
+        """
+        Initializes the game
+        
+        Args:
+            w: width of the board in pixels
+            h: height of the board in pixels
+            loop_detection: what to do when a position repeats without eating,
+                'end' to end the game, 'penalize' to add LOOP_PENALTY to the
+                reward, None to only rely on the timeout
+            cols: width of the board in cells, overrides w
+            rows: height of the board in cells, overrides h
+            render: if False, runs headless with no window and no frame rate limit
+            seed: seed of the game's own random generator, None for a random seed
+        """
         # Adjust dimensions to match the grid
+        if cols is not None:
+            w = cols * BLOCK_SIZE
+        if rows is not None:
+            h = rows * BLOCK_SIZE
         self.w = GRID_SIZE * (w // GRID_SIZE)
         self.h = GRID_SIZE * (h // GRID_SIZE)
-        self.display = pygame.display.set_mode((self.w, self.h))
-        pygame.display.set_caption('Snake AI')
-        self.clock = pygame.time.Clock()
+        self.cols = self.w // BLOCK_SIZE
+        self.rows = self.h // BLOCK_SIZE
+        
+        # Incremental position hash, also usable as a transposition table key
+        self.zobrist = get_table(self.cols * self.rows)
+        self.loop_detection = loop_detection
+        
+        # Own random generator, never shared with other games or the agent
+        self.rng = random.Random(seed)
+        
+        self.render = render
+        if render:
+            self.display = pygame.display.set_mode((self.w, self.h))
+            pygame.display.set_caption('Snake AI')
+            self.clock = pygame.time.Clock()
+            self.renderer = BoardRenderer(self.w, self.h)
         
         # Variables to store prediction scores
         self.prediction_scores = None
         
+        # Times the drawing and the frame rate wait when set to a PhaseProfiler
+        self.profiler = NULL_PROFILER
+        # Adds throughput lines to the info box when set to a ThroughputHud
+        self.hud = None
+        
         # Initialize the game
         self.reset()
 
-    def reset(self):
+    def reset(self, seed=None):
         """
         Resets the game to its initial state
+        
+        Every episode draws its food positions from a generator seeded with
+        episode_seed, so an episode is replayed exactly from its seed and
+        its actions.
+        
+        Args:
+            seed: seed of the episode, None to draw it from the game's generator
         """
-        self.direction = Direction.RIGHT
-        self.head = Point(self.w // 2, self.h // 2)
-        self.snake = [self.head,
-                      Point(self.head.x - BLOCK_SIZE, self.head.y),
-                      Point(self.head.x - (2 * BLOCK_SIZE), self.head.y)]
+        if seed is None:
+            seed = self.rng.getrandbits(32)
+        self.episode_seed = seed
+        self.food_rng = random.Random(seed)
+        
+        head = Point(BLOCK_SIZE * (self.cols // 2), BLOCK_SIZE * (self.rows // 2))
         self.score = 0
         self.food = None
-        self._place_food()
         self.frame_iteration = 0
+        self.set_snake([head,
+                        Point(head.x - BLOCK_SIZE, head.y),
+                        Point(head.x - (2 * BLOCK_SIZE), head.y)], Direction.RIGHT)
+
+    def set_snake(self, snake, direction):
+        """
+        Places a snake on the board and rebuilds everything derived from it
+        
+        Used by reset, and to start from arbitrary positions (benchmarks,
+        long snakes on large boards).
+        
+        Args:
+            snake: list of positions, head first
+            direction: current direction of the snake
+        """
+        self.direction = direction
+        self.head = snake[0]
+        # Deque so that moving costs O(1) whatever the snake length
+        self.snake = deque(snake)
+        # Body positions (head excluded) for O(1) collision checks
+        self.body = set(snake[1:])
+        if self.food is None or self.food in self.body or self.food == self.head:
+            self.food = None
+            self._place_food()
+        
+        self.position_hash = self.zobrist.hash_position(
+            self._body_links(), self._cell(self.head), self.direction, self._cell(self.food))
+        # Positions seen since the food was last eaten
+        self.seen_positions = {self.position_hash}
+
+    def _cell(self, pt):
+        """
+        Returns the cell index of a position in pixels, None if outside the board
+        """
+        col = pt.x // BLOCK_SIZE
+        row = pt.y // BLOCK_SIZE
+        if col < 0 or col >= self.cols or row < 0 or row >= self.rows:
+            return None
+        return row * self.cols + col
 
     def _place_food(self):
         """
         Places food at a random location not occupied by the snake
+        
+        The board must have a free cell, a full board ends the game first.
         """
-        x = random.randint(0, (self.w - BLOCK_SIZE) // BLOCK_SIZE) * BLOCK_SIZE
-        y = random.randint(0, (self.h - BLOCK_SIZE) // BLOCK_SIZE) * BLOCK_SIZE
-        self.food = Point(x, y)
-        if self.food in self.snake:
-            self._place_food()
+        old_food = self.food
+        for _ in range(FOOD_PLACEMENT_TRIES):
+            x = self.food_rng.randint(0, self.cols - 1) * BLOCK_SIZE
+            y = self.food_rng.randint(0, self.rows - 1) * BLOCK_SIZE
+            self.food = Point(x, y)
+            if self.food not in self.body and self.food != self.head:
+                break
+        else:
+            # Nearly full board: pick directly among the free cells
+            free = [Point(col * BLOCK_SIZE, row * BLOCK_SIZE)
+                    for row in range(self.rows) for col in range(self.cols)]
+            free = [pt for pt in free if pt not in self.body and pt != self.head]
+            self.food = self.food_rng.choice(free)
+        
+        if old_food is not None:
+            self.position_hash ^= self.zobrist.food[self._cell(old_food)]
+            self.position_hash ^= self.zobrist.food[self._cell(self.food)]
 
     def play_step(self, action, agent):
         """
@@ -73,31 +184,20 @@ class SnakeGameAI:
             score: current score
         """
         self.frame_iteration += 1
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
+        if self.render:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    quit()
 
         # Store previous position and distance to food
         prev_head = self.head
         prev_distance = self._calculate_distance_to_food(prev_head)
 
-        # Ensure action is valid (straight, right turn, or left turn)
-        valid_actions = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
-        action_is_valid = False
-        
-        for valid_action in valid_actions:
-            if np.array_equal(action, valid_action):
-                action_is_valid = True
-                break
-                
-        if not action_is_valid:
-            # If action is not valid, continue straight by default
-            action = [1, 0, 0]
-
         # Move the snake according to the action
+        # (an invalid action continues straight by default)
         self._move(action)
-        self.snake.insert(0, self.head)
+        self._grow_head()
 
         # Calculate new distance to food
         new_distance = self._calculate_distance_to_food(self.head)
@@ -110,8 +210,12 @@ class SnakeGameAI:
             self.prediction_scores = agent.last_prediction_scores
 
         # Update the user interface
-        self._update_ui(agent)
-        self.clock.tick(SPEED)
+        if self.render:
+            start = self.profiler.clock()
+            self._update_ui(agent)
+            start = self.profiler.lap('play_step/update_ui', start)
+            self.clock.tick(SPEED)
+            self.profiler.lap('play_step/frame_wait', start)
 
         return reward, game_over, self.score
 
@@ -133,7 +237,7 @@ class SnakeGameAI:
         game_over = False
         
         # Check for collisions or timeout
-        if self.is_collision() or self.frame_iteration > 100 * len(self.snake):
+        if self.frame_iteration > 100 * len(self.snake) or self.is_collision():
             game_over = True
             reward = -10
             return reward, game_over
@@ -142,7 +246,11 @@ class SnakeGameAI:
         if self.head == self.food:
             self.score += 1
             reward = 10
+            # The snake fills the board: nowhere left for food, the game is won
+            if len(self.snake) == self.cols * self.rows:
+                return reward, True
             self._place_food()
+            self.seen_positions = {self.position_hash}
         else:
             # Small reward or penalty based on if we're getting closer to food
             if new_distance < prev_distance:
@@ -150,10 +258,50 @@ class SnakeGameAI:
             else:
                 reward = -0.1  # Small penalty for moving away from food
                 
-            self.snake.pop()  # Only remove the tail if we didn't eat
+            self._drop_tail()  # Only remove the tail if we didn't eat
+            
+            # Check if the exact same position was already reached without eating
+            if self.loop_detection is not None:
+                if self.position_hash in self.seen_positions:
+                    if self.loop_detection == 'end':
+                        return -10, True
+                    reward += LOOP_PENALTY
+                else:
+                    self.seen_positions.add(self.position_hash)
 
         return reward, game_over
 
+    def _grow_head(self):
+        """
+        Adds the new head position at the front of the snake
+        """
+        old_head = self._cell(self.snake[0])
+        new_head = self._cell(self.head)
+        self.body.add(self.snake[0])
+        self.snake.appendleft(self.head)
+        
+        # Outside the board the game is over, the hash no longer matters
+        if new_head is not None:
+            # The old head joins the body, linked to the new head by the move
+            self.position_hash ^= self.zobrist.head[old_head] ^ self.zobrist.body[old_head][self.direction]
+            self.position_hash ^= self.zobrist.head[new_head]
+
+    def _drop_tail(self):
+        """
+        Removes the last segment of the snake
+        """
+        link = _link(self.snake[-1], self.snake[-2])
+        tail = self.snake.pop()
+        self.body.discard(tail)
+        self.position_hash ^= self.zobrist.body[self._cell(tail)][link]
+
+    def _body_links(self):
+        """
+        Returns the (cell index, direction of the next segment) of every body segment
+        """
+        return [(self._cell(self.snake[i]), _link(self.snake[i], self.snake[i - 1]))
+                for i in range(1, len(self.snake))]
+
     def is_collision(self, pt=None):
         """
         Checks if a position collides with a wall or the snake itself
@@ -166,7 +314,7 @@ class SnakeGameAI:
             return True
             
         # Check for collision with snake body
-        if pt in self.snake[1:]:
+        if pt in self.body:
             return True
             
         return False
@@ -175,19 +323,19 @@ class SnakeGameAI:
         """
         Moves the snake according to the given action
         """
-        # Direction in clockwise order
-        clock_wise = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
-        idx = clock_wise.index(self.direction)
+        idx = CLOCK_WISE.index(self.direction)
+        move = VALID_ACTIONS.get(tuple(action), 0)
 
-        if np.array_equal(action, [1, 0, 0]):  # straight
-            new_dir = clock_wise[idx]
-        elif np.array_equal(action, [0, 1, 0]):  # right turn
+        if move == 0:  # straight
+            new_dir = CLOCK_WISE[idx]
+        elif move == 1:  # right turn
             next_idx = (idx + 1) % 4
-            new_dir = clock_wise[next_idx]
+            new_dir = CLOCK_WISE[next_idx]
         else:  # [0,0,1] left turn
             next_idx = (idx - 1) % 4
-            new_dir = clock_wise[next_idx]
+            new_dir = CLOCK_WISE[next_idx]
 
+        self.position_hash ^= self.zobrist.direction[self.direction] ^ self.zobrist.direction[new_dir]
         self.direction = new_dir
 
         # Update coordinates based on direction
@@ -206,32 +354,21 @@ class SnakeGameAI:
 
     def _update_ui(self, agent):
         """
-        Updates the user interface
+        Updates the user interface, only redrawing the areas that changed
         """
-        # Fill background with black
-        self.display.fill(BLACK)
-
-        # Draw the grid
-        draw_grid(self.display, self.w, self.h)
-        
-        # Draw the snake
-        draw_snake(self.display, self.snake, self.direction)
-        
-        # Draw the food
-        draw_food(self.display, self.food)
-        
-        # Draw danger arrows if the agent has a get_state method
-        if hasattr(agent, 'get_state'):
-            state = agent.get_state(self)
-            draw_danger_arrows(self.display, state, self.direction, self.head)
+        # Danger arrows if the agent has a get_state method
+        state = agent.get_state(self) if hasattr(agent, 'get_state') else None
             
-        # Draw info box with score, etc.
+        # Info box with score, etc.
         game_info = {
             'score': self.score,
             'games': agent.n_games,
             'record': agent.record
         }
-        draw_info_box(self.display, game_info)
+        if self.hud is not None:
+            game_info.update(self.hud.update())
+        dirty = self.renderer.draw(self.display, self.snake, self.body, self.direction,
+                                   self.food, state, game_info)
         
         # Update display
-        pygame.display.flip()
\ No newline at end of file
+        pygame.display.update(dirty)
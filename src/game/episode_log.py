@@ -0,0 +1,283 @@
+"""
+Episode log for Snake AI Game
+Append-only binary log of every episode, with an index for random access
+"""
+
+import os
+import json
+import struct
+from collections import namedtuple
+import numpy as np
+from src.game.environment import SnakeGameAI, VALID_ACTIONS
+
+# One-hot actions indexed by move (straight, right turn, left turn)
+ACTIONS = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+
+MAGIC = b'SNAKELG1'
+# Episode record header: seed, number of moves, final score
+RECORD = struct.Struct('<QIi')
+# Rewards are stored as signed bytes in tenths (10 -> 100, -0.1 -> -1)
+REWARD_SCALE = 10
+# Size of the write buffer
+BUFFER_SIZE = 1 << 20
+
+# A logged episode: replaying its actions from its seed reproduces it exactly
+LoggedEpisode = namedtuple('LoggedEpisode', 'game, seed, actions, rewards, score')
+
+def pack_moves(moves):
+    """
+    Packs move indices (0, 1 or 2) four per byte
+    """
+    moves = np.frombuffer(bytes(moves), dtype=np.uint8)
+    padded = np.zeros(-(-len(moves) // 4) * 4, dtype=np.uint8)
+    padded[:len(moves)] = moves
+    quads = padded.reshape(-1, 4)
+    return (quads[:, 0] | quads[:, 1] << 2 | quads[:, 2] << 4 | quads[:, 3] << 6).tobytes()
+
+def unpack_moves(packed, count):
+    """
+    Unpacks count move indices packed by pack_moves
+    """
+    packed = np.frombuffer(packed, dtype=np.uint8)
+    quads = np.stack([packed & 3, packed >> 2 & 3, packed >> 4 & 3, packed >> 6 & 3], axis=1)
+    return quads.reshape(-1)[:count].tobytes()
+
+def _record_size(count):
+    """
+    Returns the size in bytes of the record of an episode of count moves
+    """
+    return RECORD.size + -(-count // 4) + count
+
+def _read_header(f):
+    """
+    Reads the file header and returns the game settings
+    """
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a Snake AI episode log")
+    length, = struct.unpack('<I', f.read(4))
+    return json.loads(f.read(length))
+
+def _index_path(path):
+    return path + '.idx'
+
+def _load_index(path):
+    """
+    Memory-maps the complete entries of an index file
+    """
+    count = os.path.getsize(path) // 8 if os.path.exists(path) else 0
+    if count == 0:
+        return np.zeros(0, dtype='<u8')
+    return np.memmap(path, dtype='<u8', mode='r', shape=(count,))
+
+def _scan(f, index, data_size):
+    """
+    Finds the indexed episodes fully written in the data file
+
+    Returns:
+        (number of complete episodes, end offset of the last one or None)
+    """
+    count = len(index)
+    while count > 0:
+        offset = int(index[count - 1])
+        if offset + RECORD.size <= data_size:
+            f.seek(offset)
+            _, moves, _ = RECORD.unpack(f.read(RECORD.size))
+            end = offset + _record_size(moves)
+            if end <= data_size:
+                return count, end
+        count -= 1
+    return 0, None
+
+class EpisodeLogWriter:
+    """
+    Appends every finished episode to a binary log
+
+    A record holds the episode seed, its moves packed four per byte, one
+    byte per reward and the final score: about 1.3 bytes per move. The
+    index file next to the log holds the offset of every record as a
+    64-bit integer, so episode k is found in O(1). Both files are written
+    through large buffers; a log left incomplete by a crash is cut back to
+    its last complete episode when reopened.
+    """
+    def __init__(self, path, game_kwargs=None):
+        """
+        Opens a log for appending, creating it if needed
+
+        Args:
+            path: path of the log, the index is written to path + '.idx'
+            game_kwargs: settings of the games (cols, rows, loop_detection),
+                taken from the first game recorded if not given
+        """
+        self.path = path
+        self.game_kwargs = game_kwargs
+        self._data = None
+        self._index = None
+        self.n_games = 0
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._reopen()
+        self._seed = None
+        self._moves = bytearray()
+        self._rewards = bytearray()
+
+    def _reopen(self):
+        """
+        Opens an existing log, dropping an incomplete last episode
+        """
+        index = _load_index(_index_path(self.path))
+        with open(self.path, 'rb') as f:
+            self.game_kwargs = _read_header(f)
+            header_end = f.tell()
+            count, end = _scan(f, index, os.path.getsize(self.path))
+        del index
+        self._open(end or header_end, count)
+
+    def _open(self, end=None, count=0):
+        """
+        Opens both files for appending, after cutting them to a consistent size
+        """
+        if end is None:
+            with open(self.path, 'wb') as f:
+                header = json.dumps(self.game_kwargs).encode()
+                f.write(MAGIC + struct.pack('<I', len(header)) + header)
+        else:
+            os.truncate(self.path, end)
+        with open(_index_path(self.path), 'ab') as f:
+            f.truncate(count * 8)
+        self._data = open(self.path, 'ab', buffering=BUFFER_SIZE)
+        self._index = open(_index_path(self.path), 'ab', buffering=BUFFER_SIZE)
+        self._offset = self._data.tell()
+        self.n_games = count
+
+    def step(self, game, action, reward, done, score):
+        """
+        Records a move, to be called after play_step and before reset
+
+        Args:
+            game: SnakeGameAI the move was played in
+            action: one-hot action or move index
+            reward: reward of the move
+            done: True if the move ended the episode
+            score: score after the move
+        """
+        if self._seed is None:
+            self._seed = game.episode_seed
+            if self._data is None:
+                if self.game_kwargs is None:
+                    self.game_kwargs = {'cols': game.cols, 'rows': game.rows,
+                                        'loop_detection': game.loop_detection}
+                self._open()
+        self._moves.append(action if isinstance(action, int) else VALID_ACTIONS.get(tuple(action), 0))
+        scaled = round(reward * REWARD_SCALE)
+        if not -128 <= scaled <= 127:
+            raise ValueError(f"Reward {reward} does not fit in the episode log")
+        self._rewards.append(scaled & 0xFF)
+        if done:
+            self._write(score)
+
+    def _write(self, score):
+        """
+        Appends the current episode and its index entry
+        """
+        record = (RECORD.pack(self._seed, len(self._moves), score) +
+                  pack_moves(self._moves) + bytes(self._rewards))
+        self._data.write(record)
+        self._index.write(struct.pack('<Q', self._offset))
+        self._offset += len(record)
+        self.n_games += 1
+        self._seed = None
+        self._moves = bytearray()
+        self._rewards = bytearray()
+
+    def flush(self):
+        """
+        Writes the buffered episodes to disk, data first
+        """
+        if self._data is not None:
+            self._data.flush()
+            self._index.flush()
+
+    def close(self):
+        """
+        Flushes and closes the log, an unfinished episode is dropped
+        """
+        if self._data is not None:
+            self.flush()
+            self._data.close()
+            self._index.close()
+            self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class EpisodeLog:
+    """
+    Read access to an episode log
+
+    The data file and its index are memory-mapped, so opening a log and
+    reading any episode costs the same whatever its size.
+    """
+    def __init__(self, path):
+        """
+        Opens a log written by EpisodeLogWriter
+        """
+        self.path = path
+        self._index = _load_index(_index_path(path))
+        with open(path, 'rb') as f:
+            self.game_kwargs = _read_header(f)
+            self._count, _ = _scan(f, self._index, os.path.getsize(path))
+        self._data = np.memmap(path, dtype=np.uint8, mode='r')
+        # Game replaying the episodes, built on first use and reset for each one
+        self._game = None
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, k):
+        """
+        Returns episode k as a LoggedEpisode, rewards as a float32 array
+        """
+        if k < 0:
+            k += self._count
+        if not 0 <= k < self._count:
+            raise IndexError("episode index out of range")
+        offset = int(self._index[k])
+        seed, count, score = RECORD.unpack(self._data[offset:offset + RECORD.size].tobytes())
+        start = offset + RECORD.size
+        packed_size = -(-count // 4)
+        actions = unpack_moves(self._data[start:start + packed_size].tobytes(), count)
+        rewards = self._data[start + packed_size:start + packed_size + count].view(np.int8)
+        return LoggedEpisode(k, seed, actions, rewards.astype(np.float32) / REWARD_SCALE, score)
+
+    def __iter__(self):
+        for k in range(self._count):
+            yield self[k]
+
+    def transitions(self, k):
+        """
+        Rebuilds the transitions of episode k by replaying it
+
+        Returns:
+            states, actions, rewards, next_states, dones as NumPy arrays,
+            in the layout of the agent's replay memory
+        """
+        from src.agent.state import get_state
+
+        episode = self[k]
+        if self._game is None:
+            self._game = SnakeGameAI(render=False, **self.game_kwargs)
+        game = self._game
+        game.reset(seed=episode.seed)
+        count = len(episode.actions)
+        states = np.zeros((count + 1, 23), dtype=np.int8)
+        states[0] = get_state(game)
+        for step, move in enumerate(episode.actions):
+            game.play_step(ACTIONS[move], None)
+            states[step + 1] = get_state(game)
+        moves = np.frombuffer(episode.actions, dtype=np.uint8)
+        actions = np.eye(3, dtype=np.int8)[moves]
+        dones = np.zeros(count, dtype=np.bool_)
+        dones[-1] = True
+        return states[:-1], actions, episode.rewards, states[1:], dones
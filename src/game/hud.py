@@ -0,0 +1,124 @@
+"""
+Throughput HUD for Snake AI Game
+Info box lines showing the speed and memory use of a training run as it happens
+"""
+
+import os
+import sys
+import time
+from collections import deque
+
+# Seconds between two updates of the values
+HUD_INTERVAL = 0.5
+# Seconds the rates and the latency are averaged over
+HUD_WINDOW = 5.0
+
+# (label, key in game_info, format) of the lines added to the info box
+HUD_FIELDS = (('Steps/s', 'steps_per_sec', '{:.0f}'),
+              ('Games/min', 'games_per_min', '{:.1f}'),
+              ('Infer ms', 'inference_ms', '{:.3f}'),
+              ('Train ms', 'long_train_ms', '{:.1f}'),
+              ('Replay', 'replay_fill', '{:.0%}'),
+              ('RSS MB', 'rss_mb', '{:.0f}'))
+HUD_KEYS = tuple(key for _, key, _ in HUD_FIELDS)
+
+def rss_bytes():
+    """
+    Returns the resident memory of the process, 0 if it cannot be read
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # Peak rather than current size, in kilobytes on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        return 0
+
+def add_hud_fields(info_box):
+    """
+    Adds the HUD lines below the existing lines of an InfoBox
+    """
+    for label, key, fmt in HUD_FIELDS:
+        info_box.add_field(label, key, fmt)
+
+class ThroughputHud:
+    """
+    HUD values computed from the counters of a PhaseProfiler
+
+    The profiler already times every phase of the training loop, so the
+    HUD only reads its counters, at most every HUD_INTERVAL seconds, and
+    averages them over the last HUD_WINDOW seconds. Counters reset by a
+    profiler report are carried over, only the laps between the last
+    update and the report are missed.
+    """
+    def __init__(self, profiler, memory=None, interval=HUD_INTERVAL, window=HUD_WINDOW):
+        """
+        Creates the HUD
+
+        Args:
+            profiler: PhaseProfiler of the training loop
+            memory: optional ReplayMemory whose fill is shown
+            interval: seconds between two updates of the values
+            window: seconds the rates and the latency are averaged over
+        """
+        self.profiler = profiler
+        self.memory = memory
+        self.interval = interval
+        self.window = window
+        self.values = dict.fromkeys(HUD_KEYS, 0.0)
+        # Running totals of (steps, games, actions, action ns), robust to profiler resets
+        self._totals = [0, 0, 0, 0]
+        self._raw = [0, 0, 0, 0]
+        self._reports = 0
+        self._samples = deque()
+        self._last_update = 0.0
+
+    def _counters(self):
+        """
+        Returns the raw profiler counters, in the order of the totals
+        """
+        phases = self.profiler.phases
+        step = phases.get('play_step')
+        action = phases.get('get_action')
+        return [step.calls if step else 0, self.profiler.games,
+                action.calls if action else 0, action.total_ns if action else 0]
+
+    def update(self):
+        """
+        Returns the HUD values, recomputed if the interval has passed
+        """
+        now = time.monotonic()
+        if now - self._last_update < self.interval:
+            return self.values
+        self._last_update = now
+
+        # Counters start again from zero after each report
+        reset = self.profiler.reports != self._reports
+        self._reports = self.profiler.reports
+        for i, raw in enumerate(self._counters()):
+            self._totals[i] += raw if reset else raw - self._raw[i]
+            self._raw[i] = raw
+        self._samples.append((now, *self._totals))
+        while now - self._samples[0][0] > self.window and len(self._samples) > 2:
+            self._samples.popleft()
+
+        values = self.values
+        start, steps, games, actions, action_ns = self._samples[0]
+        seconds = now - start
+        if seconds > 0:
+            values['steps_per_sec'] = (self._totals[0] - steps) / seconds
+            values['games_per_min'] = (self._totals[1] - games) / seconds * 60
+        if self._totals[2] > actions:
+            values['inference_ms'] = (self._totals[3] - action_ns) / (self._totals[2] - actions) * 1e-6
+        long_train = self.profiler.phases.get('train_long_memory')
+        if long_train is not None:
+            values['long_train_ms'] = long_train.last_ns * 1e-6
+        if self.memory is not None:
+            values['replay_fill'] = len(self.memory.memory) / self.memory.memory.maxlen
+        values['rss_mb'] = rss_bytes() / 2 ** 20
+        return values
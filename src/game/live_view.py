@@ -0,0 +1,297 @@
+"""
+Live view module for Snake AI Game
+Publishes board snapshots to shared memory and draws them in a separate viewer
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pygame
+from multiprocessing import shared_memory, resource_tracker
+from src.game.constants import *
+from src.game.entities import Direction, Point
+from src.game.rendering import BoardRenderer
+from src.game.hud import HUD_KEYS, add_hud_fields
+
+# Name of the shared block used by default
+DEFAULT_NAME = 'snake_ai_view'
+VIEWER_FPS = 30
+# Maximum rate at which the trainer copies the board into the block
+PUBLISH_RATE = 60
+# Seconds without a viewer heartbeat after which the trainer stops publishing
+VIEWER_TIMEOUT = 1.0
+STATE_SIZE = 23
+
+# Slots of the int64 header
+(_VERSION, _COLS, _ROWS, _LENGTH, _DIRECTION, _FOOD, _SCORE, _GAMES, _RECORD, _CLOSED, _HUD,
+ _OWNER) = range(12)
+_HEADER_SIZE = 16
+
+def _layout(shm, cols, rows):
+    """
+    Wraps a shared block as (header, heartbeat, hud, state, cells) arrays
+    """
+    header = np.ndarray(_HEADER_SIZE, dtype=np.int64, buffer=shm.buf)
+    offset = header.nbytes
+    heartbeat = np.ndarray(1, dtype=np.float64, buffer=shm.buf, offset=offset)
+    offset += heartbeat.nbytes
+    hud = np.ndarray(len(HUD_KEYS), dtype=np.float64, buffer=shm.buf, offset=offset)
+    offset += hud.nbytes
+    cells = np.ndarray(cols * rows, dtype=np.int32, buffer=shm.buf, offset=offset)
+    offset += cells.nbytes
+    state = np.ndarray(STATE_SIZE, dtype=np.int8, buffer=shm.buf, offset=offset)
+    return header, heartbeat, hud, state, cells
+
+def _block_size(cols, rows):
+    return _HEADER_SIZE * 8 + 8 + len(HUD_KEYS) * 8 + cols * rows * 4 + STATE_SIZE
+
+def _process_alive(pid):
+    """
+    Checks if a process is still running
+    """
+    if os.name == 'nt':
+        # Windows frees a block with its last handle, an existing block is always in use
+        return True
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class LiveViewPublisher:
+    """
+    Trainer side of the live view
+
+    Owns a named shared block holding the latest board. The block is a
+    seqlock: the version is odd while a snapshot is being written, so the
+    viewer retries instead of drawing a half-written board. Nothing is
+    copied while no viewer is attached, and at most PUBLISH_RATE times per
+    second otherwise, so training runs at headless speed.
+
+    The block records the process owning it. A block left over by a
+    trainer that is no longer running is replaced, but a block owned by a
+    running trainer is never taken over.
+    """
+    def __init__(self, cols, rows, name=DEFAULT_NAME):
+        """
+        Creates the shared block
+
+        Args:
+            cols: width of the board in cells
+            rows: height of the board in cells
+            name: name of the block, viewers attach to it by name
+
+        Raises:
+            FileExistsError: if a running trainer already publishes under this name
+        """
+        size = _block_size(cols, rows)
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            existing = shared_memory.SharedMemory(name=name)
+            header = np.ndarray(_HEADER_SIZE, dtype=np.int64, buffer=existing.buf)
+            owner, closed = int(header[_OWNER]), bool(header[_CLOSED])
+            del header
+            existing.close()
+            if not closed and _process_alive(owner):
+                # Only detach, without the tracker removing the block at exit. It
+                # keeps one entry per name, so a block of this process stays registered
+                if owner != os.getpid():
+                    resource_tracker.unregister(existing._name, 'shared_memory')
+                raise FileExistsError(f"Live view '{name}' is in use by process {owner}, "
+                                      f"publish under another name")
+            # Left over by a trainer that did not exit cleanly
+            existing.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.cols = cols
+        self.header, self.heartbeat, self.hud, self.state, self.cells = _layout(self.shm, cols, rows)
+        self.header[:] = 0
+        self.header[_COLS] = cols
+        self.header[_ROWS] = rows
+        self.header[_OWNER] = os.getpid()
+        self.heartbeat[0] = 0.0
+        self._last_publish = 0.0
+
+    @property
+    def viewer_attached(self):
+        return time.monotonic() - self.heartbeat[0] < VIEWER_TIMEOUT
+
+    def publish(self, game, state, games=0, record=0, hud=None):
+        """
+        Copies the board into the block if a viewer wants a new frame
+
+        Args:
+            game: SnakeGameAI whose board is published, with the head on the board
+            state: state of the game, drawn as danger arrows
+            games: number of games played
+            record: best score so far
+            hud: optional dict of throughput values, shown under the info box
+        """
+        now = time.monotonic()
+        if now - self._last_publish < 1 / PUBLISH_RATE or now - self.heartbeat[0] >= VIEWER_TIMEOUT:
+            return
+        self._last_publish = now
+
+        header = self.header
+        length = len(game.snake)
+        header[_VERSION] += 1
+        self.cells[:length] = [pt.y // BLOCK_SIZE * self.cols + pt.x // BLOCK_SIZE for pt in game.snake]
+        self.state[:] = state
+        header[_LENGTH] = length
+        header[_DIRECTION] = game.direction.value
+        header[_FOOD] = game.food.y // BLOCK_SIZE * self.cols + game.food.x // BLOCK_SIZE
+        header[_SCORE] = game.score
+        header[_GAMES] = games
+        header[_RECORD] = record
+        if hud is not None:
+            self.hud[:] = [hud[key] for key in HUD_KEYS]
+            header[_HUD] = 1
+        header[_VERSION] += 1
+
+    def close(self):
+        """
+        Tells the viewers the run is over and removes the block, once
+        """
+        if not hasattr(self, 'header'):
+            return
+        self.header[_CLOSED] = 1
+        del self.header, self.heartbeat, self.hud, self.state, self.cells
+        self.shm.close()
+        self.shm.unlink()
+
+class LiveViewReader:
+    """
+    Viewer side of the live view, attached to a publisher's block
+    """
+    def __init__(self, name=DEFAULT_NAME):
+        """
+        Attaches to a block by name
+
+        Raises:
+            FileNotFoundError: if no trainer publishes under this name
+        """
+        # The trainer owns the block: do not let this process unlink it at exit
+        if sys.version_info >= (3, 13):
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+        header = np.ndarray(_HEADER_SIZE, dtype=np.int64, buffer=self.shm.buf)
+        self.cols, self.rows = int(header[_COLS]), int(header[_ROWS])
+        self.header, self.heartbeat, self.hud, self.state, self.cells = _layout(self.shm, self.cols, self.rows)
+        self.version = 0
+
+    @property
+    def closed(self):
+        return bool(self.header[_CLOSED])
+
+    def read(self):
+        """
+        Signals the viewer is alive and returns the latest board if it changed
+
+        Returns:
+            dict with snake (list of Point), body (set), direction, food, state,
+            score, games and record, plus the HUD values if the trainer
+            publishes them, None if nothing new was published
+        """
+        self.heartbeat[0] = time.monotonic()
+        while True:
+            version = int(self.header[_VERSION])
+            if version == self.version or version % 2 == 1:
+                return None
+            header = self.header.copy()
+            cells = self.cells[:header[_LENGTH]].copy()
+            state = self.state.copy()
+            hud = self.hud.copy()
+            if int(self.header[_VERSION]) == version:
+                break
+        self.version = version
+
+        def point(cell):
+            return Point(int(cell % self.cols) * BLOCK_SIZE, int(cell // self.cols) * BLOCK_SIZE)
+
+        snake = [point(cell) for cell in cells]
+        board = {'snake': snake,
+                 'body': set(snake[1:]),
+                 'direction': Direction(int(header[_DIRECTION])),
+                 'food': point(header[_FOOD]),
+                 'state': state.tolist(),
+                 'score': int(header[_SCORE]),
+                 'games': int(header[_GAMES]),
+                 'record': int(header[_RECORD])}
+        if header[_HUD]:
+            board.update(zip(HUD_KEYS, hud.tolist()))
+        return board
+
+    def close(self):
+        """
+        Detaches from the block
+        """
+        del self.header, self.heartbeat, self.hud, self.state, self.cells
+        self.shm.close()
+
+def draw_board(display, renderer, board):
+    """
+    Draws a board read from the live view, like SnakeGameAI._update_ui
+
+    Returns:
+        list of the rectangles changed
+    """
+    return renderer.draw(display, board['snake'], board['body'], board['direction'],
+                         board['food'], board['state'], board)
+
+def run_viewer(name=DEFAULT_NAME, fps=VIEWER_FPS):
+    """
+    Opens a window showing a training run live, until the window is closed
+
+    The viewer may be started before, during or after the trainer: it waits
+    for the block to appear and reattaches when a new run starts. It is
+    meant to run as its own program (python main.py --view), not as a
+    child process of the trainer.
+
+    Args:
+        name: name of the trainer's block
+        fps: frame rate of the viewer
+    """
+    pygame.init()
+    pygame.display.set_caption('Snake AI - live view')
+    display = pygame.display.set_mode((640, 480))
+    clock = pygame.time.Clock()
+    reader = None
+    try:
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+
+            if reader is None:
+                try:
+                    reader = LiveViewReader(name)
+                    size = (reader.cols * BLOCK_SIZE, reader.rows * BLOCK_SIZE)
+                    if display.get_size() != size:
+                        display = pygame.display.set_mode(size)
+                    renderer = BoardRenderer(*size)
+                    hud_shown = False
+                except FileNotFoundError:
+                    display.fill(BLACK)
+                    pygame.display.flip()
+            elif reader.closed:
+                reader.close()
+                reader = None
+            else:
+                board = reader.read()
+                if board is not None:
+                    if not hud_shown and HUD_KEYS[0] in board:
+                        add_hud_fields(renderer.info_box)
+                        hud_shown = True
+                    pygame.display.update(draw_board(display, renderer, board))
+            clock.tick(fps)
+    finally:
+        if reader is not None:
+            reader.close()
+        pygame.quit()
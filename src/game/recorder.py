@@ -0,0 +1,324 @@
+"""
+Episode recorder for Snake AI Game
+Logs episodes as a seed and move indices, and renders them offscreen to GIF/MP4
+"""
+
+import os
+import json
+import heapq
+import subprocess
+import multiprocessing as mp
+from collections import namedtuple, deque
+import numpy as np
+import pygame
+from src.game.environment import SnakeGameAI, VALID_ACTIONS
+from src.game.rendering import BoardRenderer, InfoBox
+
+# One-hot actions indexed by move (straight, right turn, left turn)
+ACTIONS = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+# Frame rate of the exported videos
+EXPORT_FPS = 15
+# Default number of keep_every episodes kept, the oldest are dropped beyond that
+MAX_EVERY = 100
+# The log is rewritten with the kept episodes alone once it holds this many times more lines
+COMPACT_RATIO = 4
+
+# A finished episode: replaying its actions from its seed reproduces it exactly
+Episode = namedtuple('Episode', 'game, seed, actions, score')
+
+class EpisodeRecorder:
+    """
+    Keeps a compact log of selected episodes
+
+    Only the episode seed and one byte per move are stored while playing.
+    The best and the worst finished episodes (by score, then by length)
+    are kept, plus the last max_every of every keep_every-th episode if
+    asked.
+
+    The file is an append-only log: a change of the kept episodes only
+    appends the new episode and the numbers of the dropped ones, so the
+    cost of a change does not grow with the run. Once the log holds
+    COMPACT_RATIO times more lines than there are kept episodes, it is
+    rewritten by save(), which writes the kept episodes alone.
+    """
+    def __init__(self, keep_best=5, keep_worst=5, keep_every=None, path=None, max_every=MAX_EVERY):
+        """
+        Creates an empty recorder
+
+        Args:
+            keep_best: number of highest-scoring episodes kept
+            keep_worst: number of lowest-scoring episodes kept
+            keep_every: also keep every keep_every-th episode, None to disable
+            path: log appended to whenever the kept episodes change, None to keep them in memory only
+            max_every: number of keep_every episodes kept
+        """
+        self.keep_best = keep_best
+        self.keep_worst = keep_worst
+        self.keep_every = keep_every
+        self.path = path
+        self.game_kwargs = None
+        self.n_games = 0
+        # Heaps of (key, game, episode), the root is the first to drop
+        self._best = []
+        self._worst = []
+        self._every = deque()
+        self.max_every = max_every
+        # Lines in the log, None until it is first written
+        self._log_lines = None
+        self._seed = None
+        self._actions = bytearray()
+
+    def step(self, game, action, done, score):
+        """
+        Records a move played in a game, to be called after play_step and before reset
+
+        Args:
+            game: SnakeGameAI the move was played in
+            action: one-hot action or move index
+            done: True if the move ended the episode
+            score: score after the move
+        """
+        if self._seed is None:
+            self._seed = game.episode_seed
+            if self.game_kwargs is None:
+                self.game_kwargs = {'cols': game.cols, 'rows': game.rows,
+                                    'loop_detection': game.loop_detection}
+        self._actions.append(action if isinstance(action, int) else VALID_ACTIONS.get(tuple(action), 0))
+        if done:
+            self._finish(score)
+
+    def _finish(self, score):
+        """
+        Ends the current episode and keeps it if it is selected
+        """
+        episode = Episode(self.n_games, self._seed, bytes(self._actions), score)
+        self.n_games += 1
+        self._seed = None
+        self._actions = bytearray()
+
+        key = (score, len(episode.actions))
+        evicted = []
+        kept = self._push(self._best, self.keep_best, key, episode, evicted)
+        kept |= self._push(self._worst, self.keep_worst, (-key[0], -key[1]), episode, evicted)
+        if self.keep_every and self.max_every > 0 and episode.game % self.keep_every == 0:
+            if len(self._every) == self.max_every:
+                evicted.append(self._every.popleft())
+            self._every.append(episode)
+            kept = True
+        if kept and self.path is not None:
+            # An evicted episode may still be kept by another selection
+            games = {item[2].game for item in self._best + self._worst}
+            games.update(every.game for every in self._every)
+            self._append(episode, [old.game for old in evicted if old.game not in games])
+
+    @staticmethod
+    def _push(heap, size, key, episode, evicted):
+        """
+        Adds an episode to a bounded heap, returns True if it was kept
+
+        The episode it replaces, if any, is appended to evicted.
+        """
+        if size <= 0:
+            return False
+        item = (key, -episode.game, episode)
+        if len(heap) < size:
+            heapq.heappush(heap, item)
+            return True
+        if item[:2] > heap[0][:2]:
+            evicted.append(heapq.heapreplace(heap, item)[2])
+            return True
+        return False
+
+    def _append(self, episode, dropped):
+        """
+        Appends a newly kept episode and the games no longer kept to the log
+        """
+        lines = [json.dumps({'drop': game}) for game in sorted(set(dropped))]
+        lines.append(_episode_line(episode))
+        if self._log_lines is None or self._log_lines + len(lines) > COMPACT_RATIO * (len(self.episodes) + 1):
+            self.save(self.path)
+            return
+        with open(self.path, 'a') as f:
+            f.write('\n'.join(lines) + '\n')
+        self._log_lines += len(lines)
+
+    @property
+    def best(self):
+        """
+        Kept best episodes, highest score first
+        """
+        return [episode for _, _, episode in sorted(self._best, reverse=True)]
+
+    @property
+    def worst(self):
+        """
+        Kept worst episodes, lowest score first
+        """
+        return [episode for _, _, episode in sorted(self._worst, reverse=True)]
+
+    @property
+    def episodes(self):
+        """
+        Every kept episode once, in playing order
+        """
+        kept = {episode.game: episode for episode in self.best + self.worst + list(self._every)}
+        return [kept[game] for game in sorted(kept)]
+
+    def save(self, path):
+        """
+        Writes the kept episodes as JSON lines, game settings first
+        """
+        episodes = self.episodes
+        with open(path, 'w') as f:
+            f.write(json.dumps(self.game_kwargs) + '\n')
+            for episode in episodes:
+                f.write(_episode_line(episode) + '\n')
+        if path == self.path:
+            self._log_lines = len(episodes) + 1
+
+def _episode_line(episode):
+    """
+    Returns the JSON line of an episode
+    """
+    return json.dumps({'game': episode.game, 'seed': episode.seed,
+                       'actions': episode.actions.hex(), 'score': episode.score})
+
+def load_episodes(path):
+    """
+    Reads episodes written by EpisodeRecorder, from its log or from save
+
+    Returns:
+        (game_kwargs, list of Episode) with the episodes still kept, in playing order
+    """
+    with open(path) as f:
+        game_kwargs = json.loads(f.readline())
+        kept = {}
+        for line in f:
+            record = json.loads(line)
+            if 'drop' in record:
+                kept.pop(record['drop'], None)
+            else:
+                kept[record['game']] = Episode(record['game'], record['seed'],
+                                               bytes.fromhex(record['actions']), record['score'])
+    return game_kwargs, [kept[game] for game in sorted(kept)]
+
+def iter_frames(episode, game_kwargs=None, scale=1):
+    """
+    Replays an episode offscreen and yields its frames
+
+    Args:
+        episode: Episode to replay
+        game_kwargs: settings of the game it was played in (cols, rows, loop_detection)
+        scale: size factor of the frames
+
+    Yields:
+        RGB frames as uint8 arrays of shape (height, width, 3), the first
+        one before any move
+    """
+    if not pygame.font.get_init():
+        pygame.font.init()
+    game = SnakeGameAI(render=False, **(game_kwargs or {}))
+    game.reset(seed=episode.seed)
+    surface = pygame.Surface((game.w, game.h))
+    renderer = BoardRenderer(game.w, game.h)
+    renderer.info_box = InfoBox(fields=(('Score', 'score'), ('Game', 'games'), ('Step', 'step')))
+    size = (int(game.w * scale), int(game.h * scale))
+
+    def frame(step):
+        renderer.draw(surface, game.snake, game.body, game.direction, game.food,
+                      game_info={'score': game.score, 'games': episode.game, 'step': step})
+        image = surface if scale == 1 else pygame.transform.smoothscale(surface, size)
+        return pygame.surfarray.array3d(image).swapaxes(0, 1)
+
+    yield frame(0)
+    for step, move in enumerate(episode.actions, 1):
+        _, done, _ = game.play_step(ACTIONS[move], None)
+        yield frame(step)
+        if done:
+            break
+
+def render_episode(episode, game_kwargs=None, scale=1):
+    """
+    Renders a whole episode
+
+    Returns:
+        uint8 array of shape (frames, height, width, 3)
+    """
+    return np.stack(list(iter_frames(episode, game_kwargs, scale)))
+
+def save_gif(frames, path, fps=EXPORT_FPS):
+    """
+    Encodes frames to an animated GIF with Pillow
+    """
+    from PIL import Image
+    images = (Image.fromarray(frame) for frame in frames)
+    first = next(images)
+    first.save(path, save_all=True, append_images=images, duration=int(1000 / fps), loop=0)
+
+def save_mp4(frames, path, fps=EXPORT_FPS):
+    """
+    Encodes frames to an H.264 MP4 by piping raw frames to ffmpeg
+    """
+    encoder = None
+    try:
+        for frame in frames:
+            if encoder is None:
+                height, width = frame.shape[:2]
+                encoder = subprocess.Popen(
+                    ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                     '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+                     '-pix_fmt', 'yuv420p', '-vcodec', 'libx264', path],
+                    stdin=subprocess.PIPE)
+            encoder.stdin.write(frame.tobytes())
+    except FileNotFoundError:
+        raise RuntimeError("MP4 export needs ffmpeg on the PATH, use the GIF format instead")
+    finally:
+        if encoder is not None:
+            encoder.stdin.close()
+            encoder.wait()
+
+def _export(job):
+    """
+    Renders and encodes one episode in a pool worker
+    """
+    episode, game_kwargs, path, fmt, fps, scale = job
+    frames = iter_frames(episode, game_kwargs, scale)
+    if fmt == 'gif':
+        save_gif(frames, path, fps)
+    else:
+        save_mp4(frames, path, fps)
+    return path
+
+def export_episodes(episodes, game_kwargs, out_dir, fmt='gif', fps=EXPORT_FPS, scale=1,
+                    num_workers=None):
+    """
+    Renders episodes offscreen and encodes them in a process pool
+
+    Args:
+        episodes: list of Episode
+        game_kwargs: settings of the game they were played in
+        out_dir: directory receiving one file per episode
+        fmt: 'gif' or 'mp4'
+        fps: frame rate of the videos
+        scale: size factor of the frames
+        num_workers: number of pool processes, default one per core
+
+    Returns:
+        list of the written paths
+    """
+    if fmt not in ('gif', 'mp4'):
+        raise ValueError(f"Unknown video format: {fmt}")
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(episode, game_kwargs,
+             os.path.join(out_dir, f"episode_{episode.game:06d}_score_{episode.score}.{fmt}"),
+             fmt, fps, scale)
+            for episode in episodes]
+
+    ctx = mp.get_context('spawn')
+    # Workers are closed rather than terminated: SDL turns SIGTERM into a quit event
+    pool = ctx.Pool(num_workers or os.cpu_count() or 1)
+    try:
+        return pool.map(_export, jobs)
+    finally:
+        pool.close()
+        pool.join()
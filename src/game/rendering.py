@@ -4,9 +4,29 @@ Graphic rendering module for Snake AI
 
 import pygame
 import math
+from collections import deque
 from src.game.constants import *
 from src.game.entities import Direction, Point
 
+# Area of the information box
+INFO_BOX_RECT = pygame.Rect(10, 10, 200, 100)
+
+# Direction in clockwise order
+CLOCK_WISE = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
+
+# Colors for danger arrows
+ARROW_COLORS = [
+    (255, 0, 0),      # Red for immediate danger (1st block)
+    (255, 165, 0),    # Orange for medium danger (2nd block)
+    (255, 255, 0),    # Yellow for distant danger (3rd block)
+    (200, 200, 0),    # Light yellow for 4th block
+    (150, 150, 0)     # Very light yellow for 5th block
+]
+# Arrow parameters
+ARROW_LENGTHS = [BLOCK_SIZE * 1.2, BLOCK_SIZE * 1.8, BLOCK_SIZE * 2.4, BLOCK_SIZE * 3.0, BLOCK_SIZE * 3.6]
+ARROW_WIDTH = 3
+ARROW_KEY = (255, 0, 255)  # Transparent color of the arrow sprites
+
 # Initialize font only once
 if pygame.get_init():
     font = pygame.font.SysFont('arial', 25)
@@ -22,16 +42,6 @@ def draw_grid(display, width, height):
     for y in range(0, height, GRID_SIZE):
         pygame.draw.line(display, GRID_COLOR, (0, y), (width, y))
 
-def draw_snake(display, snake, direction):
-    """
-    Draws the snake
-    """
-    for i, pt in enumerate(snake):
-        if i == 0:  # Head
-            draw_snake_head(display, pt, direction)
-        else:  # Body
-            draw_snake_body(display, pt)
-
 def draw_snake_head(display, position, direction):
     """
     Draws the snake's head
@@ -70,6 +80,87 @@ def draw_food(display, food):
     pygame.draw.rect(display, RED, pygame.Rect(food.x, food.y, BLOCK_SIZE, BLOCK_SIZE))
     pygame.draw.circle(display, WHITE, (food.x + 5, food.y + 5), 2)  # Reflection on the apple
 
+class InfoBox:
+    """
+    Information box with cached surfaces
+
+    The translucent panel is built once, and the text of a line is only
+    rasterized again when its value changes, so a frame costs a few blits.
+    Extra counters can be added as lines at any time.
+    """
+    # Line height and margins of the box
+    LINE_HEIGHT = 30
+    PADDING = 5
+    TEXT_OFFSET = 10
+
+    def __init__(self, fields=(('Score', 'score'), ('Game', 'games'), ('Record', 'record')),
+                 topleft=INFO_BOX_RECT.topleft, width=INFO_BOX_RECT.width):
+        """
+        Creates the box
+
+        Args:
+            fields: (label, key in game_info) of every line, top to bottom
+            topleft: position of the box
+            width: width of the box
+        """
+        self.topleft = topleft
+        self.width = width
+        self.fields = []
+        # Last value and text surface of every line
+        self._values = []
+        self._texts = []
+        for label, key in fields:
+            self.add_field(label, key)
+
+    def add_field(self, label, key, fmt='{}'):
+        """
+        Adds a line showing game_info[key]
+
+        Args:
+            label: text before the value
+            key: key of the value in game_info
+            fmt: format of the value, e.g. '{:.1f}'
+        """
+        self.fields.append((f"{label}: {fmt}", key))
+        self._values.append(None)
+        self._texts.append(None)
+        height = 2 * self.PADDING + self.LINE_HEIGHT * len(self.fields)
+        self.rect = pygame.Rect(self.topleft, (self.width, height))
+        self._panel = pygame.Surface(self.rect.size)
+        self._panel.fill((30, 30, 30))
+        self._panel.set_alpha(200)  # Semi-transparent
+
+    def draw(self, display, game_info):
+        """
+        Draws the box, rendering only the values that changed
+
+        Args:
+            game_info: dictionary containing the values to display
+        """
+        display.blits(self.blits(game_info), doreturn=False)
+
+    def blits(self, game_info):
+        """
+        Returns the (surface, position) pairs drawing the box, for Surface.blits
+        """
+        global font
+
+        if font is None and pygame.get_init():
+            font = pygame.font.SysFont('arial', 25)
+
+        blits = [(self._panel, self.rect.topleft)]
+        x = self.rect.x + self.TEXT_OFFSET
+        for i, (text, key) in enumerate(self.fields):
+            value = game_info.get(key)
+            if self._texts[i] is None or value != self._values[i]:
+                self._values[i] = value
+                self._texts[i] = font.render(text.format(value), True, WHITE)
+            blits.append((self._texts[i], (x, self.rect.y + self.PADDING + self.LINE_HEIGHT * i)))
+        return blits
+
+# Box used by draw_info_box
+_info_box = None
+
 def draw_info_box(display, game_info):
     """
     Draws the information box with score, etc.
@@ -77,99 +168,17 @@ def draw_info_box(display, game_info):
     Args:
         game_info: dictionary containing information to display
     """
-    global font
-    
-    if font is None and pygame.get_init():
-        font = pygame.font.SysFont('arial', 25)
+    global _info_box
     
-    # Create info box
-    info_box = pygame.Surface((200, 100))
-    info_box.fill((30, 30, 30))
-    info_box.set_alpha(200)  # Semi-transparent
-    display.blit(info_box, [10, 10])
-
-    # Display game information
-    score_text = font.render(f"Score: {game_info['score']}", True, WHITE)
-    display.blit(score_text, [20, 15])
-
-    game_text = font.render(f"Game: {game_info['games']}", True, WHITE)
-    display.blit(game_text, [20, 45])
-
-    record_text = font.render(f"Record: {game_info['record']}", True, WHITE)
-    display.blit(record_text, [20, 75])
+    if _info_box is None:
+        _info_box = InfoBox()
+    _info_box.draw(display, game_info)
 
 def draw_danger_arrows(display, state, direction, head_position):
     """
     Draws arrows indicating dangers around the snake's head
     """
-    # Colors for danger arrows
-    ARROW_COLORS = [
-        (255, 0, 0),      # Red for immediate danger (1st block)
-        (255, 165, 0),    # Orange for medium danger (2nd block)
-        (255, 255, 0),    # Yellow for distant danger (3rd block)
-        (200, 200, 0),    # Light yellow for 4th block
-        (150, 150, 0)     # Very light yellow for 5th block
-    ]
-    
-    # Arrow parameters
-    arrow_length = [BLOCK_SIZE * 1.2, BLOCK_SIZE * 1.8, BLOCK_SIZE * 2.4, BLOCK_SIZE * 3.0, BLOCK_SIZE * 3.6]
-    arrow_width = 3
-    arrow_head_size = 7
-    
-    # Calculate center of snake's head
-    center_x = head_position.x + BLOCK_SIZE // 2
-    center_y = head_position.y + BLOCK_SIZE // 2
-    
-    # Define arrow directions based on current snake direction
-    if direction == Direction.RIGHT:
-        directions = [
-            # Straight (right)
-            [(center_x + arrow_length[i], center_y) for i in range(5)],
-            # Right turn (down)
-            [(center_x, center_y + arrow_length[i]) for i in range(5)],
-            # Left turn (up)
-            [(center_x, center_y - arrow_length[i]) for i in range(5)]
-        ]
-    elif direction == Direction.LEFT:
-        directions = [
-            # Straight (left)
-            [(center_x - arrow_length[i], center_y) for i in range(5)],
-            # Right turn (up)
-            [(center_x, center_y - arrow_length[i]) for i in range(5)],
-            # Left turn (down)
-            [(center_x, center_y + arrow_length[i]) for i in range(5)]
-        ]
-    elif direction == Direction.UP:
-        directions = [
-            # Straight (up)
-            [(center_x, center_y - arrow_length[i]) for i in range(5)],
-            # Right turn (right)
-            [(center_x + arrow_length[i], center_y) for i in range(5)],
-            # Left turn (left)
-            [(center_x - arrow_length[i], center_y) for i in range(5)]
-        ]
-    elif direction == Direction.DOWN:
-        directions = [
-            # Straight (down)
-            [(center_x, center_y + arrow_length[i]) for i in range(5)],
-            # Right turn (left)
-            [(center_x - arrow_length[i], center_y) for i in range(5)],
-            # Left turn (right)
-            [(center_x + arrow_length[i], center_y) for i in range(5)]
-        ]
-    
-    # Draw danger arrows for straight, right, left
-    for dir_idx in range(3):  # 0=straight, 1=right, 2=left
-        for dist_idx in range(5):  # 0=close, 1=medium, 2=far, 3=very far, 4=extremely far
-            # Calculate index in state array
-            state_idx = dir_idx * 5 + dist_idx
-            
-            # Check if the index exists in state before using it
-            if state_idx < len(state) and state[state_idx]:
-                # Draw arrow for this danger
-                start_pos = (center_x, center_y)
-                end_pos = directions[dir_idx][dist_idx]
-                draw_arrow(display, start_pos, end_pos, ARROW_COLORS[dist_idx], arrow_width)
+    display.blits(get_atlas().arrow_blits(state, direction, head_position), doreturn=False)
 
 def draw_arrow(display, start_pos, end_pos, color, width):
     """
@@ -188,4 +197,222 @@ def draw_arrow(display, start_pos, end_pos, color, width):
          end_y - arrow_head_size * math.sin(angle - math.pi/6)),
         (end_x - arrow_head_size * math.cos(angle + math.pi/6), 
          end_y - arrow_head_size * math.sin(angle + math.pi/6))
-    ])
\ No newline at end of file
+    ])
+
+class SpriteAtlas:
+    """
+    Pre-rendered sprites of the board
+
+    Heads in the four directions, the body and food tiles, and the danger
+    arrows for every absolute direction and distance are drawn once with
+    the primitive functions above. A frame is then a list of blits.
+    """
+    def __init__(self):
+        """
+        Draws every sprite
+        """
+        self.heads = {}
+        for direction in CLOCK_WISE:
+            self.heads[direction] = self._tile(draw_snake_head, direction)
+        self.body = self._tile(draw_snake_body)
+        self.food = self._tile(draw_food)
+
+        # arrows[direction][distance] = (sprite, offset from the head position)
+        reach = int(ARROW_LENGTHS[-1]) + 2 * ARROW_WIDTH + 8
+        center = (reach, reach)
+        steps = {Direction.RIGHT: (1, 0), Direction.LEFT: (-1, 0),
+                 Direction.UP: (0, -1), Direction.DOWN: (0, 1)}
+        self.arrows = {}
+        for direction, (dx, dy) in steps.items():
+            self.arrows[direction] = []
+            for distance, length in enumerate(ARROW_LENGTHS):
+                canvas = pygame.Surface((2 * reach, 2 * reach), pygame.SRCALPHA)
+                draw_arrow(canvas, center, (reach + dx * length, reach + dy * length),
+                           ARROW_COLORS[distance], ARROW_WIDTH)
+                bounds = canvas.get_bounding_rect()
+                offset = (bounds.x - reach + BLOCK_SIZE // 2, bounds.y - reach + BLOCK_SIZE // 2)
+                # Colorkeyed copy: arrows are opaque, no per-pixel blending needed
+                sprite = pygame.Surface(bounds.size)
+                sprite.fill(ARROW_KEY)
+                sprite.blit(canvas, (0, 0), bounds)
+                sprite.set_colorkey(ARROW_KEY, pygame.RLEACCEL)
+                self.arrows[direction].append((sprite, offset))
+
+    @staticmethod
+    def _tile(draw, *args):
+        """
+        Draws one block with a primitive drawing function
+        """
+        tile = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE))
+        draw(tile, Point(0, 0), *args)
+        return tile
+
+    def cell(self, position, head, body, direction, food):
+        """
+        Returns the (sprite, position) of whatever occupies a cell, None if empty
+        """
+        # Body first: after a collision the body is drawn over the head
+        if position in body:
+            return self.body, position
+        if position == head:
+            return self.heads[direction], position
+        if position == food:
+            return self.food, position
+        return None
+
+    def snake_blits(self, snake, direction):
+        """
+        Returns the blits drawing the snake, head first
+        """
+        blits = [(self.heads[direction], snake[0])]
+        body = self.body
+        blits += [(body, pt) for i, pt in enumerate(snake) if i]
+        return blits
+
+    def arrow_blits(self, state, direction, head_position):
+        """
+        Returns the blits drawing the danger arrows of a state
+        """
+        idx = CLOCK_WISE.index(direction)
+        # Absolute direction of the straight, right and left dangers
+        directions = (CLOCK_WISE[idx], CLOCK_WISE[(idx + 1) % 4], CLOCK_WISE[(idx - 1) % 4])
+        blits = []
+        for dir_idx in range(3):  # 0=straight, 1=right, 2=left
+            arrows = self.arrows[directions[dir_idx]]
+            for dist_idx in range(5):  # 0=close ... 4=extremely far
+                state_idx = dir_idx * 5 + dist_idx
+                if state_idx < len(state) and state[state_idx]:
+                    sprite, (dx, dy) = arrows[dist_idx]
+                    blits.append((sprite, (head_position.x + dx, head_position.y + dy)))
+        return blits
+
+# Atlas shared by every renderer, built on first use
+_atlas = None
+
+def get_atlas():
+    """
+    Returns the sprite atlas, building it on first use
+    """
+    global _atlas
+
+    if _atlas is None:
+        _atlas = SpriteAtlas()
+    return _atlas
+
+def draw_snake(display, snake, direction):
+    """
+    Draws the snake
+    """
+    display.blits(get_atlas().snake_blits(snake, direction), doreturn=False)
+
+class BoardRenderer:
+    """
+    Draws the board on a display, only redrawing what changed
+
+    The grid is drawn once on a cached background. On a regular step only
+    the new head, the previous head, the vacated tail, the food cells and
+    the areas under the arrows and the information box are restored from
+    the background and redrawn, so the cost of a frame depends neither on
+    the snake length nor on the board size. Anything else (a reset, a
+    skipped step) falls back to a full redraw. Every frame is one blits()
+    call with sprites from the atlas.
+    """
+    def __init__(self, width, height):
+        """
+        Pre-renders the background
+
+        Args:
+            width: width of the board in pixels
+            height: height of the board in pixels
+        """
+        self.width = width
+        self.height = height
+        self.background = pygame.Surface((width, height))
+        self.background.fill(BLACK)
+        draw_grid(self.background, width, height)
+        self.atlas = get_atlas()
+        # Snake and food as last drawn, None forces a full redraw
+        self._drawn = None
+        self._food = None
+        # Areas covered by the arrows and the information box last frame
+        self._overlays = []
+        self.info_box = InfoBox()
+
+    def invalidate(self):
+        """
+        Forces a full redraw on the next frame, e.g. after drawing something else
+        """
+        self._drawn = None
+
+    def draw(self, display, snake, body, direction, food, state=None, game_info=None):
+        """
+        Draws a frame
+
+        Args:
+            display: surface of the board
+            snake: positions of the snake, head first
+            body: set of the body positions (head excluded)
+            direction: current direction of the snake
+            food: position of the food
+            state: game state, drawn as danger arrows if given
+            game_info: dictionary for the information box, drawn if given
+
+        Returns:
+            list of the rectangles changed, for pygame.display.update
+        """
+        atlas = self.atlas
+        head = snake[0]
+        drawn = self._drawn
+        if drawn is not None:
+            grew = len(snake) == len(drawn) + 1
+            # A regular step adds one head and removes at most the tail
+            if not (len(snake) > 1 and snake[1] == drawn[0] and
+                    (grew or len(snake) == len(drawn)) and
+                    snake[-1] == drawn[-1 if grew else -2]):
+                drawn = None
+
+        if drawn is None:
+            blits = [(self.background, (0, 0))]
+            blits += atlas.snake_blits(snake, direction)
+            blits.append((atlas.food, food))
+            self._drawn = deque(snake)
+            dirty = [display.get_rect()]
+        else:
+            changed = [head, drawn[0]]
+            drawn.appendleft(head)
+            if not grew:
+                changed.append(drawn.pop())
+            if food != self._food:
+                changed += [self._food, food]
+            dirty = [pygame.Rect(pt.x, pt.y, BLOCK_SIZE, BLOCK_SIZE) for pt in changed]
+            dirty += self._overlays
+            # Restore the background, then the cells under it
+            blits = [(self.background, rect, rect) for rect in dirty]
+            for rect in dirty:
+                self._cell_blits(blits, rect.clip(display.get_rect()), head, body, direction, food)
+        self._food = food
+
+        # Arrows and information box go on top of the cells
+        self._overlays = []
+        if state is not None:
+            arrows = atlas.arrow_blits(state, direction, head)
+            if arrows:
+                rects = [pygame.Rect(pos, sprite.get_size()) for sprite, pos in arrows]
+                self._overlays.append(rects[0].unionall(rects[1:]))
+            blits += arrows
+        if game_info is not None:
+            blits += self.info_box.blits(game_info)
+            self._overlays.append(self.info_box.rect.copy())
+        display.blits(blits, doreturn=False)
+        return dirty + self._overlays
+
+    def _cell_blits(self, blits, rect, head, body, direction, food):
+        """
+        Adds the blits of the snake and food cells overlapping a rectangle
+        """
+        cell = self.atlas.cell
+        for x in range(rect.left - rect.left % BLOCK_SIZE, rect.right, BLOCK_SIZE):
+            for y in range(rect.top - rect.top % BLOCK_SIZE, rect.bottom, BLOCK_SIZE):
+                sprite = cell(Point(x, y), head, body, direction, food)
+                if sprite is not None:
+                    blits.append(sprite)
@@ -0,0 +1,272 @@
+"""
+Vectorized environments for Snake AI Game
+Steps many headless games at once, in this process or in worker processes
+"""
+
+import numpy as np
+import multiprocessing as mp
+from multiprocessing.connection import wait
+from src.game.environment import SnakeGameAI
+from src.agent.state import get_state
+from src.utils.seeding import derive_seed, GAME_STREAM
+
+# One-hot actions indexed by move (straight, right turn, left turn)
+ACTIONS = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+STATE_SIZE = 23
+
+# Commands sent to the workers
+_STEP = b's'
+_RESET = b'r'
+_CLOSE = b'c'
+
+class VectorEnv:
+    """
+    Batch of headless games stepped together in this process
+
+    Observations, rewards, dones and scores are written into NumPy arrays,
+    which may be views on shared memory. A finished game is reset at once:
+    its observation is the first state of the next game, its score the
+    final score of the finished one.
+    """
+    def __init__(self, num_games, seed=None, first_game=0, out=None, **game_kwargs):
+        """
+        Creates the games
+
+        Args:
+            num_games: number of games
+            seed: seed of the run, game k gets the stream derive_seed(seed, k, GAME_STREAM)
+            first_game: global index of the first game, for seeding slices of a larger batch
+            out: optional (obs, rewards, dones, scores) arrays to write into
+            game_kwargs: extra arguments of SnakeGameAI (cols, rows, loop_detection...)
+        """
+        self.games = [SnakeGameAI(render=False, seed=derive_seed(seed, first_game + i, GAME_STREAM),
+                                  **game_kwargs)
+                      for i in range(num_games)]
+        if out is None:
+            out = (np.zeros((num_games, STATE_SIZE), dtype=np.int8),
+                   np.zeros(num_games, dtype=np.float32),
+                   np.zeros(num_games, dtype=np.bool_),
+                   np.zeros(num_games, dtype=np.int32))
+        self.obs, self.rewards, self.dones, self.scores = out
+
+    def reset(self):
+        """
+        Resets every game
+
+        Returns:
+            observations of shape (num_games, STATE_SIZE)
+        """
+        for i, game in enumerate(self.games):
+            game.reset()
+            self.obs[i] = get_state(game)
+        self.rewards[:] = 0
+        self.dones[:] = False
+        self.scores[:] = 0
+        return self.obs
+
+    def step(self, actions):
+        """
+        Plays one move in every game
+
+        Args:
+            actions: move index (0=straight, 1=right turn, 2=left turn) per game
+
+        Returns:
+            observations, rewards, dones and scores arrays
+        """
+        for i, game in enumerate(self.games):
+            reward, done, score = game.play_step(ACTIONS[actions[i]], None)
+            if done:
+                game.reset()
+            self.obs[i] = get_state(game)
+            self.rewards[i] = reward
+            self.dones[i] = done
+            self.scores[i] = score
+        return self.obs, self.rewards, self.dones, self.scores
+
+def _shared_views(buffers):
+    """
+    Wraps the shared buffers as (obs, actions, rewards, dones, scores) arrays
+    """
+    obs, actions, rewards, dones, scores = buffers
+    return (np.frombuffer(obs, dtype=np.int8).reshape(-1, STATE_SIZE),
+            np.frombuffer(actions, dtype=np.int8),
+            np.frombuffer(rewards, dtype=np.float32),
+            np.frombuffer(dones, dtype=np.bool_),
+            np.frombuffer(scores, dtype=np.int32))
+
+def _worker(conn, buffers, first, last, seed, game_kwargs):
+    """
+    Owns games [first, last) and steps them on command
+
+    Data only goes through the shared buffers, the pipe carries one byte
+    per command and one per reply.
+    """
+    obs, actions, rewards, dones, scores = _shared_views(buffers)
+    env = VectorEnv(last - first, seed, first_game=first,
+                    out=(obs[first:last], rewards[first:last],
+                         dones[first:last], scores[first:last]),
+                    **game_kwargs)
+    local_actions = actions[first:last]
+    while True:
+        command = conn.recv_bytes()
+        if command == _STEP:
+            env.step(local_actions)
+        elif command == _RESET:
+            env.reset()
+        else:
+            break
+        conn.send_bytes(command)
+    conn.close()
+
+class SubprocVectorEnv:
+    """
+    Batch of headless games split across worker processes
+
+    Each worker owns a contiguous slice of the games. Actions and results
+    are exchanged through shared arrays, so a batched step costs one
+    command and one reply per worker, whatever the number of games.
+
+    Synchronous use: obs = env.reset(); obs, rewards, dones, scores = env.step(actions)
+
+    Asynchronous use, acting on whichever workers are ready first:
+        env.step_async(policy(env.reset()))
+        while training:
+            for worker in env.wait():
+                games = env.slices[worker]
+                env.actions[games] = policy(env.obs[games])
+                env.step_async(worker_ids=[worker])
+    """
+    def __init__(self, num_games, num_workers=None, seed=None, **game_kwargs):
+        """
+        Starts the workers
+
+        Args:
+            num_games: total number of games
+            num_workers: number of worker processes, default one per core
+            seed: seed of the run, game k gets the same stream as in VectorEnv
+            game_kwargs: extra arguments of SnakeGameAI (cols, rows, loop_detection...)
+        """
+        if num_workers is None:
+            num_workers = mp.cpu_count()
+        num_workers = max(1, min(num_workers, num_games))
+
+        ctx = mp.get_context('spawn')
+        self._buffers = (ctx.RawArray('b', num_games * STATE_SIZE),
+                         ctx.RawArray('b', num_games),
+                         ctx.RawArray('f', num_games),
+                         ctx.RawArray('b', num_games),
+                         ctx.RawArray('i', num_games))
+        self.obs, self.actions, self.rewards, self.dones, self.scores = _shared_views(self._buffers)
+
+        bounds = np.linspace(0, num_games, num_workers + 1).astype(int)
+        self.slices = [slice(bounds[w], bounds[w + 1]) for w in range(num_workers)]
+        self._conns = []
+        self._workers = []
+        for w in range(num_workers):
+            parent_conn, child_conn = ctx.Pipe()
+            worker = ctx.Process(target=_worker, daemon=True,
+                                 args=(child_conn, self._buffers, bounds[w], bounds[w + 1],
+                                       seed, game_kwargs))
+            worker.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._workers.append(worker)
+        self._pending = set()
+
+    @property
+    def num_workers(self):
+        return len(self._workers)
+
+    def _send(self, command, worker_ids):
+        for w in worker_ids:
+            self._conns[w].send_bytes(command)
+            self._pending.add(w)
+
+    def reset(self):
+        """
+        Resets every game
+
+        Returns:
+            shared observation array of shape (num_games, STATE_SIZE)
+        """
+        self.wait_all()
+        self._send(_RESET, range(self.num_workers))
+        self.wait_all()
+        return self.obs
+
+    def step_async(self, actions=None, worker_ids=None):
+        """
+        Starts a step on some workers without waiting for it
+
+        Args:
+            actions: move index per game, only written for the games of
+                the stepped workers, so that other workers still stepping
+                keep reading their own actions
+            worker_ids: workers to step, all of them by default
+        """
+        if worker_ids is None:
+            worker_ids = range(self.num_workers)
+        if actions is not None:
+            for w in worker_ids:
+                self.actions[self.slices[w]] = actions[self.slices[w]]
+        self._send(_STEP, worker_ids)
+
+    def wait(self, timeout=None):
+        """
+        Waits until at least one pending worker is done
+
+        Returns:
+            list of worker ids whose games have been stepped
+        """
+        conns = {self._conns[w]: w for w in self._pending}
+        ready = [conns[conn] for conn in wait(list(conns), timeout)]
+        for w in ready:
+            self._conns[w].recv_bytes()
+            self._pending.discard(w)
+        return ready
+
+    def wait_all(self):
+        """
+        Waits until every pending worker is done
+        """
+        while self._pending:
+            self.wait()
+
+    def step(self, actions):
+        """
+        Plays one move in every game and waits for all workers
+
+        The returned arrays are shared and overwritten by the next step.
+
+        Args:
+            actions: move index (0=straight, 1=right turn, 2=left turn) per game
+
+        Returns:
+            observations, rewards, dones and scores arrays
+        """
+        self.step_async(actions)
+        self.wait_all()
+        return self.obs, self.rewards, self.dones, self.scores
+
+    def close(self):
+        """
+        Stops the workers
+        """
+        self.wait_all()
+        for conn in self._conns:
+            conn.send_bytes(_CLOSE)
+        for worker in self._workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                # SDL turns SIGTERM into a quit event, only SIGKILL is sure to stop it
+                worker.kill()
+                worker.join()
+        for conn in self._conns:
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
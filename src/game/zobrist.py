@@ -0,0 +1,63 @@
+"""
+Zobrist hashing for Snake AI Game
+"""
+
+import random
+from src.game.entities import Direction
+
+class ZobristTable:
+    """
+    Random 64-bit keys used to hash game positions incrementally
+
+    A position is the body, the head cell, the direction and the food
+    cell. Each body cell is keyed with the direction of the next segment
+    towards the head, so that snakes covering the same cells in a
+    different order hash differently. The hash is the XOR of the matching
+    keys, so every move updates it in O(1) by XOR-ing out the old keys and
+    XOR-ing in the new.
+    """
+    def __init__(self, n_cells, seed=0):
+        """
+        Draws the keys for a board
+
+        Args:
+            n_cells: number of cells of the board
+            seed: seed of the key generator, fixed so hashes are stable across runs
+        """
+        rng = random.Random(seed)
+        self.body = [{direction: rng.getrandbits(64) for direction in Direction}
+                     for _ in range(n_cells)]
+        self.head = [rng.getrandbits(64) for _ in range(n_cells)]
+        self.food = [rng.getrandbits(64) for _ in range(n_cells)]
+        self.direction = {direction: rng.getrandbits(64) for direction in Direction}
+
+    def hash_position(self, body_links, head_cell, direction, food_cell):
+        """
+        Computes the hash of a position from scratch
+
+        Args:
+            body_links: (cell index, direction of the next segment) of
+                every body segment, head excluded
+            head_cell: cell index of the head
+            direction: current direction
+            food_cell: cell index of the food
+        """
+        h = self.head[head_cell] ^ self.direction[direction] ^ self.food[food_cell]
+        for cell, link in body_links:
+            h ^= self.body[cell][link]
+        return h
+
+# Tables already drawn, by (n_cells, seed)
+_TABLES = {}
+
+def get_table(n_cells, seed=0):
+    """
+    Returns the table of a board size, drawn once per process and shared by every game
+
+    The keys only depend on the number of cells and the seed, and games
+    never modify them.
+    """
+    table = _TABLES.get((n_cells, seed))
+    if table is None:
+        table = _TABLES[(n_cells, seed)] = ZobristTable(n_cells, seed)
+    return table
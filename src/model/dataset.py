@@ -0,0 +1,235 @@
+"""
+Offline dataset module for Snake AI
+Writes transitions to shards on disk and streams shuffled batches from them
+"""
+
+import os
+import glob
+import queue
+import threading
+import numpy as np
+import torch
+
+# Transitions per shard
+SHARD_SIZE = 100_000
+# Rows kept in the shuffle buffer of the loader
+SHUFFLE_BUFFER = 50_000
+# Batches prepared in advance by the loader thread
+PREFETCH_BATCHES = 4
+# Rows read at once from a shard
+CHUNK_SIZE = 10_000
+# Transitions per training batch
+BATCH_SIZE = 1000
+STATE_SIZE = 23
+ACTION_SIZE = 3
+
+FIELDS = ('states', 'actions', 'rewards', 'next_states', 'dones')
+
+class ShardWriter:
+    """
+    Writes transitions to fixed-size shards
+
+    Shards are either .npz files (one per shard, optionally compressed) or
+    raw .npy files (one per field and shard) that the loader memory-maps.
+    States and one-hot actions are stored as bytes. Writing into a
+    directory that already holds shards continues their numbering.
+    """
+    def __init__(self, out_dir, shard_size=SHARD_SIZE, fmt='npz', compress=False):
+        """
+        Prepares the first shard
+
+        Args:
+            out_dir: directory receiving the shards
+            shard_size: transitions per shard
+            fmt: 'npz' or 'memmap'
+            compress: If True, compresses the .npz shards
+        """
+        if fmt not in ('npz', 'memmap'):
+            raise ValueError(f"Unknown shard format: {fmt}")
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.shard_size = shard_size
+        self.fmt = fmt
+        self.compress = compress
+        self.n_shards = len(list_shards(out_dir))
+        self.n_written = 0
+        self._buffers = (np.zeros((shard_size, STATE_SIZE), dtype=np.int8),
+                         np.zeros((shard_size, ACTION_SIZE), dtype=np.int8),
+                         np.zeros(shard_size, dtype=np.float32),
+                         np.zeros((shard_size, STATE_SIZE), dtype=np.int8),
+                         np.zeros(shard_size, dtype=np.bool_))
+        self._size = 0
+
+    def append(self, state, action, reward, next_state, done):
+        """
+        Adds one transition
+        """
+        i = self._size
+        for buffer, value in zip(self._buffers, (state, action, reward, next_state, done)):
+            buffer[i] = value
+        self._size += 1
+        if self._size == self.shard_size:
+            self._write()
+
+    def extend(self, states, actions, rewards, next_states, dones):
+        """
+        Adds a batch of transitions given as arrays
+        """
+        arrays = (states, actions, rewards, next_states, dones)
+        done = 0
+        while done < len(dones):
+            count = min(len(dones) - done, self.shard_size - self._size)
+            for buffer, array in zip(self._buffers, arrays):
+                buffer[self._size:self._size + count] = array[done:done + count]
+            self._size += count
+            done += count
+            if self._size == self.shard_size:
+                self._write()
+
+    def _write(self):
+        """
+        Writes the buffered transitions as a new shard
+        """
+        arrays = {field: buffer[:self._size] for field, buffer in zip(FIELDS, self._buffers)}
+        name = os.path.join(self.out_dir, f"shard_{self.n_shards:05d}")
+        if self.fmt == 'npz':
+            (np.savez_compressed if self.compress else np.savez)(name + '.npz', **arrays)
+        else:
+            for field, array in arrays.items():
+                np.save(f"{name}.{field}.npy", array)
+        self.n_shards += 1
+        self.n_written += self._size
+        self._size = 0
+
+    def close(self):
+        """
+        Writes the last, possibly smaller, shard
+        """
+        if self._size:
+            self._write()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def list_shards(shard_dir):
+    """
+    Returns the shard names of a directory, without extension, in order
+    """
+    names = {path[:-len('.npz')] for path in glob.glob(os.path.join(shard_dir, 'shard_*.npz'))}
+    names |= {path[:-len('.states.npy')] for path in glob.glob(os.path.join(shard_dir, 'shard_*.states.npy'))}
+    return sorted(names)
+
+def load_shard(name):
+    """
+    Opens a shard, memory-mapping raw shards
+
+    Returns:
+        dict mapping every field to its array
+    """
+    if os.path.exists(name + '.npz'):
+        with np.load(name + '.npz') as shard:
+            return {field: shard[field] for field in FIELDS}
+    return {field: np.load(f"{name}.{field}.npy", mmap_mode='r') for field in FIELDS}
+
+def export_memory(memory, writer):
+    """
+    Writes the transitions of a ReplayMemory to a ShardWriter
+    """
+    for state, action, reward, next_state, done in memory.memory:
+        writer.append(state, action, reward, next_state, done)
+
+def export_episode_log(log, writer):
+    """
+    Writes the transitions of every episode of an EpisodeLog to a ShardWriter
+    """
+    for k in range(len(log)):
+        writer.extend(*log.transitions(k))
+
+def _produce(shard_dir, batch_size, shuffle_buffer, epochs, rng, batches, stop):
+    """
+    Loader thread: reads shards in chunks, shuffles and queues tensor batches
+    """
+    def put(item):
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def emit(pool, count):
+        for start in range(0, count, batch_size):
+            batch = tuple(torch.from_numpy(np.ascontiguousarray(array[start:start + batch_size]))
+                          for array in pool)
+            if not put(batch):
+                return False
+        return True
+
+    try:
+        names = list_shards(shard_dir)
+        pool = None
+        for _ in range(epochs):
+            for shard_idx in rng.permutation(len(names)):
+                shard = load_shard(names[shard_idx])
+                rows = len(shard['dones'])
+                for start in range(0, rows, CHUNK_SIZE):
+                    chunk = [np.asarray(shard[field][start:start + CHUNK_SIZE]) for field in FIELDS]
+                    pool = chunk if pool is None else [np.concatenate(pair) for pair in zip(pool, chunk)]
+                    if len(pool[-1]) >= shuffle_buffer + batch_size:
+                        # Shuffle the buffer, send out all but half a buffer of rows
+                        perm = rng.permutation(len(pool[-1]))
+                        pool = [array[perm] for array in pool]
+                        count = (len(perm) - shuffle_buffer // 2) // batch_size * batch_size
+                        if not emit(pool, count):
+                            return
+                        pool = [array[count:] for array in pool]
+        if pool is not None and len(pool[-1]):
+            perm = rng.permutation(len(pool[-1]))
+            if not emit([array[perm] for array in pool], len(perm)):
+                return
+        put(None)
+    except Exception as e:
+        put(e)
+
+def iter_batches(shard_dir, batch_size=BATCH_SIZE, shuffle_buffer=SHUFFLE_BUFFER, epochs=1, seed=None,
+                 prefetch=PREFETCH_BATCHES):
+    """
+    Streams shuffled training batches from shards
+
+    A background thread reads the shards in random order, chunk by chunk,
+    through a shuffle buffer of shuffle_buffer rows and converts batches to
+    tensors ahead of time, so the training loop never waits on disk or
+    NumPy. Only the buffer is held in memory, whatever the dataset size.
+
+    Args:
+        shard_dir: directory of the shards
+        batch_size: transitions per batch, the last batch may be smaller
+        shuffle_buffer: rows mixed together before being batched
+        epochs: passes over the dataset
+        seed: seed of the shard order and of the shuffling
+        prefetch: batches prepared in advance
+
+    Yields:
+        states, actions, rewards, next_states, dones tensors, as taken by QTrainer.train_step
+    """
+    batches = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    thread = threading.Thread(target=_produce, daemon=True,
+                              args=(shard_dir, batch_size, shuffle_buffer, epochs,
+                                    np.random.default_rng(seed), batches, stop))
+    thread.start()
+    try:
+        while True:
+            batch = batches.get()
+            if batch is None:
+                return
+            if isinstance(batch, Exception):
+                raise batch
+            yield batch
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,83 @@
+"""
+Data-parallel helpers for Snake AI model
+Runs several learner ranks on one machine with torch.distributed (gloo, CPU)
+"""
+
+import socket
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+
+def free_port():
+    """
+    Returns a free TCP port on localhost
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def init_data_parallel(rank, world_size, port):
+    """
+    Joins the process group of the data-parallel learners
+
+    Args:
+        rank: index of this process
+        world_size: number of processes
+        port: TCP port of rank 0 on localhost
+    """
+    dist.init_process_group('gloo', init_method=f'tcp://127.0.0.1:{port}',
+                            rank=rank, world_size=world_size)
+
+def broadcast_batch(batch):
+    """
+    Gives every rank the batch of rank 0
+
+    Args:
+        batch: (states, actions, rewards, next_states, dones), only read on rank 0
+
+    Returns:
+        the batch of rank 0 as tensors, on every rank
+    """
+    if dist.get_rank() == 0:
+        states, actions, rewards, next_states, dones = batch
+        tensors = [torch.as_tensor(states, dtype=torch.float),
+                   torch.as_tensor(actions, dtype=torch.long),
+                   torch.as_tensor(rewards, dtype=torch.float),
+                   torch.as_tensor(next_states, dtype=torch.float),
+                   torch.as_tensor(dones, dtype=torch.bool).long()]
+        shape = torch.tensor([tensors[0].shape[0], tensors[0].shape[1], tensors[1].shape[1]])
+    else:
+        shape = torch.zeros(3, dtype=torch.long)
+    dist.broadcast(shape, src=0)
+
+    size, state_size, action_size = shape.tolist()
+    if dist.get_rank() != 0:
+        tensors = [torch.zeros((size, state_size)),
+                   torch.zeros((size, action_size), dtype=torch.long),
+                   torch.zeros(size),
+                   torch.zeros((size, state_size)),
+                   torch.zeros(size, dtype=torch.long)]
+    for tensor in tensors:
+        dist.broadcast(tensor, src=0)
+    tensors[4] = tensors[4].bool()
+    return tuple(tensors)
+
+def _run_rank(rank, fn, world_size, port, args):
+    torch.set_num_threads(1)
+    init_data_parallel(rank, world_size, port)
+    try:
+        fn(rank, world_size, *args)
+    finally:
+        dist.destroy_process_group()
+
+def run_data_parallel(fn, world_size, *args):
+    """
+    Runs fn(rank, world_size, *args) in world_size processes joined in a
+    gloo process group on localhost
+
+    Args:
+        fn: function run by every rank, must be importable (top-level)
+        world_size: number of processes
+        args: extra arguments given to fn
+    """
+    mp.spawn(_run_rank, args=(fn, world_size, free_port(), args), nprocs=world_size, join=True)
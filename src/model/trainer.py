@@ -5,12 +5,13 @@ Training module for Snake AI model
 import torch
 import torch.nn as nn
 import torch.optim as optim
+import torch.distributed as dist
 
 class QTrainer:
     """
     Trainer for the Q-learning network
     """
-    def __init__(self, model, lr, gamma):
+    def __init__(self, model, lr, gamma, data_parallel=False):
         """
         Initializes the trainer with necessary parameters
         
@@ -18,29 +19,44 @@ class QTrainer:
             model: neural network model to train
             lr: learning rate
             gamma: discount factor for future rewards
+            data_parallel: if True, every rank of the initialized torch.distributed
+                group trains on its shard of each batch and gradients are all-reduced
         """
         self.lr = lr
         self.gamma = gamma
         self.model = model
         self.optimizer = optim.Adam(model.parameters(), lr=self.lr)
         self.criterion = nn.MSELoss()
+        
+        self.data_parallel = data_parallel
+        if data_parallel:
+            # All ranks must start from the same weights
+            with torch.no_grad():
+                for param in model.parameters():
+                    dist.broadcast(param, src=0)
 
     def train_step(self, state, action, reward, next_state, done):
         """
         Performs one training step of the model
         
+        In data-parallel mode every rank must be given the same batch (see
+        src.model.distributed.broadcast_batch) and the same number of calls.
+        
         Args:
             state: current state
             action: action taken
             reward: reward received
             next_state: next state
             done: boolean indicating if the episode is finished
+        
+        Returns:
+            loss of the training step
         """
         # Convert data to tensors if not already
-        state = torch.tensor(state, dtype=torch.float)
-        next_state = torch.tensor(next_state, dtype=torch.float)
-        action = torch.tensor(action, dtype=torch.long)
-        reward = torch.tensor(reward, dtype=torch.float)
+        state = torch.as_tensor(state, dtype=torch.float)
+        next_state = torch.as_tensor(next_state, dtype=torch.float)
+        action = torch.as_tensor(action, dtype=torch.long)
+        reward = torch.as_tensor(reward, dtype=torch.float)
 
         # Handle dimensions for single-item batches
         if len(state.shape) == 1:
@@ -49,22 +65,34 @@ class QTrainer:
             action = torch.unsqueeze(action, 0)
             reward = torch.unsqueeze(reward, 0)
             done = (done,)
+        done = torch.as_tensor(done, dtype=torch.bool)
+
+        # Each rank only keeps its shard of the batch
+        batch_size = len(done)
+        if self.data_parallel:
+            shard = slice(dist.get_rank(), None, dist.get_world_size())
+            state, next_state, action, reward, done = (
+                state[shard], next_state[shard], action[shard], reward[shard], done[shard])
 
         # Q prediction for current state
         pred = self.model(state)
 
-        # Q prediction for next state (Q_new = r + gamma * max(Q_next))
+        # Q prediction for next state (Q_new = r + gamma * max(Q_next)), only if not done
         target = pred.clone()
-        for idx in range(len(done)):
-            Q_new = reward[idx]
-            if not done[idx]:
-                Q_new = reward[idx] + self.gamma * torch.max(self.model(next_state[idx]))
-                
-            # Update Q value for the action taken
-            target[idx][torch.argmax(action[idx]).item()] = Q_new
+        Q_new = reward + self.gamma * torch.max(self.model(next_state), dim=1)[0] * ~done
+            
+        # Update Q value for the action taken
+        target[torch.arange(len(done)), torch.argmax(action, dim=1)] = Q_new
 
         # Update network weights
         self.optimizer.zero_grad()
-        loss = self.criterion(target, pred)
-        loss.backward()
-        self.optimizer.step()
\ No newline at end of file
+        loss = self.criterion(target, pred) if len(done) > 0 else pred.sum() * 0
+        if self.data_parallel:
+            # Weight the shard so that summed gradients equal the full-batch gradient
+            (loss * len(done) / batch_size).backward()
+            for param in self.model.parameters():
+                dist.all_reduce(param.grad, op=dist.ReduceOp.SUM)
+        else:
+            loss.backward()
+        self.optimizer.step()
+        return loss.item()
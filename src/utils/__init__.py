@@ -0,0 +1,9 @@
+"""
+Utility Module for Snake AI
+Contains helpers shared by the game, the agent and the training modes
+"""
+
+from src.utils.seeding import derive_seed
+from src.utils.metrics import TrainingMetrics
+
+__all__ = ["derive_seed", "TrainingMetrics"]
@@ -0,0 +1,230 @@
+"""
+Streaming metrics for Snake AI
+Statistics of long training runs with O(1) updates and fixed memory
+"""
+
+import math
+import numpy as np
+
+# Games in the rolling windows
+WINDOW_SIZE = 100
+# Smoothing factor of the exponential moving averages
+EMA_ALPHA = 0.01
+# Relative accuracy of the quantile sketches
+SKETCH_ACCURACY = 0.01
+# Points kept by the long-term histories
+HISTORY_POINTS = 1000
+# Quantiles reported by the summaries
+QUANTILES = (0.5, 0.9, 0.99)
+
+class RollingWindow:
+    """
+    Mean, minimum and maximum of the last values, over a ring buffer
+    """
+    def __init__(self, size=WINDOW_SIZE):
+        self.values = np.zeros(size)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        """
+        Adds a value, replacing the oldest one once the window is full
+        """
+        i = self.count % len(self.values)
+        self.total += value - float(self.values[i])
+        self.values[i] = value
+        self.count += 1
+        if i == len(self.values) - 1:
+            # Resum once per turn so that rounding errors do not accumulate
+            self.total = float(self.values.sum())
+
+    def __len__(self):
+        return min(self.count, len(self.values))
+
+    @property
+    def mean(self):
+        return self.total / len(self) if self.count else 0.0
+
+    @property
+    def min(self):
+        return float(self.values[:len(self)].min()) if self.count else 0.0
+
+    @property
+    def max(self):
+        return float(self.values[:len(self)].max()) if self.count else 0.0
+
+class EMA:
+    """
+    Exponential moving average, bias-corrected so that early values are not pulled to zero
+    """
+    def __init__(self, alpha=EMA_ALPHA):
+        self.alpha = alpha
+        self._average = 0.0
+        self._weight = 0.0
+
+    def add(self, value):
+        """
+        Moves the average towards a value
+        """
+        self._average += self.alpha * (value - self._average)
+        self._weight += self.alpha * (1 - self._weight)
+
+    @property
+    def value(self):
+        return self._average / self._weight if self._weight else 0.0
+
+class QuantileSketch:
+    """
+    Quantiles of a stream of non-negative values within a relative error
+
+    Values are counted in logarithmic buckets (as in DDSketch): any
+    quantile is returned within SKETCH_ACCURACY of a value of the stream,
+    and the number of buckets only grows with the logarithm of the range,
+    about 1000 buckets from 1 to 10^9 at 1%.
+    """
+    def __init__(self, accuracy=SKETCH_ACCURACY):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value):
+        """
+        Counts a value, negative values are counted as zero
+        """
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def quantile(self, q):
+        """
+        Returns the q-quantile (0 <= q <= 1) of the values counted so far
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+class History:
+    """
+    Long-term history of a value, downsampled to a fixed number of points
+
+    Each point is the mean of `stride` consecutive values. When the points
+    fill up, neighbours are merged and the stride doubles, so updates are
+    O(1) amortized and the history covers the whole run at any length.
+    """
+    def __init__(self, max_points=HISTORY_POINTS):
+        self.max_points = max_points - max_points % 2
+        self.stride = 1
+        self.points = []
+        self.count = 0
+        self._total = 0.0
+        self._size = 0
+
+    def add(self, value):
+        """
+        Adds a value, merging the points once they are full
+        """
+        self.count += 1
+        self._total += value
+        self._size += 1
+        if self._size == self.stride:
+            self.points.append((self.count - (self.stride - 1) / 2, self._total / self.stride))
+            self._total = 0.0
+            self._size = 0
+            if len(self.points) == self.max_points:
+                self.points = [((x0 + x1) / 2, (y0 + y1) / 2)
+                               for (x0, y0), (x1, y1) in zip(self.points[::2], self.points[1::2])]
+                self.stride *= 2
+
+class StreamingStats:
+    """
+    Every statistic of one value: total mean, rolling window, EMA, quantiles and history
+    """
+    def __init__(self, window=WINDOW_SIZE, alpha=EMA_ALPHA, accuracy=SKETCH_ACCURACY,
+                 history_points=HISTORY_POINTS):
+        self.count = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.max = 0.0
+        self.window = RollingWindow(window)
+        self.ema = EMA(alpha)
+        self.sketch = QuantileSketch(accuracy)
+        self.history = History(history_points)
+
+    def add(self, value):
+        """
+        Updates every statistic with a value
+        """
+        self.count += 1
+        self.total += value
+        self.last = value
+        self.max = value if self.count == 1 else max(self.max, value)
+        self.window.add(value)
+        self.ema.add(value)
+        self.sketch.add(value)
+        self.history.add(value)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self, quantiles=QUANTILES):
+        """
+        Returns the current statistics as a flat dict
+        """
+        summary = {'last': self.last, 'mean': self.mean, 'max': self.max,
+                   'window_mean': self.window.mean, 'ema': self.ema.value}
+        for q in quantiles:
+            summary[f"p{round(q * 100)}"] = self.sketch.quantile(q)
+        return summary
+
+class TrainingMetrics:
+    """
+    Streaming statistics of the score and the length of every game
+    """
+    def __init__(self, window=WINDOW_SIZE, alpha=EMA_ALPHA, accuracy=SKETCH_ACCURACY,
+                 history_points=HISTORY_POINTS):
+        """
+        Creates empty statistics
+
+        Args:
+            window: games in the rolling windows
+            alpha: smoothing factor of the moving averages
+            accuracy: relative accuracy of the quantiles
+            history_points: points kept by the long-term histories
+        """
+        self.score = StreamingStats(window, alpha, accuracy, history_points)
+        self.length = StreamingStats(window, alpha, accuracy, history_points)
+
+    @property
+    def games(self):
+        return self.score.count
+
+    def add_game(self, score, length):
+        """
+        Records a finished game
+        """
+        self.score.add(score)
+        self.length.add(length)
+
+    def summary(self):
+        """
+        Returns the statistics of both values, keys prefixed by score_ and length_
+        """
+        summary = {'games': self.games}
+        for name in ('score', 'length'):
+            for key, value in getattr(self, name).summary().items():
+                summary[f"{name}_{key}"] = value
+        return summary
@@ -0,0 +1,144 @@
+"""
+Metrics logging for Snake AI
+Writes one structured record per game to JSONL or CSV from a background thread
+"""
+
+import os
+import csv
+import json
+import queue
+import socket
+import threading
+
+# Default seconds between two writes of the buffered records
+FLUSH_INTERVAL = 1.0
+# Default address of the socket exporter
+EXPORT_HOST = '127.0.0.1'
+
+class MetricsSink:
+    """
+    Buffered sink of training records
+
+    write() only puts the record in a queue. A writer thread wakes up every
+    flush_interval seconds, appends the queued records to the file and
+    flushes it, so the training loop never waits on disk. Records can also
+    be sent as JSON datagrams to a local UDP port, where a dashboard can
+    listen; they are dropped silently when nobody does.
+
+    The CSV columns are those of the first record. When appending to an
+    existing CSV they must be the columns of its header.
+    """
+    def __init__(self, path=None, fmt=None, flush_interval=FLUSH_INTERVAL, address=None):
+        """
+        Opens the file and starts the writer thread
+
+        Args:
+            path: file the records are appended to, None to only export them
+            fmt: 'jsonl' or 'csv', guessed from the file extension by default
+            flush_interval: seconds between two writes
+            address: optional (host, port) the records are sent to over UDP
+        """
+        if fmt is None:
+            fmt = 'csv' if path is not None and path.endswith('.csv') else 'jsonl'
+        if fmt not in ('jsonl', 'csv'):
+            raise ValueError(f"Unknown metrics format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.flush_interval = flush_interval
+        self.address = address
+        self._file = None
+        self._csv = None
+        self._columns = None
+        self._header = None
+        if path is not None:
+            if fmt == 'csv' and os.path.exists(path) and os.path.getsize(path) > 0:
+                with open(path, newline='') as f:
+                    self._header = next(csv.reader(f), None)
+            self._file = open(path, 'a', newline='')
+        self._socket = None
+        if address is not None:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._socket.setblocking(False)
+        self._records = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, record):
+        """
+        Queues a record (a flat dict), to be written by the writer thread
+
+        Raises:
+            ValueError: If the first record does not have the columns of an existing CSV
+        """
+        if self._columns is None and self._file is not None and self.fmt == 'csv':
+            if self._header is not None and set(self._header) != set(record):
+                raise ValueError(f"Metrics columns {list(record)} do not match the header "
+                                 f"of {self.path}: {self._header}")
+            self._columns = self._header or list(record)
+        self._records.put(record)
+
+    def _run(self):
+        """
+        Writer thread: writes the queued records once per interval
+        """
+        while not self._stop.wait(self.flush_interval):
+            self._drain()
+        self._drain()
+
+    def _drain(self):
+        """
+        Writes every queued record and flushes the file
+        """
+        records = []
+        while True:
+            try:
+                records.append(self._records.get_nowait())
+            except queue.Empty:
+                break
+        if not records:
+            return
+        if self._file is not None:
+            if self.fmt == 'jsonl':
+                self._file.write(''.join(json.dumps(record) + '\n' for record in records))
+            else:
+                if self._csv is None:
+                    self._csv = csv.DictWriter(self._file, fieldnames=self._columns,
+                                               extrasaction='ignore')
+                    if self._header is None:
+                        self._csv.writeheader()
+                self._csv.writerows(records)
+            self._file.flush()
+        if self._socket is not None:
+            for record in records:
+                try:
+                    self._socket.sendto(json.dumps(record).encode(), self.address)
+                except OSError:
+                    pass
+
+    def close(self):
+        """
+        Writes the last records and closes the file
+        """
+        self._stop.set()
+        self._thread.join()
+        if self._file is not None:
+            self._file.close()
+        if self._socket is not None:
+            self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def listen(port, host=EXPORT_HOST):
+    """
+    Yields the records sent by a MetricsSink to a local port, for a dashboard
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind((host, port))
+        while True:
+            data, _ = sock.recvfrom(65536)
+            yield json.loads(data)
@@ -0,0 +1,251 @@
+"""
+Profiler for Snake AI
+Times every phase of the training loop with monotonic clocks and reports where time goes
+"""
+
+import sys
+import json
+import time
+import cProfile
+
+# Default seconds between two reports
+REPORT_INTERVAL = 30.0
+# Histogram buckets per doubling of the duration
+SUB_BUCKETS = 4
+# Quantiles of the durations in the reports
+QUANTILES = (0.5, 0.99)
+
+def _bucket(ns):
+    """
+    Returns the histogram bucket of a duration, SUB_BUCKETS per power of two
+    """
+    bits = ns.bit_length()
+    if bits <= 2:
+        return bits
+    return bits * SUB_BUCKETS + ((ns >> (bits - 3)) & (SUB_BUCKETS - 1))
+
+def _bucket_floor(index):
+    """
+    Returns the shortest duration in nanoseconds of a histogram bucket
+    """
+    if index <= 2:
+        return max(index, 1)
+    bits, sub = divmod(index, SUB_BUCKETS)
+    return (SUB_BUCKETS + sub) << (bits - 3)
+
+class PhaseStats:
+    """
+    Call count, total and last time and log-scale histogram of the durations of a phase
+    """
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.last_ns = 0
+        self.histogram = [0] * (64 * SUB_BUCKETS + SUB_BUCKETS)
+
+    def add(self, ns):
+        """
+        Records a duration in nanoseconds
+        """
+        self.calls += 1
+        self.total_ns += ns
+        self.last_ns = ns
+        self.histogram[_bucket(ns)] += 1
+
+    def quantile(self, q):
+        """
+        Returns the q-quantile of the durations in seconds, within 25%
+        """
+        rank = q * (self.calls - 1)
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if count and rank < seen:
+                return _bucket_floor(index) * 1e-9
+        return 0.0
+
+class PhaseProfiler:
+    """
+    Per-phase timings of the training loop
+
+    The loop takes a timestamp with clock() and closes each phase with
+    lap(name, start), which records the duration and returns the next
+    start, so that consecutive phases cost one clock read each. Steps are
+    counted from the 'play_step' laps and games from game_over(). Every
+    report_interval seconds the statistics of the interval are printed
+    and, if a path is given, written as JSON; they are then reset.
+
+    A phase named 'parent/child' is timed inside its parent phase: it is
+    reported under the parent and its share is not to be added to the
+    shares of the other phases.
+
+    In cProfile mode a cProfile.Profile runs on the thread calling
+    start(), and its statistics are dumped next to the report, to
+    path + '.prof' (readable by pstats or snakeviz), covering the run
+    from its start.
+    """
+    enabled = True
+
+    def __init__(self, report_interval=REPORT_INTERVAL, path=None, cprofile=False, stream=sys.stdout):
+        """
+        Creates an empty profiler
+
+        Args:
+            report_interval: seconds between two reports, None to only report on demand
+            path: optional JSON file rewritten with the latest report
+            cprofile: If True, also runs cProfile, dumped to path + '.prof'
+            stream: text stream the reports are printed to, None for no print
+        """
+        self.report_interval = report_interval
+        self.path = path
+        self.stream = stream
+        self.profile = cProfile.Profile() if cprofile else None
+        self.phases = {}
+        self.games = 0
+        self.reports = 0
+        self.last_report = None
+        self._interval_start = time.perf_counter()
+        self._stopped = True
+
+    @staticmethod
+    def clock():
+        """
+        Returns a timestamp in nanoseconds to start a phase from
+        """
+        return time.perf_counter_ns()
+
+    def lap(self, phase, start):
+        """
+        Ends a phase started at start, returns the start of the next one
+        """
+        now = time.perf_counter_ns()
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = PhaseStats()
+        stats.add(now - start)
+        return now
+
+    def start(self):
+        """
+        Starts the interval, and cProfile in cProfile mode
+        """
+        self._interval_start = time.perf_counter()
+        self._stopped = False
+        if self.profile is not None:
+            self.profile.enable()
+
+    def stop(self):
+        """
+        Stops cProfile and writes a last report
+        """
+        self._stopped = True
+        if self.profile is not None:
+            self.profile.disable()
+        self.report()
+
+    def game_over(self):
+        """
+        Counts a finished game and reports when the interval is over
+        """
+        self.games += 1
+        if (self.report_interval is not None and
+                time.perf_counter() - self._interval_start >= self.report_interval):
+            self.report()
+
+    def summary(self):
+        """
+        Returns the statistics of the current interval
+
+        Returns:
+            dict with the interval length, steps and games per second, and
+            per phase its calls, total seconds, share of the interval and
+            mean and quantiles of the durations in seconds; phases come
+            longest first, each followed by its sub-phases
+        """
+        seconds = max(time.perf_counter() - self._interval_start, 1e-9)
+        steps = self.phases['play_step'].calls if 'play_step' in self.phases else 0
+
+        def order(item):
+            name, stats = item
+            parent = name.split('/')[0]
+            parent_ns = self.phases[parent].total_ns if parent in self.phases else stats.total_ns
+            return (-parent_ns, parent, name != parent, -stats.total_ns)
+
+        phases = {}
+        for name, stats in sorted(self.phases.items(), key=order):
+            total = stats.total_ns * 1e-9
+            phases[name] = {'calls': stats.calls, 'total': total, 'share': total / seconds,
+                            'mean': total / stats.calls}
+            for q in QUANTILES:
+                phases[name][f"p{round(q * 100)}"] = stats.quantile(q)
+        return {'seconds': seconds, 'steps_per_sec': steps / seconds,
+                'games_per_sec': self.games / seconds, 'phases': phases}
+
+    def report(self):
+        """
+        Prints and saves the statistics of the interval, then starts a new one
+        """
+        summary = self.summary()
+        self.last_report = summary
+        self.reports += 1
+        if self.stream is not None:
+            self.stream.write(format_report(summary) + '\n')
+            self.stream.flush()
+        if self.path is not None:
+            with open(self.path, 'w') as f:
+                json.dump(summary, f, indent=2)
+            if self.profile is not None:
+                # dump_stats disables the profiler, resume collecting afterwards
+                self.profile.dump_stats(self.path + '.prof')
+                if not self._stopped:
+                    self.profile.enable()
+        self.phases = {}
+        self.games = 0
+        self._interval_start = time.perf_counter()
+        return summary
+
+class NullProfiler:
+    """
+    Profiler doing nothing, used when profiling is disabled
+
+    Its methods return at once, so an instrumented loop only pays for a few
+    empty calls per step.
+    """
+    enabled = False
+
+    @staticmethod
+    def clock():
+        return 0
+
+    @staticmethod
+    def lap(phase, start):
+        return 0
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def game_over(self):
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+def format_report(summary):
+    """
+    Formats a profiler summary as a table, longest phases first
+
+    Sub-phases are indented under their parent, their time is already
+    counted in the parent's.
+    """
+    lines = [f"Profile over {summary['seconds']:.1f} s: {summary['steps_per_sec']:.0f} steps/s, "
+             f"{summary['games_per_sec']:.2f} games/s",
+             f"{'phase':<20}{'calls':>10}{'total s':>10}{'share':>8}{'mean us':>10}"
+             f"{'p50 us':>10}{'p99 us':>10}"]
+    for name, stats in summary['phases'].items():
+        parent, _, child = name.partition('/')
+        name = f"  {child}" if child else parent
+        lines.append(f"{name:<20}{stats['calls']:>10}{stats['total']:>10.2f}{stats['share']:>8.1%}"
+                     f"{stats['mean'] * 1e6:>10.1f}{stats['p50'] * 1e6:>10.1f}{stats['p99'] * 1e6:>10.1f}")
+    return '\n'.join(lines)
@@ -0,0 +1,30 @@
+"""
+Seeding helpers for Snake AI
+"""
+
+import numpy as np
+
+# Streams of random numbers derived from a run seed
+GAME_STREAM = 0
+AGENT_STREAM = 1
+EVOLUTION_STREAM = 2
+
+def derive_seed(seed, *keys):
+    """
+    Derives an independent seed from a base seed and integer keys
+
+    Used to give every worker, environment and agent its own random
+    generator: derive_seed(seed, worker_id, GAME_STREAM) never correlates
+    with derive_seed(seed, worker_id, AGENT_STREAM) or with other workers.
+
+    Args:
+        seed: base seed of the run, None for a non-reproducible seed
+        keys: integers identifying the stream (worker index, stream kind...)
+
+    Returns:
+        a 32-bit seed, or None if seed is None
+    """
+    if seed is None:
+        return None
+    sequence = np.random.SeedSequence(seed, spawn_key=tuple(keys))
+    return int(sequence.generate_state(1)[0])
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Snake AI Hyperparameter Sweep
+Trains many headless agents in parallel and prints one table of results
+
+The spec is a JSON file mapping hyperparameters to their values, e.g.
+    {"lr": [0.0005, 0.001, 0.002], "gamma": [0.9, 0.95], "hidden_size": [128, 256]}
+Every combination is trained, or --random N combinations are drawn, in
+which case a value may also be a range such as {"min": 1e-4, "max": 1e-2, "log": true}.
+
+Usage:
+    python sweep.py spec.json --games 300 [--seconds S] [--workers N] [--out results.csv]
+"""
+
+import os
+import json
+import argparse
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from src.agent.sweep import grid_configs, random_configs, run_sweep, format_table, save_csv
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('spec', help='JSON file mapping hyperparameters to their values')
+    parser.add_argument('--random', type=int, default=None, metavar='N',
+                        help='draw N random combinations instead of the full grid')
+    parser.add_argument('--games', type=int, default=None, help='games per job')
+    parser.add_argument('--seconds', type=float, default=None, help='training time per job')
+    parser.add_argument('--repeats', type=int, default=1, help='seeds per combination')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: one per core)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the sweep')
+    parser.add_argument('--out', default=None, help='CSV file receiving the results')
+    args = parser.parse_args()
+    if args.games is None and args.seconds is None:
+        parser.error('give a budget with --games and/or --seconds')
+
+    with open(args.spec) as f:
+        space = json.load(f)
+    if args.random is None:
+        configs = grid_configs(space)
+    else:
+        configs = random_configs(space, args.random, seed=args.seed)
+
+    results = run_sweep(configs, num_workers=args.workers, seed=args.seed,
+                        max_games=args.games, time_budget=args.seconds, repeats=args.repeats)
+    print(format_table(results))
+    if args.out:
+        save_csv(results, args.out)
@@ -0,0 +1,19 @@
+import os
+import sys
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+from src.agent.actor_learner import train_actor_learner
+
+def test_actor_learner_smoke(tmp_path, monkeypatch):
+    """
+    Two spawned actors must feed the learner a few games and stop cleanly
+    """
+    # model.save() writes to ./model
+    monkeypatch.chdir(tmp_path)
+    history = train_actor_learner(use_existing_model=False, num_actors=2, seed=0, max_games=4)
+    assert len(history) == 4
+    assert all(score >= 0 for _, score in history)
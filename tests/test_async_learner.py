@@ -0,0 +1,63 @@
+import sys
+import time
+import random
+import threading
+import os.path as path
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+import pytest
+from src.agent.action import Agent
+from src.agent.async_learner import AsyncLearner
+
+def transition(rng):
+    """
+    Random transition with the shapes stored by the agent
+    """
+    state = [rng.randint(0, 1) for _ in range(23)]
+    move = [0, 0, 0]
+    move[rng.randrange(3)] = 1
+    return state, move, rng.uniform(-10, 10), [rng.randint(0, 1) for _ in range(23)], rng.random() < 0.1
+
+def test_learner_samples_while_game_thread_stores():
+    """
+    The learner threads must keep training while another thread fills
+    the replay memory past its size, and never fail on a mutated deque
+    """
+    agent = Agent(use_existing_model=False, seed=3, batch_size=32, max_memory=32)
+    learner = AsyncLearner(agent, batch_size=32, snapshot_interval=5)
+    stop = threading.Event()
+
+    def play():
+        rng = random.Random(0)
+        while not stop.is_set():
+            agent.remember(*transition(rng))
+
+    game = threading.Thread(target=play)
+    game.start()
+    learner.start()
+    deadline = time.monotonic() + 10
+    while learner.updates < 50 and learner.error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stop.set()
+    game.join()
+    learner.stop()
+    assert learner.error is None
+    assert learner.updates >= 50
+
+def test_thread_exception_is_raised_again():
+    """
+    A failure in a learner thread must surface in the training loop
+    """
+    agent = Agent(use_existing_model=False, seed=3, batch_size=4)
+    learner = AsyncLearner(agent, batch_size=4)
+    for _ in range(8):
+        # Transitions of the wrong shape make the conversion to tensors fail
+        agent.memory.remember([0] * 23, [0, 1], 0.0, [0], False)
+    learner.start()
+    for thread in learner._threads:
+        thread.join(timeout=10)
+    with pytest.raises(RuntimeError):
+        learner.check()
+    with pytest.raises(RuntimeError):
+        learner.stop()
@@ -0,0 +1,85 @@
+import os
+import sys
+import random
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+from src.game import SnakeGameAI, BitboardSnakeGameAI, Point
+from src.game.constants import BLOCK_SIZE
+from src.agent.state import get_state
+from src.agent.safety import reachable_area, next_head
+
+def test_bitboard_matches_reference_queries():
+    """
+    Plays random moves on the bitboard engine and checks every spatial query
+    against a list-based implementation.
+    """
+    random.seed(0)
+    game = BitboardSnakeGameAI(render=False, seed=0)
+    actions = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    longest = 0
+
+    for _ in range(3000):
+        # Steer towards the food most of the time so the snake grows
+        move = random.randint(0, 2)
+        if random.random() < 0.8:
+            move = min(range(3), key=lambda m: food_distance(game, next_head(game, m)))
+        game._move(actions[move])
+        game._grow_head()
+        reward, done = game._check_game_status(0, 0)
+        longest = max(longest, len(game.snake))
+        if done:
+            game.reset()
+            continue
+
+        assert game.board.occupied.bit_count() == len(game.snake) - 1
+        for dx in range(-3, 4):
+            for dy in range(-3, 4):
+                pt = Point(game.head.x + dx * BLOCK_SIZE, game.head.y + dy * BLOCK_SIZE)
+                expected = reference_collision(game, pt)
+                assert game.is_collision(pt) == expected
+                assert SnakeGameAI.is_collision(game, pt) == expected
+
+        for start in (Point(game.head.x + BLOCK_SIZE, game.head.y),
+                      Point(game.head.x, game.head.y - BLOCK_SIZE)):
+            if not reference_collision(game, start):
+                limit = len(game.snake)
+                assert game.reachable_area(start, limit) == reachable_area(game, start, limit)
+
+        state = get_state(game)
+        assert list(state) == list(get_state_reference(game))
+
+    assert longest > 10
+
+def food_distance(game, pt):
+    """
+    Returns the distance to the food, or infinity if the move collides
+    """
+    if reference_collision(game, pt):
+        return float('inf')
+    return abs(game.food.x - pt.x) + abs(game.food.y - pt.y)
+
+def reference_collision(game, pt):
+    """
+    Checks a collision by scanning the snake list like the original game
+    """
+    if pt.x > game.w - BLOCK_SIZE or pt.x < 0 or pt.y > game.h - BLOCK_SIZE or pt.y < 0:
+        return True
+    return pt in list(game.snake)[1:]
+
+def get_state_reference(game):
+    """
+    Computes the state with the reference collision check, point by point
+    instead of through the danger rays
+    """
+    fast = game.is_collision
+    game.is_collision = lambda pt=None: reference_collision(game, pt)
+    game.danger_rays = lambda: None
+    try:
+        return get_state(game)
+    finally:
+        game.is_collision = fast
+        del game.danger_rays
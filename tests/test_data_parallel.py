@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+import os.path as path
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+import torch
+from src.model import Linear_QNet, QTrainer
+from src.model.distributed import run_data_parallel, broadcast_batch
+
+BATCH = 37
+STEPS = 3
+
+def make_batches():
+    """
+    Builds the same random replay batches in every process
+    """
+    gen = torch.Generator().manual_seed(0)
+    batches = []
+    for _ in range(STEPS):
+        states = torch.randint(0, 2, (BATCH, 23), generator=gen)
+        actions = torch.eye(3, dtype=torch.long)[torch.randint(0, 3, (BATCH,), generator=gen)]
+        rewards = torch.randn(BATCH, generator=gen)
+        next_states = torch.randint(0, 2, (BATCH, 23), generator=gen)
+        dones = torch.rand(BATCH, generator=gen) < 0.2
+        batches.append((states, actions, rewards, next_states, dones))
+    return batches
+
+def _train_rank(rank, world_size, output):
+    """
+    Trains a data-parallel model; rank 0 starts from other weights and its
+    batches are the only ones used
+    """
+    torch.manual_seed(rank)
+    model = Linear_QNet(23, 256, 3)
+    trainer = QTrainer(model, lr=0.01, gamma=0.9, data_parallel=True)
+    for batch in make_batches():
+        trainer.train_step(*broadcast_batch(batch if rank == 0 else None))
+    if rank == 0:
+        torch.save(model.state_dict(), output)
+
+def test_data_parallel_matches_single_process():
+    """
+    Two gloo ranks training on shards of each batch must end with the same
+    weights as one process training on the full batches.
+    """
+    torch.manual_seed(0)
+    model = Linear_QNet(23, 256, 3)
+    trainer = QTrainer(model, lr=0.01, gamma=0.9)
+    for batch in make_batches():
+        trainer.train_step(*batch)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        output = os.path.join(workdir, 'rank0.pth')
+        run_data_parallel(_train_rank, 2, output)
+        parallel = torch.load(output)
+
+    for name, param in model.state_dict().items():
+        assert torch.allclose(param, parallel[name], atol=1e-5), name
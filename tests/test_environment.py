@@ -0,0 +1,26 @@
+import os
+import sys
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+from src.game import ENGINES, Point
+from src.game.constants import BLOCK_SIZE
+
+def test_filling_the_board_wins_the_game():
+    """
+    Eats the last free cell of a 4x1 board and checks that the game ends as
+    a win instead of looking for a free cell to put the food on.
+    """
+    for engine in ENGINES.values():
+        game = engine(cols=4, rows=1, render=False, seed=0)
+        # The snake covers the three left cells, the food has one place left
+        assert game.food == Point(3 * BLOCK_SIZE, 0)
+
+        reward, done, score = game.play_step([1, 0, 0], None)
+        assert done
+        assert reward == 10
+        assert score == 1
+        assert len(game.snake) == 4
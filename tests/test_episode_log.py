@@ -0,0 +1,76 @@
+import os
+import sys
+import random
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+import numpy as np
+from src.game import SnakeGameAI
+from src.game.episode_log import EpisodeLogWriter, EpisodeLog, pack_moves, unpack_moves, ACTIONS
+
+def play(log, game, rng, games):
+    """
+    Plays random games into a log and returns their (moves, rewards, score)
+    """
+    played = []
+    moves, rewards = [], []
+    while len(played) < games:
+        move = rng.randint(0, 2)
+        reward, done, score = game.play_step(ACTIONS[move], None)
+        log.step(game, move, reward, done, score)
+        moves.append(move)
+        rewards.append(reward)
+        if done:
+            played.append((bytes(moves), rewards, score))
+            moves, rewards = [], []
+            game.reset()
+    return played
+
+def test_pack_moves_roundtrip():
+    """
+    Moves packed four per byte must unpack to the same moves
+    """
+    rng = random.Random(0)
+    for count in range(0, 13):
+        moves = bytes(rng.randint(0, 2) for _ in range(count))
+        assert len(pack_moves(moves)) == -(-count // 4)
+        assert unpack_moves(pack_moves(moves), count) == moves
+
+def test_log_random_access_and_recovery(tmp_path):
+    """
+    Logged episodes must read back in any order, survive reopening and a
+    torn last record, and replay to the logged rewards
+    """
+    log_path = str(tmp_path / 'episodes.log')
+    rng = random.Random(0)
+    game = SnakeGameAI(render=False, seed=0, loop_detection='penalize')
+    with EpisodeLogWriter(log_path) as log:
+        played = play(log, game, rng, 10)
+    with EpisodeLogWriter(log_path) as log:
+        assert log.n_games == 10
+        played += play(log, game, rng, 5)
+
+    # Cut the last record in half, as a crash during a write would
+    size = os.path.getsize(log_path)
+    os.truncate(log_path, size - 3)
+
+    log = EpisodeLog(log_path)
+    assert len(log) == 14
+    for k in (13, 0, 7, 3):
+        episode = log[k]
+        moves, rewards, score = played[k]
+        assert episode.actions == moves and episode.score == score
+        assert np.allclose(episode.rewards, rewards)
+
+    states, actions, rewards, next_states, dones = log.transitions(7)
+    assert len(states) == len(played[7][0]) and dones[-1] and not dones[:-1].any()
+    assert (states[1:] == next_states[:-1]).all()
+
+    # Reopening drops the torn record and appends after the last complete one
+    with EpisodeLogWriter(log_path) as writer:
+        assert writer.n_games == 14
+        play(writer, game, rng, 1)
+    assert len(EpisodeLog(log_path)) == 15
@@ -0,0 +1,43 @@
+import os
+import sys
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+import numpy as np
+from src.agent.evolution import train_evolution, _centered_ranks, _game_seeds
+from src.utils.seeding import derive_seed, AGENT_STREAM, GAME_STREAM
+
+def test_centered_ranks():
+    """
+    Ranks must keep the order of the values and span [-0.5, 0.5]
+    """
+    values = np.array([3.0, -100.0, 7.5, 0.0, 1e6])
+    ranks = _centered_ranks(values)
+    assert list(np.argsort(ranks)) == list(np.argsort(values))
+    assert ranks.min() == -0.5 and ranks.max() == 0.5
+    assert abs(ranks.sum()) < 1e-6
+
+def test_game_seeds_use_their_own_stream():
+    """
+    No evaluation game may share a seed with the agent or the training games
+    """
+    reserved = {derive_seed(7, 0, AGENT_STREAM), derive_seed(7, 0, GAME_STREAM)}
+    seeds = [s for generation in range(50) for s in _game_seeds(7, generation, 4, None)]
+    assert len(set(seeds)) == len(seeds)
+    assert not reserved & set(seeds)
+    assert _game_seeds(7, 3, 4, None) == _game_seeds(7, 3, 4, None)
+
+def test_train_evolution_is_reproducible(tmp_path, monkeypatch):
+    """
+    Two short runs with the same seed must evolve the same scores
+    """
+    # model.save() writes to ./model
+    monkeypatch.chdir(tmp_path)
+    runs = [train_evolution(use_existing_model=False, num_workers=2, seed=1, population_size=4,
+                            episodes=1, max_generations=2)
+            for _ in range(2)]
+    assert len(runs[0]) == 2
+    assert [score for _, score in runs[0]] == [score for _, score in runs[1]]
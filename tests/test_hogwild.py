@@ -0,0 +1,22 @@
+import os
+import sys
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+from src.agent.hogwild import train_hogwild
+
+def test_hogwild_smoke(tmp_path, monkeypatch, capfd):
+    """
+    Two spawned workers must train the shared model for a few games, stop
+    cleanly, the workers printing nothing
+    """
+    # model.save() writes to ./model
+    monkeypatch.chdir(tmp_path)
+    history = train_hogwild(use_existing_model=False, num_workers=2, seed=0, max_games=4)
+    assert len(history) == 4
+    out = capfd.readouterr().out
+    # Only the main process announces the model
+    assert out.count('Starting with a new model') == 1
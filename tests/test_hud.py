@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+from src.agent.memory import ReplayMemory
+from src.game import SnakeGameAI
+from src.game.hud import ThroughputHud, HUD_KEYS
+from src.game.live_view import LiveViewPublisher
+from src.utils.profiler import PhaseProfiler
+
+def test_hud_values_follow_the_profiler():
+    """
+    Rates, latencies and fill must be computed from the profiler counters,
+    across a profiler report, and be published to the live view
+    """
+    profiler = PhaseProfiler(report_interval=None, stream=None)
+    memory = ReplayMemory(max_size=100)
+    hud = ThroughputHud(profiler, memory, interval=0, window=60)
+    hud.update()
+    for step in range(200):
+        lap = profiler.clock()
+        lap = profiler.lap('get_action', lap - 2_000_000)
+        profiler.lap('play_step', lap)
+        memory.remember(0, 0, 0, 0, False)
+        if step % 50 == 49:
+            profiler.game_over()
+        if step == 99:
+            hud.update()
+            profiler.report()
+    time.sleep(0.01)
+    values = hud.update()
+    assert 1.9 <= values['inference_ms'] <= 2.5
+    assert values['replay_fill'] == 1.0 and values['rss_mb'] > 0
+    seconds = hud._samples[-1][0] - hud._samples[0][0]
+    assert abs(values['steps_per_sec'] * seconds - 200) < 1e-6
+    assert abs(values['games_per_min'] * seconds / 60 - 4) < 1e-6
+
+    # The viewer runs as its own program, play its part through the heartbeat
+    game = SnakeGameAI(render=False, cols=8, rows=6, seed=0)
+    publisher = LiveViewPublisher(game.cols, game.rows, name='snake_ai_test_hud')
+    try:
+        publisher.heartbeat[0] = time.monotonic()
+        publisher.publish(game, [0] * 23, hud=values)
+        assert publisher.hud.tolist() == [values[key] for key in HUD_KEYS]
+    finally:
+        publisher.close()
@@ -0,0 +1,44 @@
+import os
+import sys
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+import numpy as np
+import pytest
+from multiprocessing import shared_memory
+from src.game.live_view import LiveViewPublisher, _block_size, _HEADER_SIZE, _OWNER
+
+NAME = 'snake_ai_test_view'
+
+def test_publisher_never_takes_over_a_running_block():
+    """
+    A second publisher must fail while the first one runs, and succeed
+    once it is closed
+    """
+    first = LiveViewPublisher(8, 6, name=NAME)
+    try:
+        with pytest.raises(FileExistsError):
+            LiveViewPublisher(8, 6, name=NAME)
+        assert first.header[_OWNER] == os.getpid()
+    finally:
+        first.close()
+    first.close()
+    second = LiveViewPublisher(8, 6, name=NAME)
+    second.close()
+
+def test_publisher_replaces_a_stale_block():
+    """
+    A block left over by a process that is gone must be replaced
+    """
+    stale = shared_memory.SharedMemory(name=NAME, create=True, size=_block_size(8, 6))
+    header = np.ndarray(_HEADER_SIZE, dtype=np.int64, buffer=stale.buf)
+    # Above the largest pid of any system
+    header[_OWNER] = 2 ** 22 + 1
+    del header
+    stale.close()
+    publisher = LiveViewPublisher(8, 6, name=NAME)
+    assert publisher.header[_OWNER] == os.getpid()
+    publisher.close()
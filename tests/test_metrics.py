@@ -0,0 +1,52 @@
+import sys
+import os.path as path
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+import numpy as np
+from src.utils.metrics import RollingWindow, EMA, QuantileSketch, History, TrainingMetrics
+
+def test_streaming_statistics_match_exact_ones():
+    """
+    Windows, EMA, quantiles and history must agree with statistics computed
+    on the full stream, within the accuracy of the sketch
+    """
+    rng = np.random.default_rng(0)
+    values = np.concatenate([np.zeros(500), rng.gamma(2.0, 10.0, 20_000)])
+    window, ema, sketch, history = RollingWindow(100), EMA(0.05), QuantileSketch(0.01), History(64)
+    expected_ema = values[0]
+    for value in values:
+        window.add(value)
+        ema.add(value)
+        sketch.add(value)
+        history.add(value)
+    for value in values[1:]:
+        expected_ema += 0.05 * (value - expected_ema)
+
+    assert np.isclose(window.mean, values[-100:].mean())
+    assert window.max == values[-100:].max()
+    assert np.isclose(ema.value, expected_ema)
+    for q in (0.01, 0.5, 0.9, 0.99):
+        exact = np.quantile(values, q, method='lower')
+        assert abs(sketch.quantile(q) - exact) <= 0.011 * exact + 1e-9
+    assert len(sketch.buckets) < 1000
+
+    # The history covers the whole stream with a bounded number of points
+    assert len(history.points) < 64 and history.stride > 1
+    xs = [x for x, _ in history.points]
+    assert xs == sorted(xs) and xs[-1] <= len(values)
+    covered = history.stride * len(history.points)
+    assert np.isclose(np.mean([y for _, y in history.points]), values[:covered].mean())
+
+def test_training_metrics_summary():
+    """
+    The summary must report both values with their prefixes
+    """
+    metrics = TrainingMetrics(window=3)
+    for score, length in [(0, 10), (2, 50), (5, 90), (1, 40)]:
+        metrics.add_game(score, length)
+    summary = metrics.summary()
+    assert summary['games'] == 4
+    assert summary['score_max'] == 5 and summary['score_last'] == 1
+    assert np.isclose(summary['score_window_mean'], 8 / 3)
+    assert np.isclose(summary['length_mean'], 47.5)
@@ -0,0 +1,58 @@
+import sys
+import csv
+import json
+import socket
+import os.path as path
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+import pytest
+from src.utils.metrics_log import MetricsSink
+
+def test_sink_writes_jsonl_csv_and_datagrams(tmp_path):
+    """
+    Every record must reach the file in order, in both formats, and be
+    sent to a listening port
+    """
+    records = [{'game': game, 'score': game % 3, 'loss': None if game == 0 else 0.5}
+               for game in range(50)]
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(('127.0.0.1', 0))
+    receiver.settimeout(5)
+
+    jsonl = str(tmp_path / 'metrics.jsonl')
+    with MetricsSink(jsonl, flush_interval=0.01, address=receiver.getsockname()) as sink:
+        for record in records:
+            sink.write(record)
+    with open(jsonl) as f:
+        assert [json.loads(line) for line in f] == records
+    assert json.loads(receiver.recv(65536)) == records[0]
+    receiver.close()
+
+    # Appending to an existing CSV keeps a single header
+    table = str(tmp_path / 'metrics.csv')
+    for part in (records[:20], records[20:]):
+        with MetricsSink(table, flush_interval=10) as sink:
+            for record in part:
+                sink.write(record)
+    with open(table, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [int(row['game']) for row in rows] == list(range(50))
+    assert rows[0]['loss'] == '' and rows[1]['loss'] == '0.5'
+
+def test_csv_append_checks_columns(tmp_path):
+    """
+    Appending to a CSV must follow its header, in its column order, and
+    refuse records with other columns
+    """
+    table = str(tmp_path / 'metrics.csv')
+    with MetricsSink(table, flush_interval=10) as sink:
+        sink.write({'game': 1, 'score': 2})
+    with MetricsSink(table, flush_interval=10) as sink:
+        sink.write({'score': 4, 'game': 3})
+    with open(table, newline='') as f:
+        assert list(csv.reader(f)) == [['game', 'score'], ['1', '2'], ['3', '4']]
+
+    with MetricsSink(table, flush_interval=10) as sink:
+        with pytest.raises(ValueError):
+            sink.write({'game': 5, 'loss': 0.1})
@@ -0,0 +1,28 @@
+import os
+import sys
+import os.path as path
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+from src.agent.plotter import Plotter, downsample
+
+def test_downsample_keeps_the_curve_shape():
+    """
+    Downsampled points must stay in order, within bounds and end at the last point
+    """
+    points = [(game, game % 7, game / 2) for game in range(1, 1001)]
+    merged = downsample(points, 300)
+    assert len(merged) <= 300
+    assert [p[0] for p in merged] == sorted(p[0] for p in merged)
+    assert merged[-1][0] > 990 and all(0 <= p[1] <= 6 for p in merged)
+
+def test_plotter_draws_without_blocking(tmp_path):
+    """
+    Updates must return at once and the plot process must write the figure
+    """
+    image = str(tmp_path / 'plot.png')
+    plotter = Plotter(interval=0.05, show=False, path=image)
+    for game in range(1, 5001):
+        plotter.update(game, game % 10, 4.5)
+    plotter.close()
+    assert os.path.getsize(image) > 0
@@ -0,0 +1,76 @@
+import io
+import sys
+import json
+import pstats
+import time
+import os.path as path
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+from src.utils.profiler import PhaseProfiler, PhaseStats, NULL_PROFILER, _bucket, _bucket_floor
+
+def test_histogram_buckets_bound_durations():
+    """
+    Every duration must fall in a bucket starting at most 25% below it
+    """
+    for ns in list(range(1, 5000)) + [10 ** k + 7 for k in range(4, 18)]:
+        floor = _bucket_floor(_bucket(ns))
+        assert floor <= ns < floor * 1.25 + 1
+    stats = PhaseStats()
+    for ns in range(1000, 2000):
+        stats.add(ns)
+    assert 1.2e-6 <= stats.quantile(0.5) <= 1.5e-6
+
+def test_profiler_reports_phases(tmp_path):
+    """
+    Laps must be attributed to their phases, counted as steps and written
+    to the report, while the null profiler records nothing
+    """
+    stream = io.StringIO()
+    profiler = PhaseProfiler(report_interval=None, path=str(tmp_path / 'profile.json'), stream=stream)
+    profiler.start()
+    for _ in range(20):
+        lap = profiler.clock()
+        time.sleep(0.001)
+        lap = profiler.lap('play_step', lap)
+        profiler.lap('get_state', lap)
+    profiler.game_over()
+    profiler.stop()
+
+    with open(tmp_path / 'profile.json') as f:
+        report = json.load(f)
+    assert report['phases']['play_step']['calls'] == 20
+    assert report['phases']['play_step']['mean'] >= 0.001
+    assert list(report['phases']) == ['play_step', 'get_state']
+    assert report['steps_per_sec'] > 0 and report['games_per_sec'] > 0
+    assert 'play_step' in stream.getvalue()
+    assert profiler.phases == {}
+    assert NULL_PROFILER.lap('play_step', NULL_PROFILER.clock()) == 0
+
+def test_sub_phases_and_cprofile_across_reports(tmp_path):
+    """
+    Sub-phases must follow their parent, indented in the table, and
+    cProfile must keep collecting after an intermediate report
+    """
+    stream = io.StringIO()
+    profiler = PhaseProfiler(report_interval=None, path=str(tmp_path / 'profile.json'),
+                             cprofile=True, stream=stream)
+    profiler.start()
+    for _ in range(5):
+        step = profiler.clock()
+        lap = profiler.clock()
+        time.sleep(0.001)
+        profiler.lap('play_step/update_ui', lap)
+        profiler.lap('play_step', step)
+        profiler.lap('get_state', profiler.clock())
+    summary = profiler.report()
+    assert list(summary['phases']) == ['play_step', 'play_step/update_ui', 'get_state']
+    assert '\n  update_ui' in stream.getvalue()
+
+    # A report in the middle of the run must not switch cProfile off
+    def after_report():
+        return sum(range(1000))
+    after_report()
+    profiler.stop()
+    functions = {name for _, _, name in pstats.Stats(str(tmp_path / 'profile.json.prof')).stats}
+    assert 'after_report' in functions
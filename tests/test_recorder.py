@@ -0,0 +1,66 @@
+import os
+import sys
+import random
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+from src.game import SnakeGameAI
+from src.game.recorder import EpisodeRecorder, load_episodes, render_episode, ACTIONS
+
+def test_recorded_episodes_replay_exactly(tmp_path):
+    """
+    Kept episodes must survive a save/load and replay to the same score
+    and length, and every step must render to a frame
+    """
+    rng = random.Random(0)
+    game = SnakeGameAI(render=False, seed=0, loop_detection='end')
+    recorder = EpisodeRecorder(keep_best=2, keep_worst=2, path=str(tmp_path / 'episodes.jsonl'))
+    scores = []
+    while recorder.n_games < 20:
+        move = rng.randint(0, 2)
+        reward, done, score = game.play_step(ACTIONS[move], None)
+        recorder.step(game, move, done, score)
+        if done:
+            scores.append(score)
+            game.reset()
+
+    assert [episode.score for episode in recorder.best] == sorted(scores, reverse=True)[:2]
+    assert [episode.score for episode in recorder.worst] == sorted(scores)[:2]
+
+    game_kwargs, episodes = load_episodes(str(tmp_path / 'episodes.jsonl'))
+    assert episodes == recorder.episodes
+    for episode in episodes:
+        replay = SnakeGameAI(render=False, **game_kwargs)
+        replay.reset(seed=episode.seed)
+        for step, move in enumerate(episode.actions, 1):
+            reward, done, score = replay.play_step(ACTIONS[move], None)
+            assert done == (step == len(episode.actions))
+        assert score == episode.score
+
+    frames = render_episode(episodes[0], game_kwargs, scale=0.25)
+    assert frames.shape == (len(episodes[0].actions) + 1, 120, 160, 3)
+
+def test_log_appends_and_bounds_every(tmp_path):
+    """
+    The log must only grow by appends between compactions, stay loadable
+    after evictions and keep at most max_every periodic episodes
+    """
+    log = str(tmp_path / 'episodes.jsonl')
+    recorder = EpisodeRecorder(keep_best=2, keep_worst=0, keep_every=1, max_every=3, path=log)
+    game = SnakeGameAI(render=False, seed=0)
+    sizes = []
+    for n in range(40):
+        recorder.step(game, 0, False, 0)
+        recorder.step(game, 0, True, n % 7)
+        sizes.append(path.getsize(log))
+        game_kwargs, episodes = load_episodes(log)
+        assert episodes == recorder.episodes
+    assert len(recorder._every) == 3
+    assert len(recorder.episodes) <= 5
+    # Sizes only drop at compactions, which are rare
+    assert sum(b < a for a, b in zip(sizes, sizes[1:])) <= 10
+    with open(log) as f:
+        assert sum(1 for _ in f) <= 4 * (len(recorder.episodes) + 1)
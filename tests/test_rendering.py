@@ -0,0 +1,113 @@
+import os
+import sys
+import random
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+import pygame
+from src.game import SnakeGameAI, Direction, Point
+from src.game.constants import BLOCK_SIZE
+from src.game.rendering import (BoardRenderer, InfoBox, SpriteAtlas, CLOCK_WISE, ARROW_COLORS,
+                                ARROW_LENGTHS, ARROW_WIDTH, draw_snake_head, draw_snake_body,
+                                draw_food, draw_arrow)
+from src.agent.state import get_state
+from src.agent.safety import next_head
+
+ACTIONS = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+
+def test_incremental_frames_match_full_redraws():
+    """
+    Frames drawn with dirty rectangles must be identical to frames drawn
+    from scratch, across food, growth, game overs and resets
+    """
+    pygame.init()
+    rng = random.Random(0)
+    game = SnakeGameAI(render=False, seed=0)
+    display = pygame.Surface((game.w, game.h))
+    reference = pygame.Surface((game.w, game.h))
+    renderer = BoardRenderer(game.w, game.h)
+    eaten = 0
+
+    for step in range(600):
+        move = rng.randint(0, 2)
+        if rng.random() < 0.8:
+            move = min(range(3), key=lambda m: food_distance(game, next_head(game, m)))
+        reward, done, score = game.play_step(ACTIONS[move], None)
+        eaten += reward == 10
+
+        state = get_state(game)
+        game_info = {'score': score, 'games': step, 'record': eaten}
+        renderer.draw(display, game.snake, game.body, game.direction, game.food, state, game_info)
+        BoardRenderer(game.w, game.h).draw(reference, game.snake, game.body, game.direction,
+                                           game.food, state, game_info)
+        assert pygame.image.tostring(display, 'RGB') == pygame.image.tostring(reference, 'RGB')
+        if done:
+            game.reset()
+
+    assert eaten > 5
+
+def test_info_box_renders_only_changed_values():
+    """
+    A line is rasterized again only when its value changes, and every
+    added field grows the panel by one line
+    """
+    pygame.init()
+    box = InfoBox()
+    height = box.rect.height
+    first = [surface for surface, _ in box.blits({'score': 1, 'games': 2, 'record': 3})]
+    second = [surface for surface, _ in box.blits({'score': 1, 'games': 3, 'record': 3})]
+    # Panel, then one text per line: only the games line is new
+    assert [a is b for a, b in zip(first, second)] == [True, True, False, True]
+
+    box.add_field('Speed', 'speed', '{:.1f}')
+    assert box.rect.height == height + InfoBox.LINE_HEIGHT
+    assert len(box.blits({'score': 1, 'games': 3, 'record': 3, 'speed': 2.5})) == 5
+
+def test_atlas_sprites_match_primitive_drawing():
+    """
+    Heads, body, food and every danger arrow blitted from the atlas must be
+    pixel-identical to the primitive drawing functions
+    """
+    pygame.init()
+    atlas = SpriteAtlas()
+    size = (12 * BLOCK_SIZE, 12 * BLOCK_SIZE)
+    head = Point(6 * BLOCK_SIZE, 6 * BLOCK_SIZE)
+    center = (head.x + BLOCK_SIZE // 2, head.y + BLOCK_SIZE // 2)
+    steps = {Direction.RIGHT: (1, 0), Direction.LEFT: (-1, 0),
+             Direction.UP: (0, -1), Direction.DOWN: (0, 1)}
+
+    def assert_same(draw, blits):
+        expected = pygame.Surface(size)
+        actual = pygame.Surface(size)
+        expected.fill((40, 40, 40))
+        actual.fill((40, 40, 40))
+        draw(expected)
+        actual.blits(blits, doreturn=False)
+        assert pygame.image.tostring(actual, 'RGB') == pygame.image.tostring(expected, 'RGB')
+
+    for direction in CLOCK_WISE:
+        assert_same(lambda display: draw_snake_head(display, head, direction),
+                    [(atlas.heads[direction], head)])
+    assert_same(lambda display: draw_snake_body(display, head), [(atlas.body, head)])
+    assert_same(lambda display: draw_food(display, head), [(atlas.food, head)])
+
+    # One danger bit at a time, straight ahead when going in its direction
+    for direction, (dx, dy) in steps.items():
+        for distance, length in enumerate(ARROW_LENGTHS):
+            state = [0] * 23
+            state[distance] = 1
+            end = (center[0] + dx * length, center[1] + dy * length)
+            assert_same(lambda display: draw_arrow(display, center, end,
+                                                   ARROW_COLORS[distance], ARROW_WIDTH),
+                        atlas.arrow_blits(state, direction, head))
+
+def food_distance(game, pt):
+    """
+    Returns the distance to the food, or infinity if the move collides
+    """
+    if game.is_collision(pt):
+        return float('inf')
+    return abs(pt.x - game.food.x) + abs(pt.y - game.food.y)
@@ -0,0 +1,99 @@
+import os
+import sys
+import random
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+import torch
+from src.game import SnakeGameAI, Direction, Point
+from src.game.bitboard import BitboardSnakeGameAI
+from src.game.constants import BLOCK_SIZE
+from src.agent.action import Agent
+from src.agent.state import get_state
+from src.agent.safety import reachable_area, safe_action_mask, IMMEDIATE_DANGER_BITS
+
+def cells(*coords):
+    """
+    Points of the given (column, row) cells
+    """
+    return [Point(x * BLOCK_SIZE, y * BLOCK_SIZE) for x, y in coords]
+
+def dead_end_game(engine=SnakeGameAI):
+    """
+    5x5 board where the snake, heading up along the top wall, closes a
+    3-cell pocket on its left:
+
+        . . H . .
+        . x x . .
+        x x . . .
+        x . . . .
+        . . . . .
+    """
+    game = engine(render=False, cols=5, rows=5)
+    game.food = cells((4, 4))[0]
+    game.set_snake(cells((2, 0), (2, 1), (1, 1), (1, 2), (0, 2), (0, 3)), Direction.UP)
+    return game
+
+def test_reachable_area_sees_the_dead_end():
+    """
+    The flood fill must count the pocket and the open side separately,
+    with the tail free, and stop at the limit
+    """
+    for engine in (SnakeGameAI, BitboardSnakeGameAI):
+        game = dead_end_game(engine)
+        pocket, open_side = cells((1, 0), (3, 0))
+        assert reachable_area(game, pocket, 100) == 2
+        assert reachable_area(game, open_side, 100) == 16
+        assert reachable_area(game, open_side, 5) == 5
+        if engine is BitboardSnakeGameAI:
+            assert game.reachable_area(pocket, 100) == 2
+            assert game.reachable_area(open_side, 100) == 16
+
+        # Straight hits the wall, a left turn enters the pocket
+        state = get_state(game)
+        assert safe_action_mask(state) == [False, True, True]
+        assert safe_action_mask(state, game, check_space=True) == [False, True, False]
+
+def masked_agent(epsilon_start):
+    """
+    Masking agent exploring for the first games if epsilon_start is high,
+    and whose network prefers going straight
+    """
+    agent = Agent(use_existing_model=False, action_mask=True, seed=0, epsilon_start=epsilon_start)
+    with torch.no_grad():
+        agent.model.linear2.bias.copy_(torch.tensor([100.0, 0.0, 0.0]))
+    return agent
+
+def test_masked_moves_are_never_chosen():
+    """
+    Neither exploration nor the network may pick a move the mask removes
+    """
+    rng = random.Random(0)
+    for epsilon_start in (1000, 0):
+        agent = masked_agent(epsilon_start)
+        for _ in range(300):
+            state = [rng.randint(0, 1) for _ in range(23)]
+            allowed = [not state[bit] for bit in IMMEDIATE_DANGER_BITS]
+            if not any(allowed):
+                continue
+            final_move, _ = agent.get_action(state)
+            assert allowed[final_move.index(1)]
+
+def test_fallback_when_every_move_is_masked():
+    """
+    With every move masked the agent must still play one move
+    """
+    state = [0] * 23
+    for bit in IMMEDIATE_DANGER_BITS:
+        state[bit] = 1
+    for epsilon_start in (1000, 0):
+        agent = masked_agent(epsilon_start)
+        for _ in range(20):
+            final_move, scores = agent.get_action(state)
+            assert sorted(final_move) == [0, 0, 1]
+        if epsilon_start == 0:
+            # The network is used as is, so it goes straight
+            assert final_move == [1, 0, 0]
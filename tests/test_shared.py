@@ -0,0 +1,109 @@
+import sys
+import random
+import threading
+import os.path as path
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+import torch
+from src.agent.shared import SharedTransitionBuffer, SharedWeights
+from src.model.network import Linear_QNet
+
+def transition(n):
+    """
+    Transition whose every field encodes its number n
+    """
+    return [n % 256] * 23, [n % 3, 1, 0], float(n), [(n + 1) % 256] * 23, n % 7 == 0
+
+def check(batch):
+    """
+    Asserts that every row of a batch comes from a single transition
+    """
+    states, actions, rewards, next_states, dones = batch
+    numbers = rewards.long()
+    assert (states == (numbers % 256).to(torch.uint8)[:, None]).all()
+    assert (next_states == ((numbers + 1) % 256).to(torch.uint8)[:, None]).all()
+    assert (actions[:, 0] == (numbers % 3).to(torch.uint8)).all()
+    assert (dones == (numbers % 7 == 0)).all()
+    return numbers.tolist()
+
+def test_wraparound_skips_the_slot_being_written():
+    """
+    After wrapping, sampling and reading must never return the slot the
+    writer overwrites next, whatever its position in the segment
+    """
+    buffer = SharedTransitionBuffer(num_writers=1, capacity=8)
+    writer = buffer.writer(0)
+    rng = random.Random(0)
+    for n in range(30):
+        writer.append(*transition(n))
+        # Tear the next slot as a writer interrupted mid-transition would
+        slot = (n + 1) % 8
+        buffer.states[slot] = 255
+        buffer.rewards[slot] = -1.0
+        numbers = check(buffer.sample(rng, batch_size=8))
+        assert sorted(numbers) == list(range(max(0, n - 6), n + 1))
+
+def test_concurrent_writer_never_tears_rows():
+    """
+    Rows sampled while another thread keeps overwriting the segment must
+    all be whole transitions
+    """
+    buffer = SharedTransitionBuffer(num_writers=1, capacity=16)
+    writer = buffer.writer(0)
+    for n in range(16):
+        writer.append(*transition(n))
+    stop = threading.Event()
+
+    def write():
+        n = 16
+        while not stop.is_set():
+            writer.append(*transition(n))
+            n += 1
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    try:
+        rng = random.Random(0)
+        for _ in range(2000):
+            batch = buffer.sample(rng, batch_size=16)
+            if batch is not None:
+                check(batch)
+            fresh = buffer.read_new(16)
+            if fresh is not None:
+                check(fresh)
+    finally:
+        stop.set()
+        thread.join()
+
+def test_read_new_rotates_writers():
+    """
+    With a limit smaller than the new transitions, every writer must be read in turn
+    """
+    buffer = SharedTransitionBuffer(num_writers=3, capacity=300)
+    for writer_id in range(3):
+        writer = buffer.writer(writer_id)
+        for n in range(50):
+            writer.append(*transition(n))
+    for _ in range(3):
+        assert len(buffer.read_new(limit=20)[0]) == 20
+    assert all(read == 20 for read in buffer.read)
+
+def test_weights_seqlock():
+    """
+    Weights must load only when newer and never while a write is in progress
+    """
+    torch.manual_seed(0)
+    source, target = Linear_QNet(23, 8, 3), Linear_QNet(23, 8, 3)
+    weights = SharedWeights(source)
+    assert weights.pull(target, last_version=0) == (0, None)
+
+    weights.publish(source, step=5)
+    version, step = weights.pull(target)
+    assert (version, step) == (2, 5)
+    assert all(torch.equal(a, b) for a, b in zip(source.parameters(), target.parameters()))
+    assert weights.pull(target, last_version=version) == (version, None)
+
+    # A write in progress (odd version) is not loaded
+    weights.meta[0] += 1
+    assert weights.pull(target, last_version=version) == (version, None)
@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+from src.agent.sweep import grid_configs, random_configs, run_sweep
+
+def test_grid_configs():
+    """
+    A grid lists every combination once
+    """
+    configs = grid_configs({'lr': [0.001, 0.002], 'gamma': [0.9, 0.95, 0.99]})
+    assert len(configs) == 6
+    assert len({tuple(sorted(config.items())) for config in configs}) == 6
+
+def test_random_configs():
+    """
+    Random draws stay in their ranges and are reproducible
+    """
+    space = {'lr': {'min': 1e-4, 'max': 1e-2, 'log': True},
+             'hidden_size': {'min': 64, 'max': 512, 'int': True},
+             'batch_size': [500, 1000]}
+    configs = random_configs(space, 20, seed=0)
+    assert configs == random_configs(space, 20, seed=0)
+    for config in configs:
+        assert 1e-4 <= config['lr'] <= 1e-2
+        assert isinstance(config['hidden_size'], int) and 64 <= config['hidden_size'] <= 512
+        assert config['batch_size'] in (500, 1000)
+
+def test_random_configs_stay_in_range_after_rounding():
+    """
+    Rounding to 4 significant digits must not leave a narrow range
+    """
+    space = {'lr': {'min': 0.123456, 'max': 0.123458}, 'gamma': {'min': 0.99994, 'max': 0.99999}}
+    for config in random_configs(space, 50, seed=0):
+        assert 0.123456 <= config['lr'] <= 0.123458
+        assert 0.99994 <= config['gamma'] <= 0.99999
+
+def test_sweep_removes_worker_directories(tmp_path, monkeypatch):
+    """
+    The directories the workers train in must be gone after the sweep
+    """
+    # Spawned workers pick their temporary directory from the environment too
+    monkeypatch.setenv('TMPDIR', str(tmp_path))
+    monkeypatch.setattr(tempfile, 'tempdir', None)
+    results = run_sweep([{'hidden_size': 16}], num_workers=1, seed=0, max_games=1, pin_cpus=False)
+    assert len(results) == 1 and results[0]['games'] == 1
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('snake_sweep_')]
@@ -0,0 +1,38 @@
+import os
+import sys
+import random
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+import numpy as np
+from src.game.vector_env import VectorEnv, SubprocVectorEnv
+
+NUM_GAMES = 6
+STEPS = 200
+
+def test_subproc_env_matches_vector_env():
+    """
+    Stepping the worker processes one at a time must give, game by game,
+    the same results as the in-process batch with the same seed
+    """
+    rng = random.Random(0)
+    local = VectorEnv(NUM_GAMES, seed=5)
+    with SubprocVectorEnv(NUM_GAMES, num_workers=3, seed=5) as remote:
+        assert np.array_equal(local.reset(), remote.reset())
+        for _ in range(STEPS):
+            actions = np.array([rng.randrange(3) for _ in range(NUM_GAMES)], dtype=np.int8)
+            local.step(actions)
+            # Each worker is started while the others still step, with an
+            # array holding other moves for the games it does not own
+            for w in range(remote.num_workers):
+                moves = (actions + 1) % 3
+                moves[remote.slices[w]] = actions[remote.slices[w]]
+                remote.step_async(moves, worker_ids=[w])
+            remote.wait_all()
+            assert np.array_equal(local.obs, remote.obs)
+            assert np.array_equal(local.rewards, remote.rewards)
+            assert np.array_equal(local.dones, remote.dones)
+            assert np.array_equal(local.scores, remote.scores)
@@ -0,0 +1,82 @@
+import os
+import sys
+import random
+import os.path as path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the parent directory to the path to import from src
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+from src.game import SnakeGameAI, Direction, Point
+from src.game.constants import BLOCK_SIZE
+
+def test_incremental_hash_matches_full_hash():
+    """
+    Checks that the hash updated move by move always equals the hash
+    recomputed from scratch.
+    """
+    random.seed(1)
+    game = SnakeGameAI(render=False, seed=1)
+    actions = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+
+    for _ in range(2000):
+        game._move(random.choice(actions))
+        game._grow_head()
+        reward, done = game._check_game_status(0, 0)
+        if done:
+            game.reset()
+        expected = game.zobrist.hash_position(
+            game._body_links(), game._cell(game.head), game.direction, game._cell(game.food))
+        assert game.position_hash == expected
+
+def test_loop_ends_game_on_repeated_position():
+    """
+    Circles in a 2x2 square and checks that the game ends as soon as a
+    position of the loop comes back.
+    """
+    game = SnakeGameAI(loop_detection='end', render=False)
+    head = game.head
+    square = {head, Point(head.x - BLOCK_SIZE, head.y),
+              Point(head.x, head.y + BLOCK_SIZE), Point(head.x - BLOCK_SIZE, head.y + BLOCK_SIZE)}
+    while game.food in square:
+        game.reset()
+
+    # A 3-segment snake turning right forever is back to its first move
+    # after 4 more moves
+    for step in range(5):
+        game._move([0, 1, 0])
+        game._grow_head()
+        reward, done = game._check_game_status(0, 0)
+        assert done == (step == 4)
+    assert reward == -10
+    assert game.direction == Direction.DOWN
+
+def test_snakes_on_same_cells_in_different_order_differ():
+    """
+    Two snakes on the same cells, with the same head and tail, but whose
+    body runs through the cells in a different order must not collide
+    """
+    game = SnakeGameAI(render=False, seed=1)
+    b = BLOCK_SIZE
+    # Both fill a 3x3 block from its top left to its bottom right corner
+    rows_first = [Point(x * b, y * b) for x, y in
+                  ((0, 0), (1, 0), (2, 0), (2, 1), (1, 1), (0, 1), (0, 2), (1, 2), (2, 2))]
+    columns_first = [Point(x * b, y * b) for x, y in
+                     ((0, 0), (0, 1), (0, 2), (1, 2), (1, 1), (1, 0), (2, 0), (2, 1), (2, 2))]
+    game.food = Point(5 * b, 5 * b)
+    game.set_snake(rows_first, Direction.LEFT)
+    first = game.position_hash
+    game.set_snake(columns_first, Direction.LEFT)
+    assert game.food == Point(5 * b, 5 * b)
+    assert game.position_hash != first
+
+def test_games_share_their_key_table():
+    """
+    Games of the same size must reuse one table instead of drawing it again
+    """
+    first = SnakeGameAI(render=False, seed=1)
+    second = SnakeGameAI(render=False, seed=2)
+    other = SnakeGameAI(render=False, cols=8, rows=6)
+    assert first.zobrist is second.zobrist
+    assert other.zobrist is not first.zobrist
+    assert len(other.zobrist.head) == 48